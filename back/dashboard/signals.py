@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from eventos.signals import registros_guardados
+from personal.models import Personal, Legajo
+from personal.signals import legajos_creados
+from usuarios.models import Usuario
+from .utils import invalidar_estadisticas
+
+
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+@receiver(post_save, sender=Personal)
+@receiver(post_delete, sender=Personal)
+@receiver(post_save, sender=Legajo)
+@receiver(post_delete, sender=Legajo)
+@receiver(registros_guardados)
+@receiver(legajos_creados)
+def invalidar_dashboard(sender, **kwargs):
+    """Cualquier escritura en las tablas del dashboard invalida el cache (al confirmar)"""
+    transaction.on_commit(invalidar_estadisticas)
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from eventos.models import RegistroEvento
+from eventos.serializers import RegistroEventoSerializer
+from personal.models import Personal, Legajo
+from usuarios.models import Usuario
+
+CLAVE_CACHE = 'dashboard:estadisticas'
+
+
+def _cache():
+    # Compartido entre workers: una escritura en cualquiera invalida para todos
+    return caches['compartido']
+
+
+def obtener_estadisticas():
+    """Estadísticas del dashboard, desde el cache si están vigentes"""
+    datos = _cache().get(CLAVE_CACHE)
+    if datos is None:
+        datos = calcular_estadisticas()
+        _cache().set(CLAVE_CACHE, datos, getattr(settings, 'DASHBOARD_CACHE_TTL', 30))
+    return datos
+
+
+def invalidar_estadisticas():
+    _cache().delete(CLAVE_CACHE)
+
+
+def calcular_estadisticas():
+    """
+    Calcula todos los contadores con una consulta agregada por tabla.
+    """
+    usuarios = Usuario.objects.aggregate(
+        total=Count('id'),
+        activos=Count('id', filter=Q(is_active=True)),
+    )
+    personal = Personal.objects.aggregate(
+        total=Count('id'),
+        activos=Count('id', filter=Q(activo=True)),
+    )
+
+    por_seccion = list(
+        Legajo.objects
+        .values('seccion_id', 'seccion__nombre', 'seccion__orden', 'seccion__color')
+        .annotate(cantidad=Count('id'))
+        .order_by('seccion__orden')
+    )
+
+    eventos = RegistroEvento.objects.select_related(
+        'usuario_ejecutor', 'usuario_afectado', 'personal_afectado', 'evento'
+    ).order_by('-fecha_hora', '-id')[:getattr(settings, 'DASHBOARD_EVENTOS_MAX', 20)]
+
+    return {
+        'usuarios': usuarios,
+        'personal': personal,
+        'documentos': {
+            'total': sum(fila['cantidad'] for fila in por_seccion),
+            'por_seccion': [
+                {
+                    'seccion_id': fila['seccion_id'],
+                    'nombre': fila['seccion__nombre'],
+                    'orden': fila['seccion__orden'],
+                    'color': fila['seccion__color'],
+                    'cantidad': fila['cantidad'],
+                }
+                for fila in por_seccion
+            ],
+        },
+        'eventos_recientes': RegistroEventoSerializer(eventos, many=True).data,
+        'generado': timezone.localtime().strftime('%Y-%m-%d %H:%M:%S'),
+    }
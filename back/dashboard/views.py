@@ -0,0 +1,26 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .utils import obtener_estadisticas
+
+
+class DashboardView(APIView):
+    """
+    Estadísticas agregadas para la pantalla principal.
+    GET /api/dashboard/?eventos=5
+
+    Reemplaza las llamadas a /usuarios/, /personal/ y /legajos/ que el
+    frontend hacía solo para contar filas.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            cantidad_eventos = max(1, int(request.query_params.get('eventos', 5)))
+        except ValueError:
+            cantidad_eventos = 5
+
+        datos = dict(obtener_estadisticas())
+        datos['eventos_recientes'] = datos['eventos_recientes'][:cantidad_eventos]
+        return Response(datos)
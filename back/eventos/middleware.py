@@ -0,0 +1,27 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .utils import buffer_auditoria, buffer_auditoria_async
+
+
+class AuditoriaMiddleware:
+    """
+    Agrupa los eventos registrados durante una petición y los escribe
+    con un solo bulk_create al terminarla (ver eventos.utils.registrar).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with buffer_auditoria():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        async with buffer_auditoria_async():
+            return await self.get_response(request)
@@ -45,11 +45,58 @@ class RegistroEventoSerializer(serializers.ModelSerializer):
         read_only=True
     )
     
+    # Columnas que leen los campos calculados (?fields=, legajos.campos)
+    campos_dependencias = {
+        'usuario_ejecutor_nombre': ('usuario_ejecutor__nombres', 'usuario_ejecutor__apellidos'),
+        'usuario_afectado_nombre': ('usuario_afectado__nombres', 'usuario_afectado__apellidos'),
+        'personal_afectado_nombre': (
+            'personal_afectado__nombres', 'personal_afectado__apellido_paterno', 'personal_afectado__apellido_materno'
+        ),
+    }
+    
     def get_personal_afectado_nombre(self, obj):
         if obj.personal_afectado:
             return obj.personal_afectado.nombre_completo
         return None
     
+    # Listado con .values() (legajos.campos.ListaRapidaMixin): misma salida sin instanciar modelos
+    columnas_valores = (
+        'id', 'usuario_ejecutor_id', 'usuario_ejecutor__nombres', 'usuario_ejecutor__apellidos',
+        'usuario_ejecutor__username', 'usuario_afectado_id', 'usuario_afectado__nombres',
+        'usuario_afectado__apellidos', 'usuario_afectado__username', 'personal_afectado_id',
+        'personal_afectado__nombres', 'personal_afectado__apellido_paterno',
+        'personal_afectado__apellido_materno', 'personal_afectado__dni', 'evento_id', 'evento__nombre', 'fecha_hora',
+    )
+    
+    @staticmethod
+    def contexto_valores(contexto):
+        return {**contexto, 'fecha': serializers.DateTimeField().to_representation}
+    
+    @staticmethod
+    def desde_valores(fila, contexto):
+        afectado = fila['usuario_afectado_id'] is not None
+        personal = fila['personal_afectado_id'] is not None
+        return {
+            'id': fila['id'],
+            'usuario_ejecutor': fila['usuario_ejecutor_id'],
+            'usuario_ejecutor_nombre': f"{fila['usuario_ejecutor__nombres']} {fila['usuario_ejecutor__apellidos']}",
+            'usuario_ejecutor_username': fila['usuario_ejecutor__username'],
+            'usuario_afectado': fila['usuario_afectado_id'],
+            'usuario_afectado_nombre': (
+                f"{fila['usuario_afectado__nombres']} {fila['usuario_afectado__apellidos']}" if afectado else None
+            ),
+            'usuario_afectado_username': fila['usuario_afectado__username'],
+            'personal_afectado': fila['personal_afectado_id'],
+            'personal_afectado_nombre': (
+                f"{fila['personal_afectado__nombres']} {fila['personal_afectado__apellido_paterno']} "
+                f"{fila['personal_afectado__apellido_materno']}" if personal else None
+            ),
+            'personal_afectado_dni': fila['personal_afectado__dni'],
+            'evento': fila['evento_id'],
+            'evento_nombre': fila['evento__nombre'],
+            'fecha_hora': contexto['fecha'](fila['fecha_hora']) if fila['fecha_hora'] else None,
+        }
+    
     class Meta:
         model = RegistroEvento
         fields = [
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Se envía después de escribir un lote de RegistroEvento con bulk_create
+# (bulk_create no dispara post_save). Argumentos: registros
+registros_guardados = Signal()
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import RegistroEvento
+from .serializers import RegistroEventoSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def _consultar(desde_id, limite=200, excluir=()):
+    """Registros con id > desde_id (salvo los de excluir), ya serializados y en orden ascendente"""
+    registros = RegistroEvento.objects.filter(id__gt=desde_id)
+    if excluir:
+        registros = registros.exclude(id__in=excluir)
+    registros = registros.select_related(
+        'usuario_ejecutor', 'usuario_afectado', 'personal_afectado', 'evento'
+    ).order_by('id')[:limite]
+    return list(RegistroEventoSerializer(registros, many=True).data)
+
+
+def _ultimo_id():
+    return RegistroEvento.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+consultar = sync_to_async(_consultar)
+ultimo_id = sync_to_async(_ultimo_id)
+
+
+class DifusorEventos:
+    """
+    Un solo sondeo a la base por proceso, repartido a todas las conexiones.
+
+    Cada conexión SSE se suscribe con una asyncio.Queue; la tarea de
+    sondeo consulta los registros nuevos cada EVENTOS_STREAM_INTERVALO
+    segundos y los reparte. Así cientos de conexiones abiertas cuestan
+    una consulta por intervalo, no una por conexión.
+
+    Los ids se asignan al insertar pero se ven al confirmar: una
+    transacción lenta puede hacer visible un id menor que otros ya
+    enviados. Por eso cada consulta vuelve a revisar los últimos
+    EVENTOS_STREAM_VENTANA ids, salteando los que ya se enviaron.
+    """
+    _instancia = None
+
+    def __init__(self, intervalo, ventana=100):
+        self.intervalo = intervalo
+        self.ventana = ventana
+        self.suscriptores = set()
+        self.ultimo_id = None
+        self.enviados = set()  # ids ya repartidos dentro de la ventana
+        self.tarea = None
+
+    @classmethod
+    def obtener(cls):
+        if cls._instancia is None:
+            cls._instancia = cls(
+                getattr(settings, 'EVENTOS_STREAM_INTERVALO', 2.0),
+                getattr(settings, 'EVENTOS_STREAM_VENTANA', 100),
+            )
+        return cls._instancia
+
+    async def suscribir(self):
+        cola = asyncio.Queue(maxsize=1000)
+        self.suscriptores.add(cola)
+        if self.tarea is None or self.tarea.done():
+            self.ultimo_id = await ultimo_id()
+            self.enviados = set()
+            self.tarea = asyncio.create_task(self._sondear())
+        return cola
+
+    def desuscribir(self, cola):
+        self.suscriptores.discard(cola)
+
+    async def _sondear(self):
+        while self.suscriptores:
+            piso = max(self.ultimo_id - self.ventana, 0)
+            try:
+                registros = await consultar(piso, excluir=sorted(self.enviados))
+            except Exception:
+                logger.exception('Error al consultar registros de eventos')
+                registros = []
+            if registros:
+                self.ultimo_id = max(self.ultimo_id, registros[-1]['id'])
+                self.enviados.update(registro['id'] for registro in registros)
+                piso = self.ultimo_id - self.ventana
+                self.enviados = {id_ for id_ in self.enviados if id_ > piso}
+                for cola in list(self.suscriptores):
+                    for registro in registros:
+                        try:
+                            cola.put_nowait(registro)
+                        except asyncio.QueueFull:
+                            # Cliente demasiado lento: se cierra su flujo y el
+                            # navegador se reconecta con Last-Event-ID
+                            self.desuscribir(cola)
+                            while not cola.empty():
+                                cola.get_nowait()
+                            cola.put_nowait(None)
+                            break
+            await asyncio.sleep(self.intervalo)
+
+
+def formatear(registro):
+    datos = json.dumps(registro, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"id: {registro['id']}\nevent: registro\ndata: {datos}\n\n"
+
+
+async def flujo_eventos(desde_id=None):
+    """
+    Generador SSE: primero los registros posteriores a desde_id
+    (reanudación con Last-Event-ID) y luego los nuevos en vivo.
+    """
+    difusor = DifusorEventos.obtener()
+    latido = getattr(settings, 'EVENTOS_STREAM_LATIDO', 15)
+    cola = await difusor.suscribir()
+    try:
+        yield 'retry: 5000\n\n'
+
+        # Los registros de la reanudación también pueden llegar por la cola
+        reanudados = set()
+        if desde_id is not None:
+            enviado = desde_id
+            while True:
+                pendientes = await consultar(enviado)
+                for registro in pendientes:
+                    yield formatear(registro)
+                    enviado = registro['id']
+                    reanudados.add(enviado)
+                if len(pendientes) < 200:
+                    break
+
+        while True:
+            try:
+                registro = await asyncio.wait_for(cola.get(), timeout=latido)
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            if registro is None:
+                return
+            if registro['id'] in reanudados:
+                continue
+            yield formatear(registro)
+    finally:
+        difusor.desuscribir(cola)
@@ -1,3 +1,100 @@
-from django.test import TestCase
+import datetime
+import decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from legajos.campos import ListaRapidaMixin
+from legajos.renderers import JSONRenderer
+from personal.models import Personal
+from rest_framework import renderers
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from usuarios.models import Usuario
+
+from .models import Evento, RegistroEvento
+
+
+class AuditoriaAsyncTests(TransactionTestCase):
+    """
+    Bajo ASGI AuditoriaMiddleware corre por __acall__: los registros de la
+    petición se deben escribir sin usar la base desde el event loop.
+    (TransactionTestCase: on_commit se ejecuta al confirmar, como en producción)
+    """
+
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        self.usuario = Usuario.objects.create_user(
+            'juan', 'juan@test.com', 'clave', nombres='Juan', apellidos='Pérez'
+        )
+        Evento.objects.create(id=9, nombre='Usuario deshabilitado')
+        self.cabeceras = {'Authorization': f'Bearer {AccessToken.for_user(self.admin)}'}
+
+    async def test_escritura_registra_evento(self):
+        respuesta = await AsyncClient().post(
+            f'/api/usuarios/{self.usuario.pk}/toggle_active/', headers=self.cabeceras
+        )
+
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+        registros = RegistroEvento.objects.filter(evento_id=9).values_list('usuario_ejecutor_id', 'usuario_afectado_id')
+        self.assertEqual([r async for r in registros], [(self.admin.pk, self.usuario.pk)])
+
+
+class RegistroEventoListaRapidaTests(TestCase):
+    """desde_valores() da la misma respuesta que el serializer"""
+
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        usuario = Usuario.objects.create_user('juan', 'juan@test.com', 'clave', nombres='Juan', apellidos='Pérez')
+        personal = Personal.objects.create(
+            dni='12345678', nombres='Rosa', apellido_paterno='Quispe', apellido_materno='Mamani'
+        )
+        evento = Evento.objects.create(id=9, nombre='Usuario deshabilitado')
+        fecha = timezone.now().replace(microsecond=123456)
+        # Con y sin usuario o personal afectado
+        for minutos, (afectado, persona) in enumerate(((usuario, None), (None, personal), (None, None), (usuario, personal))):
+            RegistroEvento.objects.create(
+                usuario_ejecutor=self.admin, usuario_afectado=afectado, personal_afectado=persona, evento=evento,
+                fecha_hora=fecha - datetime.timedelta(minutes=minutos),
+            )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+
+    def test_misma_salida(self):
+        # list() de DRF (serializer campo por campo) en lugar del de ListaRapidaMixin
+        sin_lista_rapida = mock.patch.object(
+            ListaRapidaMixin, 'list',
+            lambda self, request, *args, **kwargs: super(ListaRapidaMixin, self).list(request, *args, **kwargs),
+        )
+        for url in ('/api/registro-eventos/', '/api/registro-eventos/?paginacion=cursor&page_size=3',
+                    '/api/registro-eventos/?fields=id,fecha_hora,usuario_afectado_nombre,personal_afectado_nombre'):
+            respuesta = self.cliente.get(url)
+            with sin_lista_rapida:
+                esperada = self.cliente.get(url)
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertEqual(esperada.status_code, 200)
+            self.assertEqual(respuesta.json(), esperada.json(), url)
+            self.assertEqual(respuesta.content, esperada.content, url)
+
+
+class JSONRendererTests(SimpleTestCase):
+    """El renderer con orjson produce los mismos bytes que el de DRF"""
+
+    def test_mismo_formato(self):
+        datos = {
+            'utc': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'lima': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+            'ingenua': datetime.datetime(2024, 1, 2, 3, 4, 5),
+            'fecha': datetime.date(2024, 1, 2),
+            'hora': datetime.time(3, 4, 5, 600),
+            'monto': decimal.Decimal('10.50'),
+            'texto': 'línea\u2028párrafo\u2029fin',
+            'lazy': gettext_lazy('Activo'),
+            1: [None, True, 1.5],
+        }
+        self.assertEqual(JSONRenderer().render(datos), renderers.JSONRenderer().render(datos))
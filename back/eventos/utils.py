@@ -1,36 +1,75 @@
+import atexit
+import logging
+import queue
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
 from .models import RegistroEvento, Evento
+from .signals import registros_guardados
+
+logger = logging.getLogger(__name__)
+
+# Catálogo de eventos en memoria (son pocos y casi nunca cambian)
+_catalogo = {}
+_catalogo_lock = threading.Lock()
+
+# Registros pendientes de la petición actual (ver AuditoriaMiddleware)
+_pendientes = ContextVar('eventos_pendientes', default=None)
+
+
+def obtener_evento(id_evento):
+    """
+    Obtener un Evento del catálogo en memoria.
+    Si no está, recarga el catálogo completo con una sola consulta.
+    """
+    evento = _catalogo.get(id_evento)
+    if evento is None:
+        with _catalogo_lock:
+            _catalogo.clear()
+            _catalogo.update({e.id: e for e in Evento.objects.all()})
+        evento = _catalogo.get(id_evento)
+    return evento
 
 
 def registrar(usuario_ejecutor, id_evento, usuario_afectado=None, personal_afectado=None):
     """
     Registra un evento en el sistema
-    
+
+    El registro no se inserta en el momento: se encola y se escribe con
+    bulk_create cuando termina la petición (o al confirmar la transacción
+    actual si se llama fuera de una petición).
+
     Args:
         usuario_ejecutor: Usuario que realiza la acción
         id_evento: ID del evento (de la tabla Evento)
         usuario_afectado: Usuario afectado por la acción (opcional)
         personal_afectado: Personal afectado por la acción (opcional)
-    
+
     Returns:
-        RegistroEvento creado
-    
+        RegistroEvento encolado (aún sin guardar)
+
     Ejemplos:
         from eventos.utils import registrar
-        
+
         # Registrar que admin modificó datos de un usuario
         registrar(
             usuario_ejecutor=request.user,
             id_evento=5,
             usuario_afectado=usuario_juan
         )
-        
+
         # Registrar que admin editó el legajo de un personal
         registrar(
             usuario_ejecutor=request.user,
             id_evento=5,
             personal_afectado=personal_maria
         )
-        
+
         # Registrar que admin editó datos de un usuario y personal relacionado
         registrar(
             usuario_ejecutor=request.user,
@@ -40,28 +79,134 @@ def registrar(usuario_ejecutor, id_evento, usuario_afectado=None, personal_afect
         )
     """
     try:
-        evento = Evento.objects.get(id=id_evento)
-        
-        registro = RegistroEvento.objects.create(
+        evento = obtener_evento(id_evento)
+        if evento is None:
+            logger.error('Evento con ID %s no existe', id_evento)
+            return None
+
+        registro = RegistroEvento(
             usuario_ejecutor=usuario_ejecutor,
             usuario_afectado=usuario_afectado,
             personal_afectado=personal_afectado,  # ⭐ NUEVO
             evento=evento
         )
-        
-        # Log para debugging
-        mensaje = f"✅ Evento registrado: {evento.nombre}"
-        if usuario_afectado:
-            mensaje += f" | Usuario afectado: {usuario_afectado.nombre_completo}"
-        if personal_afectado:
-            mensaje += f" | Personal afectado: {personal_afectado.nombre_completo}"
-        print(mensaje)
-        
+
+        pendientes = _pendientes.get()
+        if pendientes is not None:
+            pendientes.append(registro)
+        else:
+            transaction.on_commit(lambda: escribir([registro]))
+
+        logger.debug('Evento registrado: %s', evento.nombre)
         return registro
-    
-    except Evento.DoesNotExist:
-        print(f"❌ Error: Evento con ID {id_evento} no existe")
+
+    except Exception:
+        logger.exception('Error al registrar evento %s', id_evento)
         return None
-    except Exception as e:
-        print(f"❌ Error al registrar evento: {str(e)}")
-        return None
\ No newline at end of file
+
+
+@contextmanager
+def buffer_auditoria():
+    """
+    Acumula los registros de eventos del bloque y los escribe juntos
+    al salir, cuando se confirma la transacción en curso.
+    """
+    token = _pendientes.set([])
+    try:
+        yield
+    finally:
+        pendientes = _pendientes.get()
+        _pendientes.reset(token)
+        _vaciar(pendientes)
+
+
+@asynccontextmanager
+async def buffer_auditoria_async():
+    """
+    buffer_auditoria para el camino async del middleware: la escritura usa
+    la base, así que se hace en el hilo de las vistas (sync_to_async) y no
+    en el del event loop.
+    """
+    token = _pendientes.set([])
+    try:
+        yield
+    finally:
+        pendientes = _pendientes.get()
+        _pendientes.reset(token)
+        if pendientes:
+            await sync_to_async(_vaciar)(pendientes)
+
+
+def _vaciar(pendientes):
+    if pendientes:
+        transaction.on_commit(lambda: escribir(pendientes))
+
+
+def escribir(registros):
+    """Escribir registros en la base, directamente o en el hilo de fondo"""
+    if getattr(settings, 'EVENTOS_ESCRITURA_EN_SEGUNDO_PLANO', False):
+        EscritorSegundoPlano.obtener().encolar(registros)
+    else:
+        _guardar(registros)
+
+
+def _guardar(registros):
+    try:
+        RegistroEvento.objects.bulk_create(registros)
+    except Exception:
+        logger.exception('Error al guardar %s registros de eventos', len(registros))
+        return
+    registros_guardados.send(sender=RegistroEvento, registros=registros)
+
+
+class EscritorSegundoPlano:
+    """
+    Hilo que agrupa registros de varias peticiones y los escribe
+    con un solo bulk_create cada pocos segundos (o al llenarse el lote).
+    """
+    _instancia = None
+    _lock = threading.Lock()
+
+    def __init__(self, tamano_lote=500, intervalo=2.0):
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.cola = queue.Queue()
+        self.hilo = threading.Thread(target=self._ejecutar, name='escritor-eventos', daemon=True)
+        self.hilo.start()
+        atexit.register(self.vaciar)
+
+    @classmethod
+    def obtener(cls):
+        with cls._lock:
+            if cls._instancia is None:
+                cls._instancia = cls(
+                    tamano_lote=getattr(settings, 'EVENTOS_TAMANO_LOTE', 500),
+                    intervalo=getattr(settings, 'EVENTOS_INTERVALO_ESCRITURA', 2.0),
+                )
+            return cls._instancia
+
+    def encolar(self, registros):
+        for registro in registros:
+            self.cola.put(registro)
+
+    def vaciar(self):
+        """Escribir todo lo que quede en la cola (al cerrar el proceso)"""
+        lote = []
+        while True:
+            try:
+                lote.append(self.cola.get_nowait())
+            except queue.Empty:
+                break
+        if lote:
+            _guardar(lote)
+
+    def _ejecutar(self):
+        while True:
+            lote = [self.cola.get()]
+            try:
+                while len(lote) < self.tamano_lote:
+                    lote.append(self.cola.get(timeout=self.intervalo))
+            except queue.Empty:
+                pass
+            close_old_connections()
+            _guardar(lote)
@@ -1,10 +1,21 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from legajos.campos import CamposDinamicosMixin, ListaRapidaMixin
+from legajos.instrumentacion import SerializacionMedidaMixin
+from legajos.pagination import PaginacionHibrida
+from usuarios.authentication import TicketStream, usuario_de_ticket
 from .models import Evento, RegistroEvento
 from .serializers import EventoSerializer, RegistroEventoSerializer
+from .stream import flujo_eventos
 
 
-class EventoViewSet(viewsets.ReadOnlyModelViewSet):
+class EventoViewSet(SerializacionMedidaMixin, CamposDinamicosMixin, viewsets.ReadOnlyModelViewSet):
     """
     API para consultar el catálogo de eventos
     """
@@ -13,7 +24,7 @@ class EventoViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
 
 
-class RegistroEventoViewSet(viewsets.ReadOnlyModelViewSet):
+class RegistroEventoViewSet(SerializacionMedidaMixin, ListaRapidaMixin, CamposDinamicosMixin, viewsets.ReadOnlyModelViewSet):
     """
     API para consultar el historial de eventos
     Solo lectura - los registros se crean desde las vistas de negocio
@@ -26,6 +37,8 @@ class RegistroEventoViewSet(viewsets.ReadOnlyModelViewSet):
     )
     serializer_class = RegistroEventoSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PaginacionHibrida
+    cursor_ordering = ('-fecha_hora', '-id')  # Índice registro_eventos(-fecha_hora)
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -53,4 +66,56 @@ class RegistroEventoViewSet(viewsets.ReadOnlyModelViewSet):
         if fecha_hasta:
             queryset = queryset.filter(fecha_hora__lte=fecha_hasta)
         
-        return queryset
\ No newline at end of file
+        return queryset
+
+class TicketStreamView(APIView):
+    """
+    POST /api/registro-eventos/stream/ticket/ → {"ticket": "...", "expira_en": 30}
+
+    Ticket de pocos segundos para abrir el stream: el token de acceso
+    nunca viaja en la URL (ni queda en los logs de acceso).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ticket = TicketStream.for_user(request.user)
+        return Response({'ticket': str(ticket), 'expira_en': int(TicketStream.lifetime.total_seconds())})
+
+
+async def stream_registro_eventos(request):
+    """
+    Stream SSE del historial de eventos (reemplaza el sondeo cada 30s)
+    GET /api/registro-eventos/stream/?ticket=<ticket>
+
+    El ticket se pide con POST /api/registro-eventos/stream/ticket/ y solo
+    se valida al abrir la conexión; si vence antes de una reconexión, el
+    cliente pide otro y reabre con ?desde=<último id recibido>.
+
+    Envía cada RegistroEvento nuevo como un evento "registro". Si el
+    navegador se reconecta con la cabecera Last-Event-ID (o ?desde=<id>),
+    primero se envían los registros que se perdió.
+
+    Requiere servir la app con el punto de entrada ASGI (legajos/asgi.py),
+    donde cada conexión abierta es solo una corrutina en espera.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'El stream de eventos requiere el servidor ASGI (legajos.asgi)'},
+            status=501
+        )
+
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        return JsonResponse({'detail': 'Las credenciales de autenticación no se proveyeron.'}, status=401)
+    try:
+        await sync_to_async(usuario_de_ticket)(ticket)
+    except AuthenticationFailed as e:
+        return JsonResponse({'detail': str(e.detail)}, status=401)
+
+    desde = request.headers.get('Last-Event-ID') or request.GET.get('desde')
+    desde_id = int(desde) if desde and desde.isdigit() else None
+
+    response = StreamingHttpResponse(flujo_eventos(desde_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,231 @@
+"""
+Campos a pedido en las lecturas de los viewsets (sparse fieldsets).
+
+    GET /api/personal/?fields=id,dni,nombre_completo
+    GET /api/legajos/?exclude=archivo_url,thumbnail_url
+
+Además de recortar la respuesta, la consulta se proyecta a lo que usan los
+campos que quedan: las columnas que no se muestran van a .defer() (también
+las de las relaciones de select_related) y las relaciones que ya no se
+usan salen del select_related. Así un listado no carga direccion,
+observaciones ni descripcion si no los muestra.
+
+Los campos calculados (SerializerMethodField, propiedades del modelo)
+declaran las columnas que leen en el serializer:
+
+    class PersonalSerializer(serializers.ModelSerializer):
+        campos_dependencias = {
+            'nombre_completo': ('nombres', 'apellido_paterno', 'apellido_materno'),
+            'cargo_nombre': ('cargo__nombre', 'cargo_actual'),
+        }
+
+Una dependencia que nombra una relación (ej. 'cargo') la pide completa.
+Si algún campo no se puede resolver, solo se recorta la respuesta y la
+consulta queda como estaba.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .instrumentacion import medir_serializacion
+from .pagination import PaginacionNumerada
+
+ENTERO = '*'  # relación usada completa: no se difiere ninguna de sus columnas
+
+
+def _lista(valor):
+    return {nombre.strip() for nombre in (valor or '').split(',') if nombre.strip()}
+
+
+def _agregar(modelo, arbol, partes, entero):
+    """
+    Marcar en `arbol` la ruta `partes` (nombres de campos desde `modelo`).
+    Retorna False si la ruta no corresponde a campos del modelo raíz.
+    """
+    for indice, parte in enumerate(partes):
+        try:
+            campo = modelo._meta.get_field(parte)
+        except FieldDoesNotExist:
+            # Propiedad o método del modelo raíz: no se sabe qué columnas usa
+            # (en una relación se resuelve abajo, pidiéndola completa)
+            return False
+        if campo.many_to_many or campo.one_to_many:
+            return False
+        ultimo = indice == len(partes) - 1
+        if not campo.is_relation:
+            arbol[parte] = True
+            return True
+        if arbol.get(parte) == ENTERO:
+            return True
+        if ultimo:
+            arbol[parte] = ENTERO if entero else arbol.get(parte) or {}
+            return True
+        siguiente = arbol.get(parte)
+        if not isinstance(siguiente, dict):
+            siguiente = arbol[parte] = {}
+        # Si la parte siguiente no es un campo, la relación se usa completa
+        try:
+            campo.related_model._meta.get_field(partes[indice + 1])
+        except FieldDoesNotExist:
+            arbol[parte] = ENTERO
+            return True
+        arbol, modelo = siguiente, campo.related_model
+    return True
+
+
+def arbol_de_columnas(serializer_class, campos, modelo, extra=()):
+    """
+    Árbol {campo: True | ENTERO | {subárbol}} con lo que leen `campos`
+    (dict nombre → campo del serializer), o None si no se puede saber.
+    """
+    dependencias = getattr(serializer_class, 'campos_dependencias', {})
+    arbol = {}
+    for nombre, campo in campos.items():
+        if campo.write_only:
+            continue
+        if nombre in dependencias:
+            for ruta in dependencias[nombre]:
+                if not _agregar(modelo, arbol, ruta.split('__'), entero=True):
+                    return None
+            continue
+        if campo.source == '*' or isinstance(campo, serializers.SerializerMethodField):
+            return None
+        entero = isinstance(campo, serializers.BaseSerializer)
+        if not _agregar(modelo, arbol, campo.source.split('.'), entero):
+            return None
+    for ruta in extra:
+        # Anotaciones u otros órdenes que no son columnas no hace falta cargarlos
+        _agregar(modelo, arbol, ruta.split('__'), entero=False)
+    return arbol
+
+
+def _podar_relaciones(relaciones, arbol):
+    """select_related reducido a las relaciones presentes en el árbol"""
+    podadas = {}
+    for nombre, hijas in relaciones.items():
+        sub = arbol.get(nombre)
+        if not sub:
+            # No se usa, o solo su ID (la columna de la FK alcanza)
+            continue
+        podadas[nombre] = hijas if sub == ENTERO else _podar_relaciones(hijas, sub if isinstance(sub, dict) else {})
+    return podadas
+
+
+def _rutas(relaciones, prefijo=''):
+    for nombre, hijas in relaciones.items():
+        ruta = f'{prefijo}{nombre}'
+        yield ruta
+        yield from _rutas(hijas, f'{ruta}__')
+
+
+def _diferibles(modelo, arbol, relaciones, prefijo=''):
+    for campo in modelo._meta.concrete_fields:
+        if campo.primary_key:
+            continue
+        sub = arbol.get(campo.name)
+        if sub is None:
+            yield f'{prefijo}{campo.name}'
+        elif campo.is_relation and isinstance(sub, dict) and campo.name in relaciones:
+            yield from _diferibles(campo.related_model, sub, relaciones[campo.name], f'{prefijo}{campo.name}__')
+
+
+def proyectar(queryset, arbol):
+    """Aplicar el árbol de columnas al queryset (select_related + defer)"""
+    relaciones = queryset.query.select_related
+    if relaciones is True:
+        return queryset
+    relaciones = _podar_relaciones(relaciones or {}, arbol)
+    queryset = queryset.select_related(None)
+    if relaciones:
+        queryset = queryset.select_related(*_rutas(relaciones))
+    diferir = list(_diferibles(queryset.model, arbol, relaciones))
+    return queryset.defer(*diferir) if diferir else queryset
+
+
+class CamposDinamicosMixin:
+    """
+    ?fields= / ?exclude= en list y retrieve (GET), recortando la respuesta
+    y proyectando la consulta. Las escrituras no se ven afectadas.
+    """
+    acciones_campos = ('list', 'retrieve')
+
+    def _aplica_campos(self):
+        request = getattr(self, 'request', None)
+        return request is not None and request.method == 'GET' and self.action in self.acciones_campos
+
+    def _campos_salida(self):
+        """Campos del serializer que quedan en la respuesta (se calcula una vez)"""
+        if not hasattr(self, '_campos_salida_cache'):
+            serializer = self.get_serializer_class()(context=self.get_serializer_context())
+            disponibles = serializer.fields
+            incluir = _lista(self.request.query_params.get('fields'))
+            excluir = _lista(self.request.query_params.get('exclude'))
+            desconocidos = (incluir | excluir) - set(disponibles)
+            if desconocidos:
+                raise ValidationError({'fields': f'Campos desconocidos: {", ".join(sorted(desconocidos))}'})
+            self._campos_salida_cache = {
+                nombre: campo for nombre, campo in disponibles.items()
+                if (not incluir or nombre in incluir) and nombre not in excluir
+            }
+        return self._campos_salida_cache
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self._aplica_campos():
+            campos = serializer.child.fields if isinstance(serializer, serializers.ListSerializer) else serializer.fields
+            for nombre in set(campos) - set(self._campos_salida()):
+                campos.pop(nombre)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self._aplica_campos():
+            return queryset
+        # El orden (y el del cursor) también se lee de las filas
+        ordenes = [orden.lstrip('-') for orden in queryset.query.order_by if isinstance(orden, str) and orden != '?']
+        cursor = getattr(self, 'cursor_ordering', ())
+        ordenes += [orden.lstrip('-') for orden in ((cursor,) if isinstance(cursor, str) else cursor)]
+        arbol = arbol_de_columnas(self.get_serializer_class(), self._campos_salida(), queryset.model, ordenes)
+        return queryset if arbol is None else proyectar(queryset, arbol)
+
+
+class ListaRapidaMixin:
+    """
+    list() con .values() para los serializers que declaran columnas_valores
+    y desde_valores(fila, contexto): no se instancian modelos ni se recorren
+    los campos del serializer, con la misma salida (también ?fields=/?exclude=
+    y ambas paginaciones). Va antes de CamposDinamicosMixin en las bases.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, 'desde_valores'):
+            return super().list(request, *args, **kwargs)
+
+        base = self.filter_queryset(self.get_queryset())
+        queryset = base.values(*serializer_class.columnas_valores)
+        page = self.paginar_valores(queryset, base)
+        filas = page if page is not None else list(queryset)
+
+        with medir_serializacion():
+            contexto = self.get_serializer_context()
+            if hasattr(serializer_class, 'contexto_valores'):
+                contexto = serializer_class.contexto_valores(contexto)
+            datos = [serializer_class.desde_valores(fila, contexto) for fila in filas]
+
+            parametros = request.query_params
+            if isinstance(self, CamposDinamicosMixin) and (parametros.get('fields') or parametros.get('exclude')):
+                campos = self._campos_salida()
+                datos = [{nombre: valor for nombre, valor in dato.items() if nombre in campos} for dato in datos]
+
+        if page is not None:
+            return self.get_paginated_response(datos)
+        return Response(datos)
+
+    def paginar_valores(self, queryset, base):
+        # El COUNT(*) de la paginación se hace sobre `base`, sin los JOIN
+        # que agregan las columnas de values()
+        if isinstance(self.paginator, PaginacionNumerada):
+            return self.paginator.paginate_queryset(queryset, self.request, view=self, conteo=base.count)
+        return self.paginate_queryset(queryset)
@@ -0,0 +1,330 @@
+"""
+Instrumentación por petición: consultas SQL, tiempo de base de datos,
+de serialización, de la vista y de render.
+
+InstrumentacionMiddleware agrega el header Server-Timing (visible en la
+pestaña Network del navegador) y escribe una línea JSON en el logger
+'legajos.instrumentacion'. Con INSTRUMENTACION_MUESTREO > 0, una fracción
+de las peticiones guarda además sus consultas más lentas en un buffer
+circular por endpoint (GET /api/instrumentacion/consultas-lentas/).
+
+El tiempo de serialización se mide en las vistas con
+SerializacionMedidaMixin (el .data de lo que devuelve get_serializer()).
+"""
+import heapq
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Medición de la petición en curso (se copia a los hilos de sync_to_async)
+_medicion = ContextVar('instrumentacion_medicion', default=None)
+
+# Grupos nombrados de las rutas del router: (?P<pk>[^/.]+) -> <pk>
+_GRUPO_NOMBRADO = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def _config(nombre, defecto):
+    return getattr(settings, f'INSTRUMENTACION_{nombre}', defecto)
+
+
+class Medicion:
+    """Tiempos acumulados de una petición (en segundos)"""
+
+    def __init__(self, muestrear=False):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tiempo_sql = 0.0
+        self.tiempo_serializador = 0.0
+        self.tiempo_vista = 0.0
+        self.tiempo_render = 0.0
+        self.profundidad_serializador = 0
+        self.muestrear = muestrear
+        self.sql = []  # (duración, sql) solo si se muestrea
+
+    def total(self):
+        return time.perf_counter() - self.inicio
+
+    def server_timing(self):
+        partes = [
+            f'db;dur={self.tiempo_sql * 1000:.1f};desc="{self.consultas} consultas"',
+            f'serializador;dur={self.tiempo_serializador * 1000:.1f}',
+            f'vista;dur={self.tiempo_vista * 1000:.1f}',
+        ]
+        if self.tiempo_render:
+            partes.append(f'render;dur={self.tiempo_render * 1000:.1f}')
+        partes.append(f'total;dur={self.total() * 1000:.1f}')
+        return ', '.join(partes)
+
+
+# ==============================
+# Consultas SQL
+# ==============================
+
+def _medir_consulta(execute, sql, params, many, context):
+    medicion = _medicion.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = time.perf_counter() - inicio
+        medicion.consultas += 1
+        medicion.tiempo_sql += duracion
+        if medicion.muestrear:
+            medicion.sql.append((duracion, sql))
+
+
+def _instalar_en_conexion(sender, connection, **kwargs):
+    if _medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_medir_consulta)
+
+
+# ==============================
+# Serializadores
+# ==============================
+
+@contextmanager
+def medir_serializacion():
+    """Suma el bloque al tiempo de serialización (solo el más externo si se anidan)"""
+    medicion = _medicion.get()
+    if medicion is None:
+        yield
+        return
+    medicion.profundidad_serializador += 1
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion.profundidad_serializador -= 1
+        if medicion.profundidad_serializador == 0:
+            medicion.tiempo_serializador += time.perf_counter() - inicio
+
+
+class _DataMedida:
+    @property
+    def data(self):
+        with medir_serializacion():
+            return super().data
+
+
+_clases_medidas = {}
+
+
+def _clase_medida(clase):
+    """Subclase de `clase` (Serializer o ListSerializer) con .data medido, una por clase"""
+    if issubclass(clase, _DataMedida):
+        return clase
+    medida = _clases_medidas.get(clase)
+    if medida is None:
+        medida = type(clase.__name__, (_DataMedida, clase), {'__module__': clase.__module__})
+        _clases_medidas[clase] = medida
+    return medida
+
+
+class SerializacionMedidaMixin:
+    """
+    Vistas de DRF: el .data de los serializers que devuelve get_serializer()
+    se suma al tiempo de serialización de la petición. Va primero en las bases.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        serializer.__class__ = _clase_medida(type(serializer))
+        return serializer
+
+
+_instalado = False
+_instalado_lock = threading.Lock()
+
+
+def instalar():
+    """Registrar los ganchos de medición (una vez por proceso)"""
+    global _instalado
+    with _instalado_lock:
+        if _instalado:
+            return
+        connection_created.connect(_instalar_en_conexion, dispatch_uid='instrumentacion_sql')
+        for conexion in connections.all(initialized_only=True):
+            _instalar_en_conexion(sender=None, connection=conexion)
+        _instalado = True
+
+
+# ==============================
+# Consultas lentas (muestreo)
+# ==============================
+
+class ConsultasLentas:
+    """
+    Buffer circular en memoria con las consultas más lentas por endpoint.
+    Guarda hasta INSTRUMENTACION_CONSULTAS_POR_ENDPOINT por endpoint y
+    descarta el endpoint menos reciente al pasar de INSTRUMENTACION_ENDPOINTS_MAX.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = OrderedDict()
+
+    def registrar(self, endpoint, medicion):
+        por_peticion = _config('CONSULTAS_POR_PETICION', 5)
+        lentas = heapq.nlargest(por_peticion, medicion.sql, key=lambda item: item[0])
+        if not lentas:
+            return
+        fecha = timezone.now().isoformat()
+        with self._lock:
+            buffer = self._endpoints.pop(endpoint, None)
+            if buffer is None:
+                buffer = deque(maxlen=_config('CONSULTAS_POR_ENDPOINT', 50))
+            self._endpoints[endpoint] = buffer
+            while len(self._endpoints) > _config('ENDPOINTS_MAX', 200):
+                self._endpoints.popitem(last=False)
+            for duracion, sql in lentas:
+                buffer.append({
+                    'duracion_ms': round(duracion * 1000, 2),
+                    'sql': sql,
+                    'fecha': fecha,
+                    'consultas_peticion': medicion.consultas,
+                })
+
+    def resumen(self, limite=10):
+        with self._lock:
+            copia = {endpoint: list(buffer) for endpoint, buffer in self._endpoints.items()}
+        resultado = []
+        for endpoint, consultas in copia.items():
+            consultas.sort(key=lambda c: c['duracion_ms'], reverse=True)
+            resultado.append({
+                'endpoint': endpoint,
+                'maximo_ms': consultas[0]['duracion_ms'],
+                'consultas': consultas[:limite],
+            })
+        resultado.sort(key=lambda e: e['maximo_ms'], reverse=True)
+        return resultado
+
+    def limpiar(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+consultas_lentas = ConsultasLentas()
+
+
+# ==============================
+# Middleware
+# ==============================
+
+class InstrumentacionMiddleware:
+    """
+    Mide cada petición y agrega el header Server-Timing, por ejemplo:
+
+        Server-Timing: db;dur=12.4;desc="3 consultas", serializador;dur=8.1,
+                       vista;dur=25.0, render;dur=2.3, total;dur=28.9
+
+    Se desactiva con INSTRUMENTACION_ACTIVA = False.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activa = _config('ACTIVA', True)
+        if self.activa:
+            instalar()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.activa:
+            return self.get_response(request)
+        medicion = Medicion(muestrear=self.muestrear())
+        token = _medicion.set(medicion)
+        try:
+            response = self.get_response(request)
+        finally:
+            _medicion.reset(token)
+        return self.finalizar(request, response, medicion)
+
+    async def __acall__(self, request):
+        if not self.activa:
+            return await self.get_response(request)
+        medicion = Medicion(muestrear=self.muestrear())
+        token = _medicion.set(medicion)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _medicion.reset(token)
+        return self.finalizar(request, response, medicion)
+
+    @staticmethod
+    def muestrear():
+        fraccion = _config('MUESTREO', 0.0)
+        return fraccion > 0 and random.random() < fraccion
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        medicion = _medicion.get()
+        if medicion is not None:
+            request._instrumentacion_vista = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        # Las Response de DRF se renderizan después de este punto
+        medicion = _medicion.get()
+        inicio_vista = getattr(request, '_instrumentacion_vista', None)
+        if medicion is not None and inicio_vista is not None:
+            medicion.tiempo_vista = time.perf_counter() - inicio_vista
+            inicio_render = time.perf_counter()
+
+            def fin_render(response):
+                medicion.tiempo_render = time.perf_counter() - inicio_render
+
+            response.add_post_render_callback(fin_render)
+        return response
+
+    def finalizar(self, request, response, medicion):
+        inicio_vista = getattr(request, '_instrumentacion_vista', None)
+        if not medicion.tiempo_vista and inicio_vista is not None:
+            medicion.tiempo_vista = time.perf_counter() - inicio_vista
+
+        endpoint = self.endpoint(request)
+        response['Server-Timing'] = medicion.server_timing()
+
+        logger.info(json.dumps({
+            'endpoint': endpoint,
+            'ruta': request.path,
+            'status': response.status_code,
+            'consultas': medicion.consultas,
+            'db_ms': round(medicion.tiempo_sql * 1000, 2),
+            'serializador_ms': round(medicion.tiempo_serializador * 1000, 2),
+            'vista_ms': round(medicion.tiempo_vista * 1000, 2),
+            'render_ms': round(medicion.tiempo_render * 1000, 2),
+            'total_ms': round(medicion.total() * 1000, 2),
+        }))
+
+        if medicion.muestrear:
+            consultas_lentas.registrar(endpoint, medicion)
+        return response
+
+    @staticmethod
+    def endpoint(request):
+        """'GET api/personal/<pk>/legajo/' en vez de la URL concreta"""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return f'{request.method} {request.path}'
+        ruta = _GRUPO_NOMBRADO.sub(r'<\1>', match.route).lstrip('^').rstrip('$')
+        return f'{request.method} {ruta}'
+
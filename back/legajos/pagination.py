@@ -0,0 +1,74 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PaginadorConteo(Paginator):
+    """Paginator de Django que acepta cómo calcular el total (`conteo`)"""
+
+    def __init__(self, object_list, per_page, conteo=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.conteo = conteo
+
+    @cached_property
+    def count(self):
+        if self.conteo is not None:
+            return self.conteo()
+        return super().count
+
+
+class PaginacionNumerada(PageNumberPagination):
+    """
+    PageNumberPagination (DEFAULT_PAGINATION_CLASS) a la que la vista puede
+    pasar el COUNT(*) aparte del queryset que se pagina:
+
+        paginator.paginate_queryset(queryset.values(...), request, view, conteo=base.count)
+    """
+    conteo = None
+
+    def django_paginator_class(self, queryset, page_size):
+        return PaginadorConteo(queryset, page_size, conteo=self.conteo)
+
+    def paginate_queryset(self, queryset, request, view=None, conteo=None):
+        self.conteo = conteo
+        return super().paginate_queryset(queryset, request, view)
+
+
+class PaginacionCursor(CursorPagination):
+    """
+    Paginación por cursor (keyset): cada página filtra con WHERE sobre el
+    último valor visto en lugar de OFFSET, y no ejecuta COUNT(*).
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class PaginacionHibrida(PaginacionNumerada):
+    """
+    Paginación por número de página (la de siempre) o por cursor,
+    elegida en cada petición:
+
+        GET /api/legajos/?page=3                 → page-number (con count)
+        GET /api/legajos/?paginacion=cursor      → primera página por cursor
+        GET /api/legajos/?cursor=<token>         → páginas siguientes (next/previous)
+
+    El orden del cursor se toma de `cursor_ordering` en la vista y debe
+    coincidir con un índice de la tabla.
+    """
+    cursor_ordering = '-id'
+
+    def usa_cursor(self, request):
+        return 'cursor' in request.query_params or request.query_params.get('paginacion') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None, conteo=None):
+        self.cursor = None
+        if self.usa_cursor(request):
+            self.cursor = PaginacionCursor()
+            self.cursor.ordering = getattr(view, 'cursor_ordering', self.cursor_ordering)
+            return self.cursor.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view, conteo)
+
+    def get_paginated_response(self, data):
+        if self.cursor is not None:
+            return self.cursor.get_paginated_response(data)
+        return super().get_paginated_response(data)
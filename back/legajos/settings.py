@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -25,6 +26,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Terceros
     'rest_framework',
@@ -37,12 +39,15 @@ INSTALLED_APPS = [
     'organizacion',
     'tickets',
     'eventos',      # ← AGREGADO
+    'dashboard',
+    'tareas',
 ]
 
 # ==============================
 # MIDDLEWARE
 # ==============================
 MIDDLEWARE = [
+    'legajos.instrumentacion.InstrumentacionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -51,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'eventos.middleware.AuditoriaMiddleware',
 ]
 
 # ==============================
@@ -133,11 +139,129 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # JSON con orjson si está instalado (legajos.renderers)
+    'DEFAULT_RENDERER_CLASSES': (
+        'legajos.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'legajos.renderers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'legajos.pagination.PaginacionNumerada',
     'PAGE_SIZE': 20,
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
 }
 
+# ==============================
+# CACHE
+# ==============================
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Compartido entre los workers del servidor: versiones de los catálogos
+    # (organizacion.cache) y estadísticas del dashboard (dashboard.utils).
+    # Con varios servidores usar Redis/Memcached.
+    'compartido': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'legajos_cache'),
+    },
+}
+
+# Cada cuántos segundos un worker verifica si cambió la versión de un catálogo
+CATALOGOS_INTERVALO_VERIFICACION = 1.0
+
+DASHBOARD_CACHE_TTL = 30  # segundos
+DASHBOARD_EVENTOS_MAX = 20
+
+# ==============================
+# AUDITORÍA (eventos.utils.registrar)
+# ==============================
+# Los eventos se escriben con bulk_create al terminar cada petición.
+# Con True, se delegan a un hilo de fondo que agrupa varias peticiones.
+EVENTOS_ESCRITURA_EN_SEGUNDO_PLANO = False
+EVENTOS_TAMANO_LOTE = 500
+EVENTOS_INTERVALO_ESCRITURA = 2.0  # segundos
+
+# Stream SSE /api/registro-eventos/stream/ (solo con el servidor ASGI)
+EVENTOS_STREAM_INTERVALO = 2.0  # segundos entre consultas de registros nuevos
+EVENTOS_STREAM_LATIDO = 15      # segundos entre comentarios keep-alive
+EVENTOS_STREAM_VENTANA = 100    # ids bajo el último enviado que se vuelven a revisar (commits tardíos)
+EVENTOS_STREAM_TICKET_SEGUNDOS = 30  # vigencia del ticket para abrir el stream
+
+# ==============================
+# DESCARGAS (personal.descargas.servir_archivo)
+# ==============================
+# None: Django envía el archivo (con soporte de Range y 304).
+# 'x-accel': responde con X-Accel-Redirect para que nginx envíe los bytes, por ejemplo:
+#     location /protegido/ { internal; alias /app/media/; }
+# 'x-sendfile': responde con X-Sendfile (apache mod_xsendfile).
+DESCARGAS_OFFLOAD = None
+DESCARGAS_ACCEL_PREFIJO = '/protegido/'
+
+# ==============================
+# CARGAS POR BLOQUES (personal.cargas, /api/cargas/)
+# ==============================
+# Los bloques se guardan fuera de MEDIA_ROOT hasta completar la carga.
+# Las sesiones vencidas se borran con: python manage.py limpiar_cargas (cron)
+CARGAS_DIRECTORIO = BASE_DIR / 'cargas_temporales'
+CARGAS_TAMANO_BLOQUE = 5 * 1024 * 1024
+CARGAS_TAMANO_MAXIMO = 200 * 1024 * 1024
+CARGAS_EXPIRACION_HORAS = 24  # desde el último bloque recibido
+
+# ==============================
+# TEXTO DE LOS DOCUMENTOS (personal.texto, /api/legajos/buscar/)
+# ==============================
+TEXTO_MAXIMO_CARACTERES = 200000  # por documento
+
+# ==============================
+# SINCRONIZACIÓN INCREMENTAL (personal.cambios, /api/personal/changes/)
+# ==============================
+PERSONAL_CAMBIOS_LIMITE = 500          # filas por respuesta (?limite=, hasta 2000)
+PERSONAL_CAMBIOS_MARGEN = 2            # segundos: las filas más recientes van en la siguiente consulta
+PERSONAL_CAMBIOS_RETENCION_DIAS = 30   # marcas de borrado; tokens más antiguos → 410
+
+# ==============================
+# COLA DE TAREAS (tareas, python manage.py procesar_tareas)
+# ==============================
+# La cola es la tabla `tareas` de PostgreSQL; no hace falta otro servicio.
+TAREAS_CONCURRENCIA = 2       # hilos por worker
+TAREAS_INTERVALO = 2.0        # segundos entre consultas cuando no hay tareas
+TAREAS_MAX_INTENTOS = 3
+TAREAS_REINTENTO_BASE = 30    # segundos; se duplica en cada reintento
+TAREAS_LATIDO = 30            # segundos entre latidos del worker a sus tareas en proceso
+TAREAS_TIEMPO_MAXIMO = 120    # segundos sin latido antes de considerar abandonada una tarea
+TAREAS_CONSERVAR_DIAS = 7     # las completadas se borran después
+
+# ==============================
+# INSTRUMENTACIÓN (legajos.instrumentacion)
+# ==============================
+# Header Server-Timing y una línea JSON por petición en el logger 'legajos.instrumentacion'
+INSTRUMENTACION_ACTIVA = True
+# Fracción de peticiones (0.0 - 1.0) que guardan sus consultas más lentas
+# en memoria: GET /api/instrumentacion/consultas-lentas/ (solo ADMIN)
+INSTRUMENTACION_MUESTREO = 0.0
+INSTRUMENTACION_CONSULTAS_POR_PETICION = 5
+INSTRUMENTACION_CONSULTAS_POR_ENDPOINT = 50
+INSTRUMENTACION_ENDPOINTS_MAX = 200
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'legajos.instrumentacion': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # ==============================
 # JWT CONFIG
 # ==============================
@@ -163,4 +287,9 @@ CORS_ALLOW_METHODS = [
 CORS_ALLOW_HEADERS = [
     'accept', 'accept-encoding', 'authorization', 'content-type',
     'dnt', 'origin', 'user-agent', 'x-csrftoken', 'x-requested-with',
+    'range', 'if-range',
+]
+# Para que los visores de PDF lean rangos y la validación del caché desde el frontend
+CORS_EXPOSE_HEADERS = [
+    'accept-ranges', 'content-disposition', 'content-length', 'content-range', 'etag',
 ]
\ No newline at end of file
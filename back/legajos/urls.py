@@ -14,11 +14,14 @@ from organizacion.views import (
     CondicionLaboralViewSet,
     CargoViewSet,
     SeccionLegajoViewSet,      # NUEVO ⭐
-    TipoDocumentoViewSet        # ACTUALIZADO ⭐
+    TipoDocumentoViewSet,       # ACTUALIZADO ⭐
+    CatalogosView,
 )
-from personal.views import PersonalViewSet, EscalafonViewSet, LegajoViewSet
+from personal.views import PersonalViewSet, EscalafonViewSet, LegajoViewSet, SesionCargaViewSet
 from tickets.views import TicketViewSet
-from eventos.views import EventoViewSet, RegistroEventoViewSet
+from eventos.views import EventoViewSet, RegistroEventoViewSet, TicketStreamView, stream_registro_eventos
+from dashboard.views import DashboardView
+from legajos.views import ConsultasLentasView
 
 # Router para las APIs
 router = DefaultRouter()
@@ -32,6 +35,7 @@ router.register(r'tipos-documento', TipoDocumentoViewSet, basename='tipo-documen
 router.register(r'personal', PersonalViewSet, basename='personal')
 router.register(r'escalafones', EscalafonViewSet, basename='escalafon')
 router.register(r'legajos', LegajoViewSet, basename='legajo')
+router.register(r'cargas', SesionCargaViewSet, basename='carga')
 router.register(r'tickets', TicketViewSet, basename='ticket')
 router.register(r'eventos', EventoViewSet, basename='evento')
 router.register(r'registro-eventos', RegistroEventoViewSet, basename='registro-evento')
@@ -44,6 +48,11 @@ urlpatterns = [
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
     # API endpoints
+    path('api/dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('api/catalogos/', CatalogosView.as_view(), name='catalogos'),
+    path('api/registro-eventos/stream/', stream_registro_eventos, name='registro-eventos-stream'),
+    path('api/registro-eventos/stream/ticket/', TicketStreamView.as_view(), name='registro-eventos-stream-ticket'),
+    path('api/instrumentacion/consultas-lentas/', ConsultasLentasView.as_view(), name='consultas-lentas'),
     path('api/', include(router.urls)),
 ]
 
@@ -0,0 +1,28 @@
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from usuarios.permissions import IsAdmin
+
+from .instrumentacion import consultas_lentas
+
+
+class ConsultasLentasView(APIView):
+    """
+    Consultas más lentas por endpoint capturadas por InstrumentacionMiddleware
+    (requiere INSTRUMENTACION_MUESTREO > 0).
+
+    GET    /api/instrumentacion/consultas-lentas/?limite=10
+    DELETE /api/instrumentacion/consultas-lentas/   (vacía el buffer)
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        try:
+            limite = max(1, int(request.query_params.get('limite', 10)))
+        except ValueError:
+            limite = 10
+        return Response(consultas_lentas.resumen(limite=limite))
+
+    def delete(self, request):
+        consultas_lentas.limpiar()
+        return Response(status=204)
@@ -0,0 +1,116 @@
+"""
+Catálogos de organizacion en memoria del proceso, con versión por catálogo.
+
+Áreas, regímenes, condiciones laborales, cargos, secciones y tipos de
+documento son tablas pequeñas que casi nunca cambian. Cada proceso guarda
+una copia y solo la recarga cuando cambia la versión del catálogo, que
+vive en el cache compartido (CACHES['compartido']) para que un cambio
+hecho en un worker invalide la copia de todos los demás.
+
+    from organizacion.cache import catalogos
+
+    catalogos['secciones'].obtener(3)        # SeccionLegajo o None, sin consultar la base
+    catalogos['cargos'].objetos()            # lista en el orden de Meta.ordering
+    catalogos['cargos'].derivado('mapa', MapaCargos)   # calculado una vez por versión
+
+La versión se renueva con post_save/post_delete (ver organizacion.signals),
+lo que incluye toggle_active. Los objetos devueltos se comparten entre
+peticiones: no se deben modificar.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Area, Cargo, CondicionLaboral, Regimen, SeccionLegajo, TipoDocumento
+
+
+def _cache():
+    return caches['compartido']
+
+
+class Catalogo:
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self.clave_version = f'catalogo:{modelo._meta.label_lower}:version'
+        self._lock = threading.Lock()
+        self._version = None
+        self._verificado = 0.0
+        self._objetos = []
+        self._por_id = {}
+        self._derivados = {}
+
+    def version(self):
+        """Versión compartida del catálogo (se crea si el cache no la tiene)"""
+        version = _cache().get(self.clave_version)
+        if version is None:
+            _cache().add(self.clave_version, str(time.time_ns()), timeout=None)
+            version = _cache().get(self.clave_version)
+        return version
+
+    def _vigente(self):
+        """Recargar la copia local si cambió la versión compartida"""
+        ahora = time.monotonic()
+        intervalo = getattr(settings, 'CATALOGOS_INTERVALO_VERIFICACION', 1.0)
+        if self._version is not None and ahora - self._verificado < intervalo:
+            return
+        # La versión se lee antes que los datos: si cambia en medio, la
+        # próxima verificación vuelve a cargar
+        version = self.version()
+        with self._lock:
+            if version != self._version:
+                objetos = list(self.modelo.objects.all())
+                self._objetos = objetos
+                self._por_id = {objeto.pk: objeto for objeto in objetos}
+                self._derivados = {}
+                self._version = version
+            self._verificado = ahora
+
+    def version_local(self):
+        """Versión de la copia de este proceso (la de objetos() y derivado())"""
+        self._vigente()
+        return self._version
+
+    def objetos(self):
+        self._vigente()
+        return self._objetos
+
+    def obtener(self, pk):
+        self._vigente()
+        try:
+            return self._por_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def derivado(self, nombre, funcion):
+        """funcion(objetos) calculada una sola vez por versión (ej. datos serializados)"""
+        self._vigente()
+        version, objetos = self._version, self._objetos
+        guardado = self._derivados.get(nombre)
+        if guardado is None or guardado[0] != version:
+            guardado = (version, funcion(objetos))
+            self._derivados[nombre] = guardado
+        return guardado[1]
+
+    def invalidar(self):
+        """Nueva versión para todos los procesos (y recarga inmediata en este)"""
+        _cache().set(self.clave_version, str(time.time_ns()), timeout=None)
+        with self._lock:
+            self._version = None
+
+
+catalogos = {
+    'areas': Catalogo(Area),
+    'regimenes': Catalogo(Regimen),
+    'condiciones_laborales': Catalogo(CondicionLaboral),
+    'cargos': Catalogo(Cargo),
+    'secciones': Catalogo(SeccionLegajo),
+    'tipos_documento': Catalogo(TipoDocumento),
+}
+
+_por_modelo = {catalogo.modelo: catalogo for catalogo in catalogos.values()}
+
+
+def catalogo_de(modelo):
+    return _por_modelo[modelo]
@@ -1,9 +1,25 @@
 # organizacion/serializers.py - SIMPLIFICADO
 
 from rest_framework import serializers
+from .cache import catalogo_de
 from .models import Area, Regimen, CondicionLaboral, Cargo, SeccionLegajo, TipoDocumento
 
 
+class CatalogoRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que resuelve el ID con la copia en memoria del
+    catálogo (organizacion.cache) en lugar de una consulta por campo.
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        objeto = catalogo_de(self.get_queryset().model).obtener(data)
+        if objeto is None:
+            # ID inválido o recién creado en otro worker: consulta normal
+            return super().to_internal_value(data)
+        return objeto
+
+
 class AreaSerializer(serializers.ModelSerializer):
     class Meta:
         model = Area
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import catalogos
+
+
+def _invalidar_al_confirmar(sender, **kwargs):
+    """
+    Cualquier alta, edición, toggle_active o baja renueva la versión del
+    catálogo, después del commit para que los demás workers no recarguen
+    los datos anteriores.
+    """
+    catalogo = next(c for c in catalogos.values() if c.modelo is sender)
+    transaction.on_commit(catalogo.invalidar)
+
+
+for _catalogo in catalogos.values():
+    receiver(post_save, sender=_catalogo.modelo, dispatch_uid=f'catalogo_save_{_catalogo.clave_version}')(_invalidar_al_confirmar)
+    receiver(post_delete, sender=_catalogo.modelo, dispatch_uid=f'catalogo_delete_{_catalogo.clave_version}')(_invalidar_al_confirmar)
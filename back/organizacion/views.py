@@ -1,9 +1,13 @@
 # organizacion/views.py - SIMPLIFICADO
 
+import hashlib
+
+from django.utils.cache import get_conditional_response
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from .models import Area, Regimen, CondicionLaboral, Cargo, SeccionLegajo, TipoDocumento
 from .serializers import (
     AreaSerializer,
@@ -13,11 +17,65 @@ from .serializers import (
     SeccionLegajoSerializer,
     TipoDocumentoSerializer
 )
+from legajos.instrumentacion import SerializacionMedidaMixin
 from usuarios.permissions import IsAdmin
+from .cache import catalogos
+
 
+class CatalogoEnMemoriaMixin:
+    """
+    Lecturas (list, retrieve y las acciones de activos) servidas desde la
+    copia en memoria del catálogo, con los datos serializados una vez por
+    versión. Las búsquedas (?search) y ?ordering siguen yendo a la base.
 
-class AreaViewSet(viewsets.ModelViewSet):
+    parametro_activo: 'activo' filtra por true/false; 'activas'/'activos'
+    solo aceptan true (como los filtros originales de cada viewset).
+    """
+    catalogo = None
+    parametro_activo = 'activo'
+    
+    def _datos_por_id(self):
+        serializer_class = self.get_serializer_class()
+        return self.catalogo.derivado(
+            f'datos:{serializer_class.__name__}',
+            lambda objetos: {objeto.pk: dato for objeto, dato in zip(objetos, serializer_class(objetos, many=True).data)},
+        )
+    
+    def _filtrar(self, solo_activos):
+        datos = self._datos_por_id()
+        return [datos[objeto.pk] for objeto in self.catalogo.objetos() if solo_activos is None or objeto.activo == solo_activos]
+    
+    def list(self, request, *args, **kwargs):
+        parametros = request.query_params
+        if parametros.get('search') or parametros.get('ordering'):
+            return super().list(request, *args, **kwargs)
+        
+        valor = parametros.get(self.parametro_activo)
+        if valor is None:
+            solo_activos = None
+        elif self.parametro_activo == 'activo':
+            solo_activos = valor.lower() == 'true'
+        else:
+            solo_activos = True if valor == 'true' else None
+        datos = self._filtrar(solo_activos)
+        
+        page = self.paginate_queryset(datos)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(datos)
+    
+    def retrieve(self, request, *args, **kwargs):
+        objeto = self.catalogo.obtener(kwargs.get(self.lookup_url_kwarg or self.lookup_field))
+        if objeto is None:
+            # Inexistente (404) o recién creado en otro worker
+            return super().retrieve(request, *args, **kwargs)
+        self.check_object_permissions(request, objeto)
+        return Response(self._datos_por_id()[objeto.pk])
+
+
+class AreaViewSet(SerializacionMedidaMixin, CatalogoEnMemoriaMixin, viewsets.ModelViewSet):
     queryset = Area.objects.all()
+    catalogo = catalogos['areas']
     permission_classes = [IsAuthenticated]
     serializer_class = AreaSerializer
     
@@ -49,8 +107,9 @@ class AreaViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class RegimenViewSet(viewsets.ModelViewSet):
+class RegimenViewSet(SerializacionMedidaMixin, CatalogoEnMemoriaMixin, viewsets.ModelViewSet):
     queryset = Regimen.objects.all()
+    catalogo = catalogos['regimenes']
     permission_classes = [IsAuthenticated]
     serializer_class = RegimenSerializer
     
@@ -79,8 +138,9 @@ class RegimenViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CondicionLaboralViewSet(viewsets.ModelViewSet):
+class CondicionLaboralViewSet(SerializacionMedidaMixin, CatalogoEnMemoriaMixin, viewsets.ModelViewSet):
     queryset = CondicionLaboral.objects.all()
+    catalogo = catalogos['condiciones_laborales']
     permission_classes = [IsAuthenticated]
     serializer_class = CondicionLaboralSerializer
     
@@ -109,8 +169,9 @@ class CondicionLaboralViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CargoViewSet(viewsets.ModelViewSet):
+class CargoViewSet(SerializacionMedidaMixin, CatalogoEnMemoriaMixin, viewsets.ModelViewSet):
     queryset = Cargo.objects.all()
+    catalogo = catalogos['cargos']
     permission_classes = [IsAuthenticated]
     serializer_class = CargoSerializer
     
@@ -146,11 +207,13 @@ class CargoViewSet(viewsets.ModelViewSet):
 # VIEWSET: SECCION DE LEGAJO
 # ============================================
 
-class SeccionLegajoViewSet(viewsets.ModelViewSet):
+class SeccionLegajoViewSet(SerializacionMedidaMixin, CatalogoEnMemoriaMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar las secciones del legajo SIGELP.
     """
     queryset = SeccionLegajo.objects.all()
+    catalogo = catalogos['secciones']
+    parametro_activo = 'activas'
     permission_classes = [IsAuthenticated]
     serializer_class = SeccionLegajoSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -182,9 +245,7 @@ class SeccionLegajoViewSet(viewsets.ModelViewSet):
         Devuelve solo las secciones activas.
         GET /api/secciones-legajo/activas/
         """
-        secciones = SeccionLegajo.objects.filter(activo=True).order_by('orden')
-        serializer = SeccionLegajoSerializer(secciones, many=True)
-        return Response(serializer.data)
+        return Response(self._filtrar(True))
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsAdmin])
     def toggle_active(self, request, pk=None):
@@ -200,7 +261,7 @@ class SeccionLegajoViewSet(viewsets.ModelViewSet):
 # ⭐ VIEWSET: TIPO DE DOCUMENTO (ULTRA SIMPLIFICADO)
 # ============================================
 
-class TipoDocumentoViewSet(viewsets.ModelViewSet):
+class TipoDocumentoViewSet(SerializacionMedidaMixin, CatalogoEnMemoriaMixin, viewsets.ModelViewSet):
     """
     ViewSet SIMPLIFICADO para tipos de documentos generales.
     
@@ -216,6 +277,8 @@ class TipoDocumentoViewSet(viewsets.ModelViewSet):
     - DELETE /api/tipos-documento/{id}/ - Eliminar tipo (admin)
     """
     queryset = TipoDocumento.objects.all()
+    catalogo = catalogos['tipos_documento']
+    parametro_activo = 'activos'
     permission_classes = [IsAuthenticated]
     serializer_class = TipoDocumentoSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -249,9 +312,7 @@ class TipoDocumentoViewSet(viewsets.ModelViewSet):
         Devuelve solo los tipos de documentos activos.
         GET /api/tipos-documento/activos/
         """
-        tipos = TipoDocumento.objects.filter(activo=True).order_by('nombre')
-        serializer = TipoDocumentoSerializer(tipos, many=True)
-        return Response(serializer.data)
+        return Response(self._filtrar(True))
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsAdmin])
     def toggle_active(self, request, pk=None):
@@ -260,4 +321,56 @@ class TipoDocumentoViewSet(viewsets.ModelViewSet):
         tipo.activo = not tipo.activo
         tipo.save()
         serializer = self.get_serializer(tipo)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+# ============================================
+# CATÁLOGOS: CARGA INICIAL EN UNA PETICIÓN
+# ============================================
+
+# Campos que necesitan los formularios y filtros del frontend
+CAMPOS_CATALOGOS = {
+    'areas': ('id', 'nombre', 'codigo', 'activo'),
+    'regimenes': ('id', 'nombre', 'activo'),
+    'condiciones_laborales': ('id', 'nombre', 'activo'),
+    'cargos': ('id', 'nombre', 'activo'),
+    'secciones': ('id', 'nombre', 'descripcion', 'color', 'orden', 'activo'),
+    'tipos_documento': ('id', 'nombre', 'descripcion', 'activo'),
+}
+
+
+class CatalogosView(APIView):
+    """
+    Todos los catálogos de organizacion en una sola respuesta, para no
+    recorrer la paginación de cada endpoint al abrir una pantalla.
+
+    GET /api/catalogos/                  solo registros activos
+    GET /api/catalogos/?inactivos=true   incluye los inactivos (filtros, históricos)
+
+    El ETag (fuerte) sale de las versiones de los catálogos: el navegador
+    revalida con If-None-Match y recibe 304 sin cuerpo mientras nada cambie.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        inactivos = request.query_params.get('inactivos', '').lower() == 'true'
+        versiones = [f'{nombre}={catalogo.version_local()}' for nombre, catalogo in catalogos.items()]
+        versiones.append(f'inactivos={inactivos}')
+        etag = f'"{hashlib.sha1(";".join(versiones).encode()).hexdigest()}"'
+
+        respuesta = get_conditional_response(request, etag=etag)
+        if respuesta is None:
+            respuesta = Response({
+                nombre: [
+                    dato for dato in catalogo.derivado('compacto', self._compactar(CAMPOS_CATALOGOS[nombre]))
+                    if inactivos or dato['activo']
+                ]
+                for nombre, catalogo in catalogos.items()
+            })
+        respuesta['ETag'] = etag
+        respuesta['Cache-Control'] = 'private, no-cache'
+        return respuesta
+
+    @staticmethod
+    def _compactar(campos):
+        return lambda objetos: [{campo: getattr(objeto, campo) for campo in campos} for objeto in objetos]
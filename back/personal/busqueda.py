@@ -0,0 +1,42 @@
+import unicodedata
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+
+
+def normalizar_texto(texto):
+    """
+    Texto en minúsculas, sin tildes ni espacios repetidos.
+    'Núñez  Ávila' → 'nunez avila'
+    """
+    if not texto:
+        return ''
+    descompuesto = unicodedata.normalize('NFKD', str(texto))
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_tildes.lower().split())
+
+
+def buscar_personal(queryset, termino):
+    """
+    Búsqueda de Personal para el buscador de GestionarPersonal.
+
+    - Solo dígitos: DNI por prefijo (usa el índice _like que Django crea
+      para el campo único dni).
+    - Texto: nombre_normalizado por subcadena o similitud de trigramas
+      (índice GIN gin_trgm_ops), ordenado por similitud. Así "nunez"
+      encuentra "Núñez" y tolera errores de tipeo.
+    """
+    termino = (termino or '').strip()
+    if termino.isdigit():
+        return queryset.filter(dni__startswith=termino).order_by('dni')
+
+    normalizado = normalizar_texto(termino)
+    if not normalizado:
+        return queryset
+
+    return queryset.filter(
+        Q(nombre_normalizado__contains=normalizado) |
+        Q(nombre_normalizado__trigram_word_similar=normalizado)
+    ).annotate(
+        similitud=TrigramWordSimilarity(normalizado, 'nombre_normalizado')
+    ).order_by('-similitud', 'apellido_paterno', 'apellido_materno', 'nombres')
@@ -0,0 +1,112 @@
+"""
+Sincronización incremental del listado de Personal (/api/personal/changes/).
+
+El cliente guarda una réplica local y pide solo lo que cambió desde su
+último token:
+
+    GET /api/personal/changes/                 → todo, en páginas
+    GET /api/personal/changes/?since=<token>   → altas, ediciones y bajas posteriores
+
+    {"cambios": [...], "eliminados": [ids], "token": "...", "hay_mas": false, "completo": false}
+
+Los cambios se recorren por keyset sobre (fecha_actualizacion, id), que
+tiene índice propio. Las filas de los últimos PERSONAL_CAMBIOS_MARGEN
+segundos se dejan para la siguiente consulta: una transacción que todavía
+no confirmó puede tener una fecha_actualizacion anterior a la de filas ya
+visibles, y así no se pierde.
+
+El token también guarda las versiones de los catálogos (organizacion.cache):
+si se renombró un área o un cargo los nombres de la réplica quedan viejos,
+así que se responde todo de nuevo con completo=true.
+"""
+import base64
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from organizacion.cache import catalogos
+from rest_framework.exceptions import ValidationError
+
+from .models import PersonalEliminado
+
+CATALOGOS_PERSONAL = ('areas', 'regimenes', 'condiciones_laborales', 'cargos')
+
+
+class TokenVencido(Exception):
+    """El token es anterior a la retención de eliminados: hay que resincronizar"""
+
+
+def _version_catalogos():
+    versiones = ';'.join(str(catalogos[nombre].version_local()) for nombre in CATALOGOS_PERSONAL)
+    return hashlib.sha1(versiones.encode()).hexdigest()[:12]
+
+
+def generar_token(fecha, ultimo_id):
+    datos = json.dumps([fecha.isoformat(), ultimo_id, _version_catalogos()])
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip('=')
+
+
+def leer_token(token):
+    """(fecha, último id, versión de catálogos) del token, o ValidationError"""
+    try:
+        relleno = '=' * (-len(token) % 4)
+        fecha, ultimo_id, version = json.loads(base64.urlsafe_b64decode(token + relleno))
+        return datetime.fromisoformat(fecha), int(ultimo_id), version
+    except (ValueError, TypeError):
+        raise ValidationError({'since': 'Token de sincronización inválido'})
+
+
+def cambios_desde(queryset, token=None, limite=500):
+    """
+    Retorna (personal cambiado, ids eliminados, token siguiente, hay_mas, completo).
+    queryset: consulta base (con sus select_related) sobre Personal.
+    """
+    hasta = timezone.now() - timedelta(seconds=getattr(settings, 'PERSONAL_CAMBIOS_MARGEN', 2))
+    retencion = timedelta(days=getattr(settings, 'PERSONAL_CAMBIOS_RETENCION_DIAS', 30))
+
+    desde, ultimo_id, completo = None, 0, True
+    if token:
+        desde, ultimo_id, version = leer_token(token)
+        if desde < timezone.now() - retencion:
+            raise TokenVencido()
+        # Con catálogos distintos se vuelve a enviar todo
+        completo = version != _version_catalogos()
+        if completo:
+            desde, ultimo_id = None, 0
+
+    filas = queryset.filter(fecha_actualizacion__lte=hasta)
+    if desde is not None:
+        filas = filas.filter(
+            Q(fecha_actualizacion__gt=desde) | Q(fecha_actualizacion=desde, id__gt=ultimo_id)
+        )
+    filas = list(filas.order_by('fecha_actualizacion', 'id')[:limite + 1])
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+
+    if hay_mas:
+        nueva_fecha, nuevo_id = filas[-1].fecha_actualizacion, filas[-1].id
+    else:
+        # Sin más filas: el siguiente token parte del margen (aunque no haya cambios)
+        nueva_fecha, nuevo_id = hasta, 0
+        if filas and filas[-1].fecha_actualizacion == hasta:
+            nuevo_id = filas[-1].id
+
+    eliminados = []
+    if desde is not None:
+        eliminados = list(
+            PersonalEliminado.objects
+            .filter(fecha_eliminacion__gt=desde, fecha_eliminacion__lte=nueva_fecha)
+            .values_list('personal_id', flat=True)
+        )
+
+    return filas, eliminados, generar_token(nueva_fecha, nuevo_id), hay_mas, completo
+
+
+def registrar_eliminado(personal_id):
+    """Guardar la marca de borrado y descartar las más antiguas que la retención"""
+    PersonalEliminado.objects.create(personal_id=personal_id)
+    limite = timezone.now() - timedelta(days=getattr(settings, 'PERSONAL_CAMBIOS_RETENCION_DIAS', 30))
+    PersonalEliminado.objects.filter(fecha_eliminacion__lt=limite).delete()
@@ -0,0 +1,141 @@
+"""
+Cargas reanudables por bloques para documentos grandes (escaneos de legajos).
+
+    POST   /api/cargas/                     crea la sesión (tamaño total y datos del Legajo)
+    PUT    /api/cargas/<id>/bloques/<n>/    cuerpo binario del bloque n (0, 1, ...)
+    GET    /api/cargas/<id>/                bloques ya recibidos, para retomar tras un corte
+    POST   /api/cargas/<id>/completar/      une los bloques y crea el Legajo
+    DELETE /api/cargas/<id>/                cancela la carga
+
+Cada bloque se lee del cuerpo de la petición por partes y se escribe
+directo en CARGAS_DIRECTORIO/<id>/<n>.parte, así que ningún archivo queda
+completo en la memoria del worker. Reenviar un bloque lo reemplaza.
+"""
+import logging
+import os
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import SesionCarga
+from .upload_handlers import InspectorPDF
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LECTURA = 64 * 1024
+EXTENSION_BLOQUE = '.parte'
+
+
+def directorio(sesion_id):
+    return Path(settings.CARGAS_DIRECTORIO) / str(sesion_id)
+
+
+def nueva_expiracion():
+    return timezone.now() + timezone.timedelta(hours=settings.CARGAS_EXPIRACION_HORAS)
+
+
+def bloques_recibidos(sesion):
+    carpeta = directorio(sesion.id)
+    if not carpeta.is_dir():
+        return []
+    return sorted(
+        int(archivo.stem) for archivo in carpeta.iterdir()
+        if archivo.suffix == EXTENSION_BLOQUE and archivo.stem.isdigit()
+    )
+
+
+def guardar_bloque(sesion, numero, origen):
+    """
+    Escribir el bloque `numero` leyendo `origen` (objeto con read()) por partes.
+    El bloque se valida completo antes de reemplazar una versión anterior.
+    """
+    if numero >= sesion.total_bloques:
+        raise ValidationError({'numero': f'La carga tiene {sesion.total_bloques} bloques (0 a {sesion.total_bloques - 1})'})
+
+    esperado = sesion.tamano_esperado(numero)
+    carpeta = directorio(sesion.id)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    temporal = carpeta / f'{numero}{EXTENSION_BLOQUE}.tmp'
+
+    recibido = 0
+    try:
+        with open(temporal, 'wb') as destino:
+            while True:
+                parte = origen.read(TAMANO_LECTURA)
+                if not parte:
+                    break
+                if numero == 0 and recibido == 0 and not parte.startswith(b'%PDF-'[:len(parte)]):
+                    raise ValidationError({'archivo': 'El archivo no es un PDF válido'})
+                recibido += len(parte)
+                if recibido > esperado:
+                    raise ValidationError({'bloque': f'El bloque {numero} debe tener {esperado} bytes'})
+                destino.write(parte)
+        if recibido != esperado:
+            raise ValidationError({'bloque': f'El bloque {numero} debe tener {esperado} bytes (se recibieron {recibido})'})
+        os.replace(temporal, carpeta / f'{numero}{EXTENSION_BLOQUE}')
+    finally:
+        if temporal.exists():
+            temporal.unlink()
+
+
+def unir_bloques(sesion):
+    """
+    Concatenar los bloques en un solo archivo dentro de la carpeta de la
+    sesión, validando firma y hash en la misma pasada.
+    Retorna (ruta, inspector).
+    """
+    recibidos = set(bloques_recibidos(sesion))
+    faltantes = [n for n in range(sesion.total_bloques) if n not in recibidos]
+    if faltantes:
+        raise ValidationError({'bloques_faltantes': faltantes[:100]})
+
+    inspector = InspectorPDF(tamano_maximo=sesion.tamano)
+    carpeta = directorio(sesion.id)
+    ruta = carpeta / 'completo.pdf'
+    with open(ruta, 'wb') as destino:
+        for numero in range(sesion.total_bloques):
+            with open(carpeta / f'{numero}{EXTENSION_BLOQUE}', 'rb') as bloque:
+                for parte in iter(lambda: bloque.read(TAMANO_LECTURA), b''):
+                    error = inspector.agregar(parte)
+                    if error:
+                        raise ValidationError({'archivo': error})
+                    destino.write(parte)
+    error = inspector.terminar()
+    if error:
+        raise ValidationError({'archivo': error})
+    return ruta, inspector
+
+
+def eliminar_sesion(sesion):
+    """Borrar la sesión; la carpeta de bloques, recién al confirmar"""
+    carpeta = directorio(sesion.id)
+    sesion.delete()
+    transaction.on_commit(lambda: shutil.rmtree(carpeta, ignore_errors=True))
+
+
+def limpiar_expiradas():
+    """
+    Borrar las sesiones vencidas y las carpetas sin sesión (por ejemplo, de
+    una sesión eliminada mientras se escribía un bloque).
+    Retorna (sesiones, carpetas) borradas.
+    """
+    ahora = timezone.now()
+    vencidas = list(SesionCarga.objects.filter(fecha_expiracion__lte=ahora).values_list('id', flat=True))
+    for sesion_id in vencidas:
+        shutil.rmtree(directorio(sesion_id), ignore_errors=True)
+    SesionCarga.objects.filter(id__in=vencidas).delete()
+
+    huerfanas = 0
+    base = Path(settings.CARGAS_DIRECTORIO)
+    if base.is_dir():
+        vigentes = {str(i) for i in SesionCarga.objects.values_list('id', flat=True)}
+        limite = (ahora - timezone.timedelta(hours=settings.CARGAS_EXPIRACION_HORAS)).timestamp()
+        for carpeta in base.iterdir():
+            if carpeta.is_dir() and carpeta.name not in vigentes and carpeta.stat().st_mtime < limite:
+                shutil.rmtree(carpeta, ignore_errors=True)
+                huerfanas += 1
+    return len(vencidas), huerfanas
@@ -0,0 +1,179 @@
+"""
+Entrega de archivos de MEDIA_ROOT con soporte HTTP completo:
+
+- ETag / Last-Modified y respuesta 304 en descargas repetidas.
+- Range (un solo rango) con 206 Partial Content, para que los visores
+  de PDF pidan páginas a medida que las muestran.
+- Bajo ASGI el archivo (completo o el rango) sale por bloques sin
+  cargarlo en memoria (por_bloques).
+- Modo offload (DESCARGAS_OFFLOAD): después de validar permisos se
+  responde solo con X-Accel-Redirect (nginx) o X-Sendfile (apache) y el
+  proxy envía los bytes sin ocupar un worker de Python.
+
+Bajo ASGI (uvicorn, legajos.asgi) Django consume los iteradores síncronos
+de StreamingHttpResponse con list() antes de enviar el primer byte; por
+eso las respuestas por bloques pasan por por_bloques(), que ahí entrega
+un iterador asíncrono que lee cada bloque en un hilo.
+"""
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+TAMANO_BLOQUE = 256 * 1024
+_RANGO = re.compile(r'^bytes=(\d*)-(\d*)$')
+_FIN = object()
+
+
+def por_bloques(request, bloques):
+    """
+    Contenido para StreamingHttpResponse a partir de un iterador síncrono
+    de bytes: el mismo iterador bajo WSGI y uno asíncrono bajo ASGI, para
+    que la memoria no dependa del tamaño de la respuesta.
+
+    `bloques` no debe usar la base de datos: cada bloque se pide en un
+    hilo cualquiera del pool.
+    """
+    if _es_asgi(request):
+        return _bloques_asincronos(bloques)
+    return bloques
+
+
+def _es_asgi(request):
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def _bloques_asincronos(bloques):
+    siguiente = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            bloque = await siguiente(bloques, _FIN)
+            if bloque is _FIN:
+                return
+            yield bloque
+    finally:
+        # Cliente desconectado: cerrar el generador libera sus archivos abiertos
+        cerrar = getattr(bloques, 'close', None)
+        if cerrar is not None:
+            await sync_to_async(cerrar, thread_sensitive=False)()
+
+
+def servir_archivo(request, ruta, nombre, content_type='application/pdf', as_attachment=False, etag=None, inmutable=False):
+    """
+    Responder con el archivo en `ruta` (absoluta, dentro de MEDIA_ROOT).
+
+    etag: valor opcional (sin comillas) cuando ya se conoce un hash del
+    contenido; si no, se deriva del tamaño y la fecha de modificación.
+
+    inmutable: el contenido de esta URL nunca cambia (por ejemplo, lleva
+    una versión), así que el navegador puede guardarlo sin revalidar.
+
+    Lanza FileNotFoundError si el archivo no existe.
+    """
+    ruta = Path(ruta)
+    estado = ruta.stat()
+    tamano = estado.st_size
+    etag = f'"{etag}"' if etag else f'"{estado.st_size:x}-{estado.st_mtime_ns:x}"'
+    ultima_modificacion = int(estado.st_mtime)
+    cache = 'private, max-age=31536000, immutable' if inmutable else 'private, no-cache'
+
+    no_modificado = get_conditional_response(request, etag=etag, last_modified=ultima_modificacion)
+    if no_modificado is not None:
+        return _cabeceras(no_modificado, etag, ultima_modificacion, cache)
+
+    modo = getattr(settings, 'DESCARGAS_OFFLOAD', None)
+    if modo:
+        response = HttpResponse(content_type=content_type)
+        if modo == 'x-accel':
+            relativa = ruta.relative_to(Path(settings.MEDIA_ROOT)).as_posix()
+            response['X-Accel-Redirect'] = getattr(settings, 'DESCARGAS_ACCEL_PREFIJO', '/protegido/') + quote(relativa)
+        else:
+            response['X-Sendfile'] = str(ruta)
+        response['Content-Disposition'] = content_disposition_header(as_attachment, nombre)
+        return _cabeceras(response, etag, ultima_modificacion, cache)
+
+    rango = _rango_pedido(request, tamano, etag, ultima_modificacion)
+    if rango == 'invalido':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{tamano}'
+        return _cabeceras(response, etag, ultima_modificacion, cache)
+
+    if rango is None and not _es_asgi(request):
+        # Archivo completo: FileResponse usa wsgi.file_wrapper (sendfile) si el servidor lo ofrece
+        response = FileResponse(open(ruta, 'rb'), content_type=content_type, as_attachment=as_attachment, filename=nombre)
+        return _cabeceras(response, etag, ultima_modificacion, cache)
+
+    # Rango, o el archivo completo bajo ASGI: por bloques (ver por_bloques)
+    inicio, fin = rango or (0, tamano - 1)
+    response = StreamingHttpResponse(
+        por_bloques(request, _leer_rango(ruta, inicio, fin)), status=206 if rango else 200, content_type=content_type
+    )
+    response['Content-Length'] = str(fin - inicio + 1)
+    if rango:
+        response['Content-Range'] = f'bytes {inicio}-{fin}/{tamano}'
+    response['Content-Disposition'] = content_disposition_header(as_attachment, nombre)
+    return _cabeceras(response, etag, ultima_modificacion, cache)
+
+
+def _cabeceras(response, etag, ultima_modificacion, cache):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(ultima_modificacion)
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = cache
+    return response
+
+
+def _rango_pedido(request, tamano, etag, ultima_modificacion):
+    """
+    (inicio, fin) inclusivos del header Range, None para enviar el archivo
+    completo o 'invalido' si el rango no se puede satisfacer (416).
+    Varios rangos separados por coma se responden con el archivo completo,
+    igual que un rango mal formado como bytes=5-3 (RFC 9110: se ignora).
+    """
+    cabecera = request.META.get('HTTP_RANGE', '').strip()
+    if not cabecera or request.method != 'GET':
+        return None
+
+    si_rango = request.META.get('HTTP_IF_RANGE', '').strip()
+    if si_rango and si_rango != etag and parse_http_date_safe(si_rango) != ultima_modificacion:
+        return None
+
+    coincidencia = _RANGO.match(cabecera)
+    if not coincidencia:
+        return None
+    desde, hasta = coincidencia.groups()
+    if not desde and not hasta:
+        return None
+
+    if not desde:
+        # bytes=-N: los últimos N bytes
+        sufijo = int(hasta)
+        if sufijo == 0:
+            return 'invalido'
+        return max(tamano - sufijo, 0), tamano - 1
+
+    inicio = int(desde)
+    if hasta and int(hasta) < inicio:
+        return None
+    if inicio >= tamano:
+        return 'invalido'
+    fin = min(int(hasta), tamano - 1) if hasta else tamano - 1
+    return inicio, fin
+
+
+def _leer_rango(ruta, inicio, fin):
+    with open(ruta, 'rb') as archivo:
+        archivo.seek(inicio)
+        restante = fin - inicio + 1
+        while restante > 0:
+            bloque = archivo.read(min(TAMANO_BLOQUE, restante))
+            if not bloque:
+                break
+            restante -= len(bloque)
+            yield bloque
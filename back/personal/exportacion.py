@@ -0,0 +1,131 @@
+"""
+Exportación del legajo completo de un personal como ZIP en streaming.
+
+El ZIP se arma mientras se envía: cada archivo se lee en bloques que
+salen hacia el cliente apenas se escriben en el ZIP (sin comprimir, los
+PDF ya vienen comprimidos). La memoria usada no depende del tamaño del
+legajo y no se escribe ningún temporal. Bajo ASGI la vista lo entrega con
+descargas.por_bloques(), así que zip_streaming() no hace consultas.
+"""
+import logging
+import os
+import zipfile
+from datetime import datetime
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import Escalafon
+from .pdf import documentos_ordenados
+
+logger = logging.getLogger(__name__)
+
+TAMANO_BLOQUE = 64 * 1024
+
+
+def entradas_legajo(personal):
+    """
+    (ruta dentro del ZIP, FieldFile) de todos los archivos del personal:
+
+        00_Datos_personales/<documento del personal>
+        01_<Sección>/<fecha>_<tipo>_<id>.pdf   (una carpeta por SeccionLegajo)
+        Escalafon/<fecha inicio>_<resolución>.pdf
+    """
+    if personal.documento:
+        yield f'00_Datos_personales/{_nombre(os.path.basename(personal.documento.name))}', personal.documento
+
+    for documento in documentos_ordenados(personal).select_related('tipo_documento'):
+        seccion = documento.seccion
+        carpeta = _nombre(f'{seccion.orden:02d}_{seccion.nombre}')
+        fecha = timezone.localtime(documento.fecha_creacion).strftime('%Y-%m-%d')
+        yield f'{carpeta}/{fecha}_{_nombre(documento.tipo_documento.nombre)}_{documento.id}.pdf', documento.archivo
+
+    escalafones = (
+        Escalafon.objects
+        .filter(personal=personal)
+        .exclude(documento_resolucion='')
+        .exclude(documento_resolucion__isnull=True)
+        .order_by('fecha_inicio', 'id')
+    )
+    for escalafon in escalafones:
+        referencia = _nombre(escalafon.resolucion or str(escalafon.id))
+        yield f'Escalafon/{escalafon.fecha_inicio:%Y-%m-%d}_{referencia}.pdf', escalafon.documento_resolucion
+
+
+def _nombre(texto):
+    try:
+        return get_valid_filename(texto)
+    except SuspiciousFileOperation:
+        return 'archivo'
+
+
+class _Salida:
+    """Destino de zipfile que solo acumula lo escrito hasta que se retira"""
+
+    def __init__(self):
+        self.partes = []
+        self.posicion = 0
+
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        self.posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self.posicion
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        datos = b''.join(self.partes)
+        self.partes.clear()
+        return datos
+
+
+def zip_streaming(entradas):
+    """
+    Generador de bytes del ZIP. Los archivos que falten en disco se
+    omiten y se listan en FALTANTES.txt al final del ZIP.
+    """
+    salida = _Salida()
+    faltantes = []
+    usados = set()
+
+    with zipfile.ZipFile(salida, mode='w', compression=zipfile.ZIP_STORED, allowZip64=True) as archivo_zip:
+        for nombre, fieldfile in entradas:
+            nombre = _sin_repetir(nombre, usados)
+            try:
+                ruta = fieldfile.path
+                estado = os.stat(ruta)
+                origen = open(ruta, 'rb')
+            except (FileNotFoundError, ValueError):
+                logger.warning('Archivo no encontrado al exportar legajo: %s', fieldfile.name)
+                faltantes.append(f'{nombre}\t{fieldfile.name}')
+                continue
+
+            info = zipfile.ZipInfo(nombre, date_time=datetime.fromtimestamp(estado.st_mtime).timetuple()[:6])
+            info.file_size = estado.st_size
+            info.compress_type = zipfile.ZIP_STORED
+            with origen, archivo_zip.open(info, mode='w') as destino:
+                for bloque in iter(lambda: origen.read(TAMANO_BLOQUE), b''):
+                    destino.write(bloque)
+                    yield salida.retirar()
+            # Descriptor de datos del archivo (tamaño y CRC, al cerrar la entrada)
+            yield salida.retirar()
+
+        if faltantes:
+            archivo_zip.writestr('FALTANTES.txt', 'Archivos registrados que no se encontraron en el servidor:\n' + '\n'.join(faltantes))
+    # Directorio central (se escribe al cerrar el ZIP)
+    yield salida.retirar()
+
+
+def _sin_repetir(nombre, usados):
+    base, extension = os.path.splitext(nombre)
+    candidato, contador = nombre, 1
+    while candidato in usados:
+        contador += 1
+        candidato = f'{base}_{contador}{extension}'
+    usados.add(candidato)
+    return candidato
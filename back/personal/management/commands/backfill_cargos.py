@@ -0,0 +1,72 @@
+# personal/management/commands/backfill_cargos.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from personal.models import Personal, Escalafon
+from personal.utils import MapaCargos
+
+
+class Command(BaseCommand):
+    help = (
+        'Asocia Personal.cargo y Escalafon.cargo_catalogo a partir de los valores '
+        'legados (ID como texto o nombre del cargo). Procesa por lotes y se puede '
+        'reanudar: solo toca filas sin cargo asociado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Filas por lote (default: 1000)')
+        parser.add_argument('--desde-id', type=int, default=0, help='Reanudar desde este ID (exclusivo)')
+        parser.add_argument(
+            '--modelo', choices=['personal', 'escalafon', 'todos'], default='todos',
+            help='Tabla a procesar (default: todos)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='No guardar cambios')
+
+    def handle(self, *args, **options):
+        mapa = MapaCargos.cargar()
+        self.stdout.write(self.style.SUCCESS(f'Catálogo cargado: {len(mapa.por_id)} cargos'))
+
+        if options['modelo'] in ('personal', 'todos'):
+            self.procesar(Personal, 'cargo_actual', 'cargo', mapa, options)
+        if options['modelo'] in ('escalafon', 'todos'):
+            self.procesar(Escalafon, 'cargo', 'cargo_catalogo', mapa, options)
+
+    def procesar(self, modelo, campo_texto, campo_cargo, mapa, options):
+        nombre = modelo._meta.verbose_name_plural
+        self.stdout.write(f'\nProcesando {nombre}...')
+
+        pendientes = (
+            modelo.objects
+            .filter(**{f'{campo_cargo}__isnull': True, f'{campo_texto}__isnull': False})
+            .exclude(**{campo_texto: ''})
+            .order_by('id')
+        )
+
+        ultimo_id = options['desde_id']
+        asociados = sin_resolver = 0
+
+        while True:
+            lote = list(pendientes.filter(id__gt=ultimo_id).only('id', campo_texto)[:options['lote']])
+            if not lote:
+                break
+
+            cambios = []
+            for fila in lote:
+                cargo = mapa.resolver(getattr(fila, campo_texto))
+                if cargo:
+                    setattr(fila, campo_cargo, cargo)
+                    cambios.append(fila)
+                else:
+                    sin_resolver += 1
+
+            if cambios and not options['dry_run']:
+                with transaction.atomic():
+                    modelo.objects.bulk_update(cambios, [campo_cargo])
+
+            asociados += len(cambios)
+            ultimo_id = lote[-1].id
+            self.stdout.write(f'  ✓ Lote hasta ID {ultimo_id}: {len(cambios)}/{len(lote)} asociados')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{nombre}: {asociados} asociados, {sin_resolver} sin cargo en el catálogo'
+        ))
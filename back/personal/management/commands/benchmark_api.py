@@ -0,0 +1,194 @@
+# personal/management/commands/benchmark_api.py
+
+import json
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from eventos.models import RegistroEvento
+from legajos.urls import router
+from personal.models import Personal, Legajo
+from rest_framework_simplejwt.tokens import AccessToken
+from usuarios.models import Usuario
+
+
+class Command(BaseCommand):
+    help = (
+        'Recorre todos los endpoints GET del router (listado, detalle y acciones) '
+        'y guarda un reporte JSON con percentiles de latencia y número de consultas. '
+        'Usar con los datos de generar_datos_sinteticos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=20, help='Mediciones por endpoint (default: 20)')
+        parser.add_argument('--calentamiento', type=int, default=2, help='Peticiones previas sin medir (default: 2)')
+        parser.add_argument('--usuario', help='Username con el que se autentica (default: primer ADMIN)')
+        parser.add_argument('--solo', help='Medir solo las URLs que contengan este texto')
+        parser.add_argument('--salida', help='Ruta del reporte JSON (default: benchmark_api_<fecha>.json)')
+        parser.add_argument('--comparar', help='Reporte JSON anterior para mostrar diferencias')
+
+    def handle(self, *args, **options):
+        usuario = self.obtener_usuario(options['usuario'])
+        cliente = Client(
+            raise_request_exception=False,  # un error cuenta como status 500, no detiene la corrida
+            HTTP_HOST='localhost',
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(usuario)}',
+        )
+
+        endpoints = self.endpoints()
+        if options['solo']:
+            endpoints = [(nombre, url) for nombre, url in endpoints if options['solo'] in url]
+
+        resultados = []
+        for nombre, url in endpoints:
+            resultado = self.medir(cliente, nombre, url, options['repeticiones'], options['calentamiento'])
+            resultados.append(resultado)
+            self.stdout.write(
+                f"{resultado['status']} {url:<60} p50={resultado['p50_ms']:>8.1f} "
+                f"p95={resultado['p95_ms']:>8.1f} p99={resultado['p99_ms']:>8.1f} ms  "
+                f"consultas={resultado['consultas']}"
+            )
+
+        reporte = {
+            'fecha': timezone.now().isoformat(),
+            'commit': self.commit_actual(),
+            'repeticiones': options['repeticiones'],
+            'volumen': {
+                'personal': Personal.objects.count(),
+                'legajos': Legajo.objects.count(),
+                'registro_eventos': RegistroEvento.objects.count(),
+            },
+            'endpoints': resultados,
+        }
+
+        salida = Path(options['salida'] or f"benchmark_api_{timezone.localtime():%Y%m%d_%H%M%S}.json")
+        salida.write_text(json.dumps(reporte, indent=2, ensure_ascii=False), encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Reporte guardado en {salida}'))
+
+        if options['comparar']:
+            self.comparar(reporte, options['comparar'])
+
+    def obtener_usuario(self, username):
+        usuarios = Usuario.objects.filter(is_active=True)
+        usuario = usuarios.filter(username=username).first() if username else usuarios.filter(rol='ADMIN').first()
+        if usuario is None:
+            raise CommandError('No hay un usuario activo para autenticar las peticiones')
+        return usuario
+
+    def endpoints(self):
+        """Listado, detalle y acciones GET de cada ViewSet registrado en el router"""
+        # Para las acciones por personal conviene uno que tenga documentos
+        personal_id = Legajo.objects.order_by('id').values_list('personal_id', flat=True).first()
+
+        endpoints = []
+        for prefijo, viewset, basename in router.registry:
+            base = f'/api/{prefijo}/'
+            endpoints.append((f'{basename}-list', base))
+
+            modelo = viewset.queryset.model if viewset.queryset is not None else None
+            pk = personal_id if modelo is Personal and personal_id else None
+            if pk is None and modelo is not None:
+                pk = modelo._default_manager.order_by('pk').values_list('pk', flat=True).first()
+            if pk is not None:
+                endpoints.append((f'{basename}-detail', f'{base}{pk}/'))
+
+            for accion in viewset.get_extra_actions():
+                if 'get' not in accion.mapping:
+                    continue
+                if accion.detail:
+                    if pk is not None:
+                        endpoints.append((f'{basename}-{accion.url_name}', f'{base}{pk}/{accion.url_path}/'))
+                else:
+                    endpoints.append((f'{basename}-{accion.url_name}', f'{base}{accion.url_path}/'))
+
+        # Variantes con parámetros que vale la pena seguir
+        endpoints += [
+            ('personal-search-nombre', '/api/personal/?search=quispe'),
+            ('personal-search-dni', '/api/personal/?search=9000'),
+            ('legajo-cursor', '/api/legajos/?paginacion=cursor'),
+            ('registro-evento-cursor', '/api/registro-eventos/?paginacion=cursor'),
+            ('dashboard', '/api/dashboard/'),
+        ]
+        if personal_id:
+            endpoints += [
+                ('legajo-por-seccion-personal', f'/api/legajos/por_seccion/?personal={personal_id}'),
+                ('legajo-list-personal', f'/api/legajos/?personal={personal_id}'),
+            ]
+        return endpoints
+
+    def medir(self, cliente, nombre, url, repeticiones, calentamiento):
+        for _ in range(calentamiento):
+            self.consumir(cliente.get(url))
+
+        # Una pasada aparte para contar consultas sin afectar los tiempos
+        reset_queries()
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = cliente.get(url)
+            tamano = self.consumir(respuesta)
+
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            self.consumir(cliente.get(url))
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        tiempos.sort()
+        if len(tiempos) > 1:
+            cortes = statistics.quantiles(tiempos, n=100, method='inclusive')
+            p50, p95, p99 = cortes[49], cortes[94], cortes[98]
+        else:
+            p50 = p95 = p99 = tiempos[0] if tiempos else 0.0
+
+        return {
+            'nombre': nombre,
+            'url': url,
+            'status': respuesta.status_code,
+            'bytes': tamano,
+            'consultas': len(consultas),
+            'tiempo_sql_ms': round(sum(float(q['time']) for q in consultas.captured_queries) * 1000, 2),
+            'p50_ms': round(p50, 2),
+            'p95_ms': round(p95, 2),
+            'p99_ms': round(p99, 2),
+            'max_ms': round(tiempos[-1], 2) if tiempos else 0.0,
+        }
+
+    @staticmethod
+    def consumir(respuesta):
+        """Leer todo el cuerpo (también en respuestas de archivo) y retornar su tamaño"""
+        if respuesta.streaming:
+            tamano = sum(len(parte) for parte in respuesta.streaming_content)
+            respuesta.close()
+            return tamano
+        return len(respuesta.content)
+
+    @staticmethod
+    def commit_actual():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def comparar(self, reporte, ruta_anterior):
+        anterior = json.loads(Path(ruta_anterior).read_text(encoding='utf-8'))
+        previos = {e['url']: e for e in anterior['endpoints']}
+
+        self.stdout.write(f"\nComparación con {ruta_anterior} (commit {anterior.get('commit')}):")
+        for actual in reporte['endpoints']:
+            previo = previos.get(actual['url'])
+            if not previo:
+                continue
+            delta = actual['p50_ms'] - previo['p50_ms']
+            porcentaje = (delta / previo['p50_ms'] * 100) if previo['p50_ms'] else 0.0
+            self.stdout.write(
+                f"{actual['url']:<60} p50 {previo['p50_ms']:>8.1f} → {actual['p50_ms']:>8.1f} ms "
+                f"({porcentaje:+.0f}%)  consultas {previo['consultas']} → {actual['consultas']}"
+            )
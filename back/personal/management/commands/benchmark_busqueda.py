@@ -0,0 +1,60 @@
+# personal/management/commands/benchmark_busqueda.py
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from personal.busqueda import buscar_personal, normalizar_texto
+from personal.models import Personal
+from personal.sinteticos import APELLIDOS, PREFIJO_DNI, crear_personal, personal_sintetico
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide la búsqueda de Personal (trigramas + prefijo de DNI) sobre filas '
+        'sintéticas. Crea las filas que falten y reporta p50/p95 en ms.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=100000, help='Filas sintéticas (default: 100000)')
+        parser.add_argument('--consultas', type=int, default=300, help='Búsquedas a medir (default: 300)')
+        parser.add_argument('--limpiar', action='store_true', help='Eliminar las filas sintéticas al terminar')
+
+    def handle(self, *args, **options):
+        sinteticos = personal_sintetico()
+        existentes = sinteticos.count()
+        if existentes < options['filas']:
+            self.stdout.write(f"Creando {options['filas'] - existentes} filas sintéticas...")
+            crear_personal(existentes, options['filas'])
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE personal')
+
+        rng = random.Random(42)
+        terminos = []
+        for _ in range(options['consultas']):
+            tipo = rng.random()
+            if tipo < 0.4:
+                terminos.append(normalizar_texto(rng.choice(APELLIDOS)))  # sin tildes
+            elif tipo < 0.7:
+                terminos.append(rng.choice(APELLIDOS)[:4])  # tecleando
+            else:
+                terminos.append(PREFIJO_DNI + str(rng.randint(0, 9999)))
+
+        tiempos = []
+        for termino in terminos:
+            inicio = time.perf_counter()
+            list(buscar_personal(Personal.objects.all(), termino).values_list('id', flat=True)[:20])
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        percentiles = statistics.quantiles(tiempos, n=100)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(tiempos)} búsquedas sobre {sinteticos.count()} filas sintéticas: '
+            f'p50={percentiles[49]:.1f} ms  p95={percentiles[94]:.1f} ms  max={max(tiempos):.1f} ms'
+        ))
+
+        if options['limpiar']:
+            eliminados, _ = sinteticos.delete()
+            self.stdout.write(f'Filas sintéticas eliminadas: {eliminados}')
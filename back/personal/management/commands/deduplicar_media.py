@@ -0,0 +1,138 @@
+# personal/management/commands/deduplicar_media.py
+
+import hashlib
+import os
+import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+from personal.models import ArchivoBlob, Escalafon, Legajo, Personal
+from personal.storage import CARPETA_BLOBS, AlmacenamientoDeduplicado, ruta_blob
+
+TAMANO_BLOQUE = 1024 * 1024
+
+CAMPOS = [
+    (Legajo, 'archivo'),
+    (Personal, 'documento'),
+    (Escalafon, 'documento_resolucion'),
+]
+
+
+def calcular_hash(ruta):
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        'Migra los archivos de media/ (legajos/, documentos_personal/, resoluciones/...) '
+        'al almacenamiento deduplicado: calcula el SHA-256 de cada archivo en paralelo, '
+        'guarda cada contenido una sola vez en blobs/ y actualiza las filas que lo usan. '
+        'Se puede reanudar: solo procesa archivos que aún no están en blobs/.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=os.cpu_count() or 4, help='Archivos hasheados en paralelo')
+        parser.add_argument('--dry-run', action='store_true', help='Solo reportar cuánto se ahorraría')
+        parser.add_argument('--conservar-originales', action='store_true', help='No borrar los archivos migrados')
+
+    def handle(self, *args, **options):
+        self.almacenamiento = AlmacenamientoDeduplicado()
+
+        # 1. Archivos anteriores referenciados y cuántas filas apuntan a cada uno
+        referencias = defaultdict(int)
+        for modelo, campo in CAMPOS:
+            filas = (
+                modelo.objects
+                .exclude(**{f'{campo}__startswith': f'{CARPETA_BLOBS}/'})
+                .exclude(**{campo: ''})
+                .exclude(**{f'{campo}__isnull': True})
+                .values(campo)
+                .annotate(filas=Count('id'))
+            )
+            for fila in filas:
+                referencias[fila[campo]] += fila['filas']
+        self.stdout.write(f'Archivos por migrar: {len(referencias)}')
+        if not referencias:
+            return
+
+        # 2. SHA-256 en paralelo (hashlib libera el GIL con bloques grandes)
+        nombres = list(referencias)
+        por_hash = defaultdict(list)
+        faltantes = []
+        with ThreadPoolExecutor(max_workers=options['hilos']) as ejecutor:
+            rutas = [self.almacenamiento.path(nombre) for nombre in nombres]
+            for nombre, resultado in zip(nombres, ejecutor.map(self._hash_seguro, rutas)):
+                if resultado is None:
+                    faltantes.append(nombre)
+                else:
+                    por_hash[resultado].append(nombre)
+
+        tamano_total = sum(os.path.getsize(self.almacenamiento.path(n)) for n in nombres if n not in faltantes)
+        tamano_unico = sum(os.path.getsize(self.almacenamiento.path(grupo[0])) for grupo in por_hash.values())
+        self.stdout.write(
+            f'  {len(nombres) - len(faltantes)} archivos, {len(por_hash)} contenidos distintos, '
+            f'{(tamano_total - tamano_unico) / 1024 / 1024:.1f} MB duplicados'
+        )
+        if faltantes:
+            self.stdout.write(self.style.WARNING(f'  {len(faltantes)} archivos no encontrados (se dejan igual)'))
+
+        if options['dry_run']:
+            return
+
+        # 3. Un blob por contenido y actualización de las filas
+        migrados = 0
+        for sha, grupo in por_hash.items():
+            ruta = self._migrar(sha, grupo, referencias)
+            if not options['conservar_originales']:
+                for nombre in grupo:
+                    if nombre != ruta:
+                        self.almacenamiento.delete(nombre)
+            migrados += 1
+            if migrados % 1000 == 0:
+                self.stdout.write(f'  ✓ {migrados}/{len(por_hash)}')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ {migrados} blobs creados o reutilizados'))
+
+    @staticmethod
+    def _hash_seguro(ruta):
+        try:
+            return calcular_hash(ruta)
+        except FileNotFoundError:
+            return None
+
+    def _migrar(self, sha, grupo, referencias):
+        origen = self.almacenamiento.path(grupo[0])
+        with transaction.atomic():
+            blob, _ = ArchivoBlob.objects.select_for_update().get_or_create(
+                hash=sha,
+                defaults={
+                    'ruta': ruta_blob(sha, os.path.splitext(grupo[0])[1].lower()),
+                    'tamano': os.path.getsize(origen),
+                }
+            )
+            destino = self.almacenamiento.path(blob.ruta)
+            if not os.path.exists(destino):
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                try:
+                    os.link(origen, destino)
+                except OSError:
+                    shutil.copy2(origen, destino)
+
+            ArchivoBlob.objects.filter(pk=blob.pk).update(
+                referencias=F('referencias') + sum(referencias[nombre] for nombre in grupo)
+            )
+            # El nombre de descarga salía del archivo: se guarda antes de pasar a <sha256>.pdf
+            for nombre in grupo:
+                Legajo.objects.filter(archivo=nombre, nombre_original='').update(
+                    nombre_original=os.path.basename(nombre)
+                )
+            for modelo, campo in CAMPOS:
+                modelo.objects.filter(**{f'{campo}__in': grupo}).update(**{campo: blob.ruta})
+        return blob.ruta
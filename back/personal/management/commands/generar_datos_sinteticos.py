@@ -0,0 +1,168 @@
+# personal/management/commands/generar_datos_sinteticos.py
+
+import random
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from eventos.models import Evento, RegistroEvento
+from organizacion.models import Area, Regimen, CondicionLaboral, Cargo, SeccionLegajo, TipoDocumento
+from personal.models import Escalafon, Legajo
+from personal.sinteticos import PREFIJO_DNI, crear_personal, pdf_minimo, personal_sintetico
+from usuarios.models import Usuario
+
+CARPETA_PDF = 'sinteticos'
+VARIANTES_PDF = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera datos sintéticos a escala de producción (Personal, Escalafón, Legajo '
+        'y RegistroEvento) para pruebas de carga. Requiere los catálogos cargados '
+        '(crear_datos_organizacion, crear_cargos, crear_eventos, cargar_tipos_documento). '
+        'Es acumulativo: solo crea lo que falta para llegar a cada volumen.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--personal', type=int, default=200000, help='Personal sintético total (default: 200000)')
+        parser.add_argument('--legajos', type=int, default=2000000, help='Documentos de legajo a agregar (default: 2000000)')
+        parser.add_argument('--eventos', type=int, default=5000000, help='Registros de eventos a agregar (default: 5000000)')
+        parser.add_argument('--escalafones', type=int, default=3, help='Máximo de escalafones por personal (default: 3)')
+        parser.add_argument('--lote', type=int, default=10000, help='Filas por bulk_create (default: 10000)')
+        parser.add_argument('--dias', type=int, default=1825, help='Antigüedad máxima de las fechas (default: 1825)')
+        parser.add_argument('--semilla', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['semilla'])
+        self.lote = options['lote']
+        self.dias = options['dias']
+
+        catalogos = {
+            'area': list(Area.objects.values_list('id', flat=True)),
+            'regimen': list(Regimen.objects.values_list('id', flat=True)),
+            'condicion': list(CondicionLaboral.objects.values_list('id', flat=True)),
+            'cargo': list(Cargo.objects.values_list('id', flat=True)),
+            'seccion': list(SeccionLegajo.objects.values_list('id', flat=True)),
+            'tipo': list(TipoDocumento.objects.values_list('id', flat=True)),
+            'evento': list(Evento.objects.values_list('id', flat=True)),
+            'usuario': list(Usuario.objects.values_list('id', flat=True)),
+        }
+        faltantes = [nombre for nombre, ids in catalogos.items() if not ids]
+        if faltantes:
+            raise CommandError(f'Faltan datos base: {", ".join(faltantes)}. Cargue los catálogos y cree un usuario.')
+
+        self.archivos = self.crear_pdfs()
+
+        existentes = personal_sintetico().count()
+        if existentes < options['personal']:
+            self.stdout.write(f"Creando {options['personal'] - existentes} personal...")
+            crear_personal(existentes, options['personal'], catalogos, lote=self.lote, documento=self.archivos[0])
+        personal_ids = list(personal_sintetico().values_list('id', flat=True))
+        self.stdout.write(self.style.SUCCESS(f'✓ Personal sintético: {len(personal_ids)}'))
+
+        if options['escalafones'] and not Escalafon.objects.filter(personal__dni__startswith=PREFIJO_DNI).exists():
+            self.crear_escalafones(personal_ids, catalogos, options['escalafones'])
+        if options['legajos']:
+            self.crear_legajos(personal_ids, catalogos, options['legajos'])
+        if options['eventos']:
+            self.crear_eventos(personal_ids, catalogos, options['eventos'])
+
+        self.stdout.write(self.style.SUCCESS('\n✓ Datos sintéticos generados'))
+
+    def crear_pdfs(self):
+        """Unos pocos PDFs pequeños compartidos por todos los registros"""
+        carpeta = Path(settings.MEDIA_ROOT) / CARPETA_PDF
+        carpeta.mkdir(parents=True, exist_ok=True)
+        archivos = []
+        for i in range(VARIANTES_PDF):
+            ruta = carpeta / f'documento_{i:02d}.pdf'
+            if not ruta.exists():
+                ruta.write_bytes(pdf_minimo(f'Documento sintético {i}'))
+            archivos.append(f'{CARPETA_PDF}/{ruta.name}')
+        return archivos
+
+    def fecha_al_azar(self):
+        return timezone.now() - timedelta(seconds=self.rng.randint(0, self.dias * 86400))
+
+    def crear_escalafones(self, personal_ids, catalogos, maximo):
+        self.stdout.write('Creando escalafones...')
+        rng = self.rng
+        filas = []
+        total = 0
+        for personal_id in personal_ids:
+            inicio = timezone.localdate() - timedelta(days=rng.randint(365, self.dias + 365))
+            cantidad = rng.randint(1, maximo)
+            for n in range(cantidad):
+                fin = inicio + timedelta(days=rng.randint(90, 720))
+                cargo_id = rng.choice(catalogos['cargo'])
+                filas.append(Escalafon(
+                    personal_id=personal_id,
+                    area_id=rng.choice(catalogos['area']),
+                    regimen_id=rng.choice(catalogos['regimen']),
+                    condicion_laboral_id=rng.choice(catalogos['condicion']),
+                    cargo=str(cargo_id),
+                    cargo_catalogo_id=cargo_id,
+                    fecha_inicio=inicio,
+                    fecha_fin=fin if n < cantidad - 1 else None,  # el último es el vigente
+                    resolucion=f'RES-{rng.randint(1, 9999):04d}-{inicio.year}',
+                    documento_resolucion=rng.choice(self.archivos),
+                ))
+                inicio = fin
+            if len(filas) >= self.lote:
+                Escalafon.objects.bulk_create(filas)
+                total += len(filas)
+                filas = []
+        if filas:
+            Escalafon.objects.bulk_create(filas)
+            total += len(filas)
+        self.stdout.write(self.style.SUCCESS(f'✓ Escalafones: {total}'))
+
+    def crear_legajos(self, personal_ids, catalogos, cantidad):
+        self.stdout.write(f'Creando {cantidad} documentos de legajo...')
+        rng = self.rng
+        creados = 0
+        while creados < cantidad:
+            tamano = min(self.lote, cantidad - creados)
+            filas = [
+                Legajo(
+                    personal_id=rng.choice(personal_ids),
+                    seccion_id=rng.choice(catalogos['seccion']),
+                    tipo_documento_id=rng.choice(catalogos['tipo']),
+                    descripcion='Documento sintético',
+                    archivo=rng.choice(self.archivos),
+                    registrado_por_id=rng.choice(catalogos['usuario']),
+                )
+                for _ in range(tamano)
+            ]
+            with transaction.atomic():
+                creados_lote = Legajo.objects.bulk_create(filas)
+                # fecha_creacion es auto_now_add: se reparte en el tiempo después de insertar
+                Legajo.objects.filter(id__in=[legajo.id for legajo in creados_lote]).update(
+                    fecha_creacion=RawSQL('fecha_creacion - random() * %s::interval', [f'{self.dias} days'])
+                )
+            creados += tamano
+            self.stdout.write(f'  ✓ {creados}/{cantidad}')
+
+    def crear_eventos(self, personal_ids, catalogos, cantidad):
+        self.stdout.write(f'Creando {cantidad} registros de eventos...')
+        rng = self.rng
+        creados = 0
+        while creados < cantidad:
+            tamano = min(self.lote, cantidad - creados)
+            filas = []
+            for _ in range(tamano):
+                sobre_usuario = rng.random() < 0.2
+                filas.append(RegistroEvento(
+                    usuario_ejecutor_id=rng.choice(catalogos['usuario']),
+                    usuario_afectado_id=rng.choice(catalogos['usuario']) if sobre_usuario else None,
+                    personal_afectado_id=None if sobre_usuario else rng.choice(personal_ids),
+                    evento_id=rng.choice(catalogos['evento']),
+                    fecha_hora=self.fecha_al_azar(),
+                ))
+            RegistroEvento.objects.bulk_create(filas)
+            creados += tamano
+            self.stdout.write(f'  ✓ {creados}/{cantidad}')
@@ -0,0 +1,36 @@
+# personal/management/commands/generar_miniaturas.py
+
+from django.core.management.base import BaseCommand
+from personal.models import Legajo, Personal
+from tareas.utils import encolar
+
+
+class Command(BaseCommand):
+    help = (
+        'Encola la generación de miniaturas y conteo de páginas para los documentos '
+        'existentes que aún no las tienen (las procesa `manage.py procesar_tareas`).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=100, help='Documentos por tarea')
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        legajos = list(
+            Legajo.objects.filter(miniatura='').exclude(archivo='').order_by('id').values_list('id', flat=True)
+        )
+        personal = list(
+            Personal.objects.filter(documento_miniatura='').exclude(documento='').order_by('id').values_list('id', flat=True)
+        )
+
+        tareas = 0
+        for inicio in range(0, len(legajos), lote):
+            encolar('personal.generar_miniaturas', {'legajos': legajos[inicio:inicio + lote]})
+            tareas += 1
+        for inicio in range(0, len(personal), lote):
+            encolar('personal.generar_miniaturas', {'personal': personal[inicio:inicio + lote]})
+            tareas += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {tareas} tareas encoladas ({len(legajos)} documentos de legajo, {len(personal)} documentos de personal)'
+        ))
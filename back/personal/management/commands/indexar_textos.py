@@ -0,0 +1,58 @@
+# personal/management/commands/indexar_textos.py
+
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from personal.models import Legajo
+from personal.texto import extraer_texto, guardar_texto
+
+
+class Command(BaseCommand):
+    help = (
+        'Extrae el texto de los PDF del legajo que aún no lo tienen y actualiza el índice '
+        'de búsqueda por contenido. La extracción corre en varios procesos; los documentos '
+        'que comparten archivo (mismo contenido) se procesan una sola vez. Se puede reanudar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--procesos', type=int, default=os.cpu_count() or 2, help='Procesos de extracción')
+        parser.add_argument('--lote', type=int, default=200, help='Archivos por lote')
+        parser.add_argument('--limite', type=int, default=None, help='Máximo de archivos a procesar')
+        parser.add_argument('--todos', action='store_true', help='Volver a extraer también los ya indexados')
+
+    def handle(self, *args, **options):
+        documentos = Legajo.objects.exclude(archivo='')
+        if not options['todos']:
+            documentos = documentos.filter(fecha_extraccion_texto__isnull=True)
+
+        # Archivo → ids de Legajo que lo usan
+        por_archivo = defaultdict(list)
+        for legajo_id, archivo in documentos.order_by('id').values_list('id', 'archivo').iterator(chunk_size=5000):
+            por_archivo[archivo].append(legajo_id)
+        archivos = list(por_archivo)[:options['limite']]
+        self.stdout.write(f'Archivos por procesar: {len(archivos)} ({sum(len(por_archivo[a]) for a in archivos)} documentos)')
+        if not archivos:
+            return
+
+        almacenamiento = Legajo._meta.get_field('archivo').storage
+        # Los procesos hijos no usan la base: no deben heredar la conexión abierta
+        connections.close_all()
+
+        procesados = con_texto = 0
+        with ProcessPoolExecutor(max_workers=options['procesos']) as ejecutor:
+            for inicio in range(0, len(archivos), options['lote']):
+                lote = archivos[inicio:inicio + options['lote']]
+                rutas = [almacenamiento.path(nombre) for nombre in lote]
+                for nombre, texto in zip(lote, ejecutor.map(extraer_texto, rutas, chunksize=4)):
+                    guardar_texto(por_archivo[nombre], texto)
+                    con_texto += bool(texto.strip())
+                procesados += len(lote)
+                self.stdout.write(f'  ✓ {procesados}/{len(archivos)}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {procesados} archivos procesados, {con_texto} con texto '
+            f'({procesados - con_texto} sin capa de texto o ilegibles)'
+        ))
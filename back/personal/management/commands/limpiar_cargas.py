@@ -0,0 +1,17 @@
+# personal/management/commands/limpiar_cargas.py
+
+from django.core.management.base import BaseCommand
+from personal.cargas import limpiar_expiradas
+
+
+class Command(BaseCommand):
+    help = (
+        'Elimina las sesiones de carga por bloques vencidas (CARGAS_EXPIRACION_HORAS) '
+        'y sus bloques en disco. Pensado para ejecutarse periódicamente (cron).'
+    )
+
+    def handle(self, *args, **options):
+        sesiones, carpetas = limpiar_expiradas()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {sesiones} sesiones vencidas y {carpetas} carpetas huérfanas eliminadas'
+        ))
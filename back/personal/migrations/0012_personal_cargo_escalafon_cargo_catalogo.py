@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizacion', '0009_alter_tipodocumento_options_and_more'),
+        ('personal', '0011_alter_personal_cargo_actual'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='escalafon',
+            name='cargo_catalogo',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='escalafones', to='organizacion.cargo'),
+        ),
+        migrations.AddField(
+            model_name='personal',
+            name='cargo',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='personal_actual', to='organizacion.cargo'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:38
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def llenar_nombre_normalizado(apps, schema_editor):
+    from personal.busqueda import normalizar_texto
+
+    Personal = apps.get_model('personal', 'Personal')
+    lote = []
+    for personal in Personal.objects.only('id', 'nombres', 'apellido_paterno', 'apellido_materno').iterator(chunk_size=2000):
+        personal.nombre_normalizado = normalizar_texto(
+            f"{personal.nombres} {personal.apellido_paterno} {personal.apellido_materno}"
+        )
+        lote.append(personal)
+        if len(lote) >= 2000:
+            Personal.objects.bulk_update(lote, ['nombre_normalizado'])
+            lote = []
+    if lote:
+        Personal.objects.bulk_update(lote, ['nombre_normalizado'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizacion', '0009_alter_tipodocumento_options_and_more'),
+        ('personal', '0012_personal_cargo_escalafon_cargo_catalogo'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='personal',
+            name='nombre_normalizado',
+            field=models.CharField(blank=True, default='', editable=False, max_length=400),
+        ),
+        migrations.RunPython(llenar_nombre_normalizado, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='personal',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['nombre_normalizado'], name='personal_nombre_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
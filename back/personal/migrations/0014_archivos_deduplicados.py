@@ -0,0 +1,50 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:50
+
+import personal.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal', '0013_personal_nombre_normalizado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True)),
+                ('ruta', models.CharField(max_length=500, unique=True)),
+                ('tamano', models.BigIntegerField()),
+                ('referencias', models.PositiveIntegerField(default=0)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archivo almacenado',
+                'verbose_name_plural': 'Archivos almacenados',
+                'db_table': 'archivos_blob',
+            },
+        ),
+        migrations.AddField(
+            model_name='legajo',
+            name='nombre_original',
+            field=models.CharField(blank=True, default='', help_text='Nombre del archivo al subirlo', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='escalafon',
+            name='documento_resolucion',
+            field=models.FileField(blank=True, null=True, storage=personal.storage.AlmacenamientoDeduplicado(), upload_to='resoluciones/'),
+        ),
+        migrations.AlterField(
+            model_name='legajo',
+            name='archivo',
+            field=models.FileField(help_text='Archivo PDF del documento', max_length=500, storage=personal.storage.AlmacenamientoDeduplicado(), upload_to='legajos/%Y/%m/'),
+        ),
+        migrations.AlterField(
+            model_name='personal',
+            name='documento',
+            field=models.FileField(storage=personal.storage.AlmacenamientoDeduplicado(), upload_to='documentos_personal/'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal', '0014_archivos_deduplicados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legajo',
+            name='contenido_hash',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='SHA-256 del archivo', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='legajo',
+            name='paginas',
+            field=models.PositiveIntegerField(blank=True, help_text='Cantidad de páginas del PDF', null=True),
+        ),
+    ]
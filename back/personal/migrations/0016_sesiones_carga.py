@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:54
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizacion', '0009_alter_tipodocumento_options_and_more'),
+        ('personal', '0015_legajo_contenido_hash_paginas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SesionCarga',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('descripcion', models.TextField(blank=True, null=True)),
+                ('nombre_original', models.CharField(max_length=255)),
+                ('tamano', models.BigIntegerField(help_text='Tamaño total del archivo en bytes')),
+                ('tamano_bloque', models.PositiveIntegerField()),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_expiracion', models.DateTimeField(db_index=True)),
+                ('personal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='personal.personal')),
+                ('seccion', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='organizacion.seccionlegajo')),
+                ('tipo_documento', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='organizacion.tipodocumento')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sesiones_carga', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Sesión de carga',
+                'verbose_name_plural': 'Sesiones de carga',
+                'db_table': 'sesiones_carga',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizacion', '0009_alter_tipodocumento_options_and_more'),
+        ('personal', '0016_sesiones_carga'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legajo',
+            name='contenido_busqueda',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='legajo',
+            name='contenido_texto',
+            field=models.TextField(blank=True, default='', help_text='Texto extraído del PDF'),
+        ),
+        migrations.AddField(
+            model_name='legajo',
+            name='fecha_extraccion_texto',
+            field=models.DateTimeField(blank=True, help_text='Vacío mientras el texto no se haya extraído', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='legajo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['contenido_busqueda'], name='legajos_contenido_gin'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal', '0017_legajos_contenido_texto'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legajo',
+            name='miniatura',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='personal',
+            name='documento_miniatura',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='personal',
+            name='documento_paginas',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
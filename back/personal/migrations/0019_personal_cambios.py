@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizacion', '0009_alter_tipodocumento_options_and_more'),
+        ('personal', '0018_miniaturas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonalEliminado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('personal_id', models.BigIntegerField()),
+                ('fecha_eliminacion', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Personal eliminado',
+                'verbose_name_plural': 'Personal eliminado',
+                'db_table': 'personal_eliminados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='personal',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='personal_actualizacion_idx'),
+        ),
+    ]
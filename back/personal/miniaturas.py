@@ -0,0 +1,94 @@
+"""
+Miniatura de la primera página y cantidad de páginas de cada PDF.
+
+La miniatura se guarda junto al archivo original con el mismo nombre:
+
+    blobs/ab/cd/<sha256>.pdf  →  blobs/ab/cd/<sha256>.miniatura.webp
+
+Como los blobs se nombran por contenido, un mismo PDF subido varias veces
+tiene una sola miniatura y su URL nunca cambia de contenido (se sirve como
+inmutable). Se generan en segundo plano (tarea 'personal.generar_miniaturas').
+"""
+import hashlib
+import logging
+import os
+import tempfile
+
+import pypdfium2 as pdfium
+from django.http import Http404
+from PIL import features
+from rest_framework.reverse import reverse
+
+from .descargas import servir_archivo
+from .storage import SUFIJO_MINIATURA, AlmacenamientoDeduplicado
+
+logger = logging.getLogger(__name__)
+
+ANCHO = 240  # píxeles
+FORMATO = 'webp' if features.check('webp') else 'png'
+CONTENT_TYPES = {'.webp': 'image/webp', '.png': 'image/png'}
+
+
+def nombre_miniatura(nombre):
+    return f'{os.path.splitext(nombre)[0]}{SUFIJO_MINIATURA}.{FORMATO}'
+
+
+def generar(nombre, almacenamiento=None):
+    """
+    Crear (si falta) la miniatura del PDF `nombre` del almacenamiento.
+    Retorna (nombre de la miniatura, páginas) o (None, None) si el PDF no se puede leer.
+    """
+    almacenamiento = almacenamiento or AlmacenamientoDeduplicado()
+    ruta = almacenamiento.path(nombre)
+    destino = nombre_miniatura(nombre)
+    ruta_destino = almacenamiento.path(destino)
+
+    try:
+        documento = pdfium.PdfDocument(ruta)
+    except (pdfium.PdfiumError, FileNotFoundError):
+        logger.warning('No se pudo abrir %s para generar la miniatura', nombre)
+        return None, None
+
+    try:
+        paginas = len(documento)
+        if paginas and not os.path.exists(ruta_destino):
+            pagina = documento[0]
+            imagen = pagina.render(scale=ANCHO / pagina.get_width()).to_pil()
+            # Archivo temporal + os.replace: nunca se sirve una miniatura a medio escribir
+            descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta_destino))
+            with os.fdopen(descriptor, 'wb') as salida:
+                imagen.save(salida, format=FORMATO.upper(), quality=75)
+            os.replace(temporal, ruta_destino)
+    except pdfium.PdfiumError:
+        logger.warning('No se pudo renderizar la primera página de %s', nombre)
+        return None, paginas or None
+    finally:
+        documento.close()
+
+    return (destino if paginas else None), paginas
+
+
+def url_miniatura(request, nombre_url, pk, miniatura):
+    """
+    URL de la acción que sirve la miniatura, con ?v=<versión> derivada del
+    nombre: cambia si cambia el archivo, así la respuesta puede ser inmutable.
+    """
+    if not miniatura:
+        return None
+    version = hashlib.sha1(miniatura.encode()).hexdigest()[:12]
+    return f'{reverse(nombre_url, args=[pk], request=request)}?v={version}'
+
+
+def responder_miniatura(request, miniatura):
+    if not miniatura:
+        raise Http404('El documento aún no tiene miniatura')
+    try:
+        return servir_archivo(
+            request,
+            AlmacenamientoDeduplicado().path(miniatura),
+            os.path.basename(miniatura),
+            content_type=CONTENT_TYPES.get(os.path.splitext(miniatura)[1], 'application/octet-stream'),
+            inmutable=True,
+        )
+    except FileNotFoundError:
+        raise Http404('Miniatura no encontrada')
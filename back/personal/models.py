@@ -1,6 +1,13 @@
+import math
+import uuid
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
-from organizacion.models import Area, Regimen, CondicionLaboral, TipoDocumento, SeccionLegajo
+from organizacion.models import Area, Regimen, CondicionLaboral, Cargo, TipoDocumento, SeccionLegajo
+from .busqueda import normalizar_texto
+from .storage import AlmacenamientoDeduplicado
 
 class Personal(models.Model):
     # Datos personales
@@ -20,7 +27,8 @@ class Personal(models.Model):
     area_actual = models.ForeignKey(Area, on_delete=models.PROTECT, related_name='personal_actual', null=True)
     regimen_actual = models.ForeignKey(Regimen, on_delete=models.PROTECT, related_name='personal_actual', null=True)
     condicion_actual = models.ForeignKey(CondicionLaboral, on_delete=models.PROTECT, related_name='personal_actual', null=True)
-    cargo_actual = models.CharField(max_length=200, blank=True, null=True)  # ⭐ VARCHAR, no ForeignKey
+    cargo = models.ForeignKey(Cargo, on_delete=models.PROTECT, related_name='personal_actual', null=True, blank=True)
+    cargo_actual = models.CharField(max_length=200, blank=True, null=True)  # Valor legado (ID como texto o texto libre)
     fecha_ingreso = models.DateField(null=True, blank=True)
     
     # Control
@@ -28,7 +36,13 @@ class Personal(models.Model):
     observaciones = models.TextField(blank=True, null=True)
     
     # Documento inicial (PDF)
-    documento = models.FileField(upload_to='documentos_personal/', blank=False, null=False)
+    documento = models.FileField(upload_to='documentos_personal/', storage=AlmacenamientoDeduplicado(), blank=False, null=False)
+    # Generados en segundo plano (personal.miniaturas)
+    documento_paginas = models.PositiveIntegerField(null=True, blank=True)
+    documento_miniatura = models.CharField(max_length=500, blank=True, default='')
+    
+    # Búsqueda: "nombres apellido_paterno apellido_materno" sin tildes y en minúsculas
+    nombre_normalizado = models.CharField(max_length=400, blank=True, default='', editable=False)
     
     fecha_creacion = models.DateTimeField(default=timezone.now)
     fecha_actualizacion = models.DateTimeField(auto_now=True)
@@ -38,10 +52,22 @@ class Personal(models.Model):
         verbose_name = 'Personal'
         verbose_name_plural = 'Personal'
         ordering = ['apellido_paterno', 'apellido_materno', 'nombres']
+        indexes = [
+            GinIndex(fields=['nombre_normalizado'], name='personal_nombre_trgm', opclasses=['gin_trgm_ops']),
+            # Recorrido por keyset de /api/personal/changes/
+            models.Index(fields=['fecha_actualizacion', 'id'], name='personal_actualizacion_idx'),
+        ]
     
     def __str__(self):
         return f"{self.apellido_paterno} {self.apellido_materno}, {self.nombres} - DNI: {self.dni}"
     
+    def save(self, *args, **kwargs):
+        self.nombre_normalizado = normalizar_texto(self.nombre_completo)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'nombre_normalizado'}
+        super().save(*args, **kwargs)
+    
     @property
     def nombre_completo(self):
         return f"{self.nombres} {self.apellido_paterno} {self.apellido_materno}"
@@ -52,13 +78,14 @@ class Escalafon(models.Model):
     area = models.ForeignKey(Area, on_delete=models.PROTECT)
     regimen = models.ForeignKey(Regimen, on_delete=models.PROTECT)
     condicion_laboral = models.ForeignKey(CondicionLaboral, on_delete=models.PROTECT)
-    cargo = models.CharField(max_length=200)
+    cargo = models.CharField(max_length=200)  # Valor legado (ID como texto o texto libre)
+    cargo_catalogo = models.ForeignKey(Cargo, on_delete=models.PROTECT, related_name='escalafones', null=True, blank=True)
     
     fecha_inicio = models.DateField()
     fecha_fin = models.DateField(null=True, blank=True)
     
     resolucion = models.CharField(max_length=100, blank=True, null=True)
-    documento_resolucion = models.FileField(upload_to='resoluciones/', blank=True, null=True)
+    documento_resolucion = models.FileField(upload_to='resoluciones/', storage=AlmacenamientoDeduplicado(), blank=True, null=True)
     
     observaciones = models.TextField(blank=True, null=True)
     fecha_registro = models.DateTimeField(default=timezone.now)
@@ -116,10 +143,48 @@ class Legajo(models.Model):
     # ⭐ ARCHIVO CON 500 CARACTERES
     archivo = models.FileField(
         upload_to='legajos/%Y/%m/',
+        storage=AlmacenamientoDeduplicado(),
         max_length=500,
         help_text="Archivo PDF del documento"
     )
     
+    # El archivo se guarda por hash: este es el nombre con el que se subió
+    nombre_original = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        help_text="Nombre del archivo al subirlo"
+    )
+    
+    # Calculados al recibir la carga (personal.upload_handlers), sin volver a leer el archivo
+    contenido_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        db_index=True,
+        help_text="SHA-256 del archivo"
+    )
+    paginas = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Cantidad de páginas del PDF"
+    )
+    
+    # Búsqueda por contenido (personal.texto); no se cargan en los listados
+    contenido_texto = models.TextField(
+        blank=True,
+        default='',
+        help_text="Texto extraído del PDF"
+    )
+    contenido_busqueda = SearchVectorField(null=True, blank=True)
+    # Primera página en miniatura, junto al archivo (personal.miniaturas)
+    miniatura = models.CharField(max_length=500, blank=True, default='')
+    fecha_extraccion_texto = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Vacío mientras el texto no se haya extraído"
+    )
+    
     # ⭐ SOLO UNA FECHA - Cuando se subió el archivo
     fecha_creacion = models.DateTimeField(
         auto_now_add=True,
@@ -144,6 +209,7 @@ class Legajo(models.Model):
             models.Index(fields=['personal', 'tipo_documento']),
             models.Index(fields=['seccion']),
             models.Index(fields=['-fecha_creacion']),
+            GinIndex(fields=['contenido_busqueda'], name='legajos_contenido_gin'),
         ]
     
     def __str__(self):
@@ -154,4 +220,86 @@ class Legajo(models.Model):
         if self.archivo:
             if not self.archivo.name.lower().endswith('.pdf'):
                 raise ValueError("Solo se permiten archivos PDF")
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class ArchivoBlob(models.Model):
+    """
+    Contenido único de un archivo subido (ver personal.storage).
+    referencias = cuántos campos (Legajo.archivo, Personal.documento,
+    Escalafon.documento_resolucion) apuntan a este archivo.
+    """
+    hash = models.CharField(max_length=64, unique=True)
+    ruta = models.CharField(max_length=500, unique=True)
+    tamano = models.BigIntegerField()
+    referencias = models.PositiveIntegerField(default=0)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'archivos_blob'
+        verbose_name = 'Archivo almacenado'
+        verbose_name_plural = 'Archivos almacenados'
+    
+    def __str__(self):
+        return f"{self.ruta} ({self.referencias} referencias)"
+
+
+class SesionCarga(models.Model):
+    """
+    Carga de un documento grande en bloques (ver personal.cargas).
+    Los bloques quedan en disco hasta completar la sesión, que crea el Legajo.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    usuario = models.ForeignKey(
+        'usuarios.Usuario',
+        on_delete=models.CASCADE,
+        related_name='sesiones_carga'
+    )
+    
+    # Datos del Legajo que se crea al completar
+    personal = models.ForeignKey(Personal, on_delete=models.CASCADE, related_name='+')
+    seccion = models.ForeignKey(SeccionLegajo, on_delete=models.PROTECT, related_name='+')
+    tipo_documento = models.ForeignKey(TipoDocumento, on_delete=models.PROTECT, related_name='+')
+    descripcion = models.TextField(blank=True, null=True)
+    nombre_original = models.CharField(max_length=255)
+    
+    tamano = models.BigIntegerField(help_text="Tamaño total del archivo en bytes")
+    tamano_bloque = models.PositiveIntegerField()
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_expiracion = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        db_table = 'sesiones_carga'
+        verbose_name = 'Sesión de carga'
+        verbose_name_plural = 'Sesiones de carga'
+    
+    def __str__(self):
+        return f"{self.nombre_original} ({self.id})"
+    
+    @property
+    def total_bloques(self):
+        return math.ceil(self.tamano / self.tamano_bloque)
+    
+    def tamano_esperado(self, numero):
+        """Bytes que debe tener el bloque `numero` (el último puede ser menor)"""
+        if numero < self.total_bloques - 1:
+            return self.tamano_bloque
+        return self.tamano - self.tamano_bloque * (self.total_bloques - 1)
+
+
+class PersonalEliminado(models.Model):
+    """
+    Marca de borrado de un Personal, para que /api/personal/changes/ pueda
+    informar las eliminaciones (la fila ya no existe). Se conservan
+    PERSONAL_CAMBIOS_RETENCION_DIAS; un token más antiguo obliga a resincronizar.
+    """
+    personal_id = models.BigIntegerField()
+    fecha_eliminacion = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        db_table = 'personal_eliminados'
+        verbose_name = 'Personal eliminado'
+        verbose_name_plural = 'Personal eliminado'
+    
+    def __str__(self):
+        return f"Personal {self.personal_id} eliminado el {self.fecha_eliminacion}"
@@ -0,0 +1,168 @@
+"""
+Legajo completo de un personal en un solo PDF.
+
+Los documentos se unen en el servidor en el orden de las secciones
+(y por fecha dentro de cada sección) y el resultado se guarda en
+MEDIA_ROOT/cache/legajos_pdf/<personal_id>/<clave>.pdf. La clave sale
+de los ids de los Legajo y del hash de cada archivo, así que solo se
+regenera cuando se agrega, quita o reemplaza un documento.
+
+Las versiones anteriores se borran al generar una nueva, pero solo las
+que tienen más de GRACIA_ANTERIORES segundos: una petición (o nginx con
+X-Accel-Redirect) que recibió la ruta anterior todavía puede abrirla.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Case, When, Value, F, IntegerField
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PdfReadError
+
+from .models import Legajo
+from .storage import hash_de_ruta
+
+logger = logging.getLogger(__name__)
+
+CARPETA_CACHE = 'cache/legajos_pdf'
+TAMANO_BLOQUE = 1024 * 1024
+HASHES_MAX = 20000
+GRACIA_ANTERIORES = 10 * 60
+
+# Hash por archivo en memoria: (nombre, tamaño, mtime) -> sha256
+_hashes = {}
+# Un lock por clave, repartidas en un número fijo: nunca se quitan, así que
+# todos los hilos que esperan la misma clave esperan el mismo lock
+_locks = [threading.Lock() for _ in range(64)]
+
+
+def documentos_ordenados(personal):
+    """Documentos con archivo: secciones activas por orden, luego las inactivas"""
+    return (
+        Legajo.objects
+        .filter(personal=personal)
+        .exclude(archivo='')
+        .defer('contenido_texto', 'contenido_busqueda')
+        .select_related('seccion')
+        .annotate(orden_seccion=Case(
+            When(seccion__activo=True, then=F('seccion__orden')),
+            default=Value(999),
+            output_field=IntegerField(),
+        ))
+        .order_by('orden_seccion', 'fecha_creacion', 'id')
+    )
+
+
+def hash_archivo(fieldfile):
+    """SHA-256 del contenido, recalculado solo si cambia tamaño o fecha del archivo"""
+    ruta = fieldfile.path
+    estado = os.stat(ruta)
+    llave = (fieldfile.name, estado.st_size, estado.st_mtime_ns)
+    valor = _hashes.get(llave)
+    if valor is None:
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b''):
+                sha.update(bloque)
+        if len(_hashes) >= HASHES_MAX:
+            _hashes.clear()
+        valor = _hashes[llave] = sha.hexdigest()
+    return valor
+
+
+def clave_cache(documentos):
+    """Clave del PDF unido: ids de Legajo + hash de cada archivo (el del nombre si es un blob), en orden"""
+    sha = hashlib.sha256()
+    for documento in documentos:
+        contenido = hash_de_ruta(documento.archivo.name)
+        if contenido is None:
+            try:
+                contenido = hash_archivo(documento.archivo)
+            except FileNotFoundError:
+                contenido = 'faltante'
+        sha.update(f'{documento.id}:{contenido};'.encode())
+    return sha.hexdigest()
+
+
+def _lock(clave):
+    return _locks[int(clave[:8], 16) % len(_locks)]
+
+
+def borrar_anteriores(carpeta, actual):
+    """Borrar las versiones anteriores del PDF unido, salvo las recientes"""
+    limite = time.time() - GRACIA_ANTERIORES
+    for anterior in carpeta.glob('*.pdf'):
+        if anterior == actual:
+            continue
+        try:
+            if anterior.stat().st_mtime < limite:
+                anterior.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def obtener_legajo_pdf(personal):
+    """
+    Ruta del PDF unido del personal (generándolo si hace falta) y su clave,
+    o (None, None) si no tiene documentos legibles.
+    """
+    documentos = list(documentos_ordenados(personal))
+    if not documentos:
+        return None, None
+
+    clave = clave_cache(documentos)
+    carpeta = Path(settings.MEDIA_ROOT) / CARPETA_CACHE / str(personal.pk)
+    ruta = carpeta / f'{clave}.pdf'
+    if ruta.exists():
+        return ruta, clave
+
+    with _lock(clave):
+        if ruta.exists():
+            return ruta, clave
+        carpeta.mkdir(parents=True, exist_ok=True)
+        if not unir(documentos, carpeta, ruta):
+            return None, None
+    # Recién después de que la nueva versión quedó en su lugar
+    borrar_anteriores(carpeta, ruta)
+    return ruta, clave
+
+
+def unir(documentos, carpeta, destino):
+    """
+    Une los PDFs y escribe el resultado en un temporal que luego se
+    renombra, para que otra petición nunca lea un archivo a medio escribir.
+
+    No es página por página: PdfWriter arma el árbol de páginas de todos
+    los documentos antes de escribir. Los archivos quedan abiertos y pypdf
+    lee el contenido de cada página de ahí recién al escribir.
+    """
+    with ExitStack() as archivos:
+        writer = PdfWriter()
+        agregados = 0
+        for documento in documentos:
+            try:
+                # El archivo queda abierto hasta escribir: pypdf lee los streams recién al final
+                archivo = archivos.enter_context(documento.archivo.open('rb'))
+                writer.append(PdfReader(archivo))
+                agregados += 1
+            except (FileNotFoundError, PdfReadError, ValueError) as error:
+                logger.warning('No se pudo agregar el documento %s al legajo: %s', documento.id, error)
+
+        if not agregados:
+            return False
+
+        descriptor, temporal = tempfile.mkstemp(suffix='.tmp', dir=carpeta)
+        try:
+            with os.fdopen(descriptor, 'wb') as salida:
+                writer.write(salida)
+            os.replace(temporal, destino)
+        except BaseException:
+            Path(temporal).unlink(missing_ok=True)
+            raise
+    return True
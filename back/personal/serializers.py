@@ -1,13 +1,33 @@
 # personal/serializers.py - ACTUALIZADO CON CARGO_NOMBRE
 
 from rest_framework import serializers
-from .models import Personal, Escalafon, Legajo
-from organizacion.serializers import AreaSerializer, RegimenSerializer, CondicionLaboralSerializer
-from organizacion.models import Cargo
+from django.conf import settings
+from .models import Personal, Escalafon, Legajo, SesionCarga
+from organizacion.models import SeccionLegajo, TipoDocumento
+from .miniaturas import url_miniatura
+from .upload_handlers import TAMANO_MAXIMO
+from .utils import resolver_cargo
+from organizacion.cache import catalogos
+from organizacion.serializers import AreaSerializer, RegimenSerializer, CondicionLaboralSerializer, CatalogoRelatedField
 import os
 
 
-class PersonalSerializer(serializers.ModelSerializer):
+class ResolverCargoMixin:
+    """
+    Completa la FK de Cargo a partir del valor legado recibido
+    (el frontend envía el ID del cargo como string, o un texto libre).
+    """
+    campo_texto = 'cargo_actual'
+    campo_cargo = 'cargo'
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if self.campo_texto in attrs:
+            attrs[self.campo_cargo] = resolver_cargo(attrs[self.campo_texto])
+        return attrs
+
+
+class PersonalSerializer(ResolverCargoMixin, serializers.ModelSerializer):
     nombre_completo = serializers.ReadOnlyField()
     area_actual_detalle = AreaSerializer(source='area_actual', read_only=True)
     regimen_actual_detalle = RegimenSerializer(source='regimen_actual', read_only=True)
@@ -16,6 +36,15 @@ class PersonalSerializer(serializers.ModelSerializer):
     # ⭐ NUEVO: Agregar detalles del cargo
     cargo_actual_detalle = serializers.SerializerMethodField()
     cargo_nombre = serializers.SerializerMethodField()
+    documento_thumbnail_url = serializers.SerializerMethodField()
+    
+    # Columnas que leen los campos calculados (?fields=, legajos.campos)
+    campos_dependencias = {
+        'nombre_completo': ('nombres', 'apellido_paterno', 'apellido_materno'),
+        'cargo_actual_detalle': ('cargo',),
+        'cargo_nombre': ('cargo__nombre', 'cargo_actual'),
+        'documento_thumbnail_url': ('documento_miniatura',),
+    }
     
     class Meta:
         model = Personal
@@ -24,46 +53,40 @@ class PersonalSerializer(serializers.ModelSerializer):
             'nombre_completo', 'fecha_nacimiento', 'sexo', 'telefono', 'email',
             'direccion', 'area_actual', 'area_actual_detalle', 'regimen_actual',
             'regimen_actual_detalle', 'condicion_actual', 'condicion_actual_detalle',
-            'cargo_actual', 'cargo_actual_detalle', 'cargo_nombre',  # ⭐ ACTUALIZADO
+            'cargo', 'cargo_actual', 'cargo_actual_detalle', 'cargo_nombre',  # ⭐ ACTUALIZADO
             'fecha_ingreso', 'activo', 
-            'observaciones', 'documento', 'fecha_creacion', 'fecha_actualizacion'
+            'observaciones', 'documento', 'documento_paginas', 'documento_thumbnail_url',
+            'fecha_creacion', 'fecha_actualizacion'
         ]
-        read_only_fields = ['id', 'fecha_creacion', 'fecha_actualizacion']
+        read_only_fields = ['id', 'cargo', 'documento_paginas', 'fecha_creacion', 'fecha_actualizacion']
+    
+    def get_documento_thumbnail_url(self, obj):
+        return url_miniatura(
+            self.context.get('request'), 'personal-documento-miniatura', obj.pk, obj.documento_miniatura
+        )
     
     def get_cargo_actual_detalle(self, obj):
         """
         Obtener los detalles completos del cargo.
-        Como cargo_actual es CharField (guarda el ID como string),
-        buscar el cargo en la base de datos.
+        Usa la FK cargo (cargada con select_related en la vista).
         """
-        if obj.cargo_actual:
-            try:
-                cargo = Cargo.objects.filter(id=int(obj.cargo_actual)).first()
-                if cargo:
-                    return {
-                        'id': cargo.id,
-                        'nombre': cargo.nombre,
-                        'codigo': cargo.codigo if hasattr(cargo, 'codigo') else None
-                    }
-            except (ValueError, TypeError):
-                # Si cargo_actual no es un ID válido, retornar None
-                pass
+        cargo = obj.cargo
+        if cargo:
+            return {
+                'id': cargo.id,
+                'nombre': cargo.nombre,
+                'codigo': cargo.codigo if hasattr(cargo, 'codigo') else None
+            }
         return None
     
     def get_cargo_nombre(self, obj):
         """
         Obtener solo el nombre del cargo para mostrar en listas.
+        Si no hay cargo asociado, retornar el valor legado.
         """
-        if obj.cargo_actual:
-            try:
-                cargo = Cargo.objects.filter(id=int(obj.cargo_actual)).first()
-                if cargo:
-                    return cargo.nombre
-                # Si no se encuentra el cargo, retornar el valor original
-                return obj.cargo_actual
-            except (ValueError, TypeError):
-                return obj.cargo_actual
-        return None
+        if obj.cargo_id:
+            return obj.cargo.nombre
+        return obj.cargo_actual or None
 
 
 class PersonalListSerializer(serializers.ModelSerializer):
@@ -73,6 +96,11 @@ class PersonalListSerializer(serializers.ModelSerializer):
     condicion_nombre = serializers.CharField(source='condicion_actual.nombre', read_only=True)
     cargo_nombre = serializers.SerializerMethodField()  # ⭐ NUEVO
     
+    campos_dependencias = {
+        'nombre_completo': ('nombres', 'apellido_paterno', 'apellido_materno'),
+        'cargo_nombre': ('cargo__nombre', 'cargo_actual'),
+    }
+    
     class Meta:
         model = Personal
         fields = [
@@ -82,18 +110,38 @@ class PersonalListSerializer(serializers.ModelSerializer):
     
     def get_cargo_nombre(self, obj):
         """Obtener el nombre del cargo para listas"""
-        if obj.cargo_actual:
-            try:
-                cargo = Cargo.objects.filter(id=int(obj.cargo_actual)).first()
-                if cargo:
-                    return cargo.nombre
-                return obj.cargo_actual
-            except (ValueError, TypeError):
-                return obj.cargo_actual
-        return None
+        if obj.cargo_id:
+            return obj.cargo.nombre
+        return obj.cargo_actual or None
+    
+    # Listado con .values() (legajos.campos.ListaRapidaMixin): misma salida sin instanciar modelos
+    columnas_valores = (
+        'id', 'dni', 'nombres', 'apellido_paterno', 'apellido_materno',
+        'area_actual_id', 'area_actual__nombre', 'regimen_actual_id', 'regimen_actual__nombre',
+        'condicion_actual_id', 'condicion_actual__nombre', 'cargo_actual', 'cargo_id', 'cargo__nombre', 'activo',
+    )
+    
+    @staticmethod
+    def desde_valores(fila, contexto):
+        dato = {
+            'id': fila['id'],
+            'dni': fila['dni'],
+            'nombre_completo': f"{fila['nombres']} {fila['apellido_paterno']} {fila['apellido_materno']}",
+        }
+        # Como en el serializer, sin la relación el campo no aparece
+        if fila['area_actual_id'] is not None:
+            dato['area_nombre'] = fila['area_actual__nombre']
+        if fila['regimen_actual_id'] is not None:
+            dato['regimen_nombre'] = fila['regimen_actual__nombre']
+        if fila['condicion_actual_id'] is not None:
+            dato['condicion_nombre'] = fila['condicion_actual__nombre']
+        dato['cargo_actual'] = fila['cargo_actual']
+        dato['cargo_nombre'] = fila['cargo__nombre'] if fila['cargo_id'] else fila['cargo_actual'] or None
+        dato['activo'] = fila['activo']
+        return dato
 
 
-class PersonalCreateSerializer(serializers.ModelSerializer):
+class PersonalCreateSerializer(ResolverCargoMixin, serializers.ModelSerializer):
     documento = serializers.FileField(required=True)
     
     class Meta:
@@ -109,29 +157,47 @@ class PersonalCreateSerializer(serializers.ModelSerializer):
         if value:
             if not value.name.lower().endswith('.pdf'):
                 raise serializers.ValidationError("Solo se permiten archivos PDF")
-            if value.size > 10 * 1024 * 1024:
+            if value.size > TAMANO_MAXIMO:
                 raise serializers.ValidationError("El archivo no puede superar los 10MB")
         return value
 
 
-class EscalafonSerializer(serializers.ModelSerializer):
+class EscalafonSerializer(ResolverCargoMixin, serializers.ModelSerializer):
+    campo_texto = 'cargo'
+    campo_cargo = 'cargo_catalogo'
+    
     personal_nombre = serializers.CharField(source='personal.nombre_completo', read_only=True)
     area_nombre = serializers.CharField(source='area.nombre', read_only=True)
     regimen_nombre = serializers.CharField(source='regimen.nombre', read_only=True)
     condicion_nombre = serializers.CharField(source='condicion_laboral.nombre', read_only=True)
+    cargo_nombre = serializers.SerializerMethodField()
+    
+    campos_dependencias = {
+        'personal_nombre': ('personal__nombres', 'personal__apellido_paterno', 'personal__apellido_materno'),
+        'cargo_nombre': ('cargo_catalogo__nombre', 'cargo'),
+    }
     
     class Meta:
         model = Escalafon
         fields = [
             'id', 'personal', 'personal_nombre', 'area', 'area_nombre',
             'regimen', 'regimen_nombre', 'condicion_laboral', 'condicion_nombre',
-            'cargo', 'fecha_inicio', 'fecha_fin', 'resolucion',
+            'cargo', 'cargo_catalogo', 'cargo_nombre', 'fecha_inicio', 'fecha_fin', 'resolucion',
             'documento_resolucion', 'observaciones', 'fecha_registro'
         ]
-        read_only_fields = ['id', 'fecha_registro']
+        read_only_fields = ['id', 'cargo_catalogo', 'fecha_registro']
+    
+    def get_cargo_nombre(self, obj):
+        """Nombre del cargo del catálogo, o el valor legado si no está asociado"""
+        if obj.cargo_catalogo_id:
+            return obj.cargo_catalogo.nombre
+        return obj.cargo
 
 
-class EscalafonCreateSerializer(serializers.ModelSerializer):
+class EscalafonCreateSerializer(ResolverCargoMixin, serializers.ModelSerializer):
+    campo_texto = 'cargo'
+    campo_cargo = 'cargo_catalogo'
+    
     class Meta:
         model = Escalafon
         fields = [
@@ -167,10 +233,18 @@ class LegajoSerializer(serializers.ModelSerializer):
     
     # URL del archivo
     archivo_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
     
     # ⭐ ALIAS para compatibilidad con frontend que busca "fecha_registro"
     fecha_registro = serializers.DateTimeField(source='fecha_creacion', read_only=True)
     
+    campos_dependencias = {
+        'personal_nombre': ('personal__nombres', 'personal__apellido_paterno', 'personal__apellido_materno'),
+        'registrado_por_nombre': ('registrado_por__nombres', 'registrado_por__apellidos'),
+        'archivo_url': ('archivo',),
+        'thumbnail_url': ('miniatura',),
+    }
+    
     class Meta:
         model = Legajo
         fields = [
@@ -188,12 +262,22 @@ class LegajoSerializer(serializers.ModelSerializer):
             'descripcion',
             'archivo',
             'archivo_url',
+            'thumbnail_url',
+            'nombre_original',
+            'contenido_hash',
+            'paginas',
             'registrado_por',
             'registrado_por_nombre',
             'fecha_creacion',  # ⭐ Fecha real
             'fecha_registro',  # ⭐ Alias para compatibilidad
         ]
-        read_only_fields = ['id', 'fecha_creacion', 'fecha_registro', 'registrado_por']
+        read_only_fields = [
+            'id', 'fecha_creacion', 'fecha_registro', 'registrado_por',
+            'nombre_original', 'contenido_hash', 'paginas',
+        ]
+    
+    def get_thumbnail_url(self, obj):
+        return url_miniatura(self.context.get('request'), 'legajo-miniatura', obj.pk, obj.miniatura)
     
     def get_archivo_url(self, obj):
         if obj.archivo:
@@ -202,13 +286,80 @@ class LegajoSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.archivo.url)
             return obj.archivo.url
         return None
+    
+    # Listado con .values() (legajos.campos.ListaRapidaMixin): misma salida sin instanciar modelos
+    columnas_valores = (
+        'id', 'personal_id', 'personal__nombres', 'personal__apellido_paterno', 'personal__apellido_materno',
+        'seccion_id', 'seccion__nombre', 'seccion__orden', 'seccion__color',
+        'tipo_documento_id', 'tipo_documento__nombre', 'descripcion', 'archivo', 'miniatura',
+        'nombre_original', 'contenido_hash', 'paginas',
+        'registrado_por_id', 'registrado_por__nombres', 'registrado_por__apellidos', 'fecha_creacion',
+    )
+    
+    @staticmethod
+    def contexto_valores(contexto):
+        request = contexto.get('request')
+        return {
+            **contexto,
+            'almacenamiento': Legajo._meta.get_field('archivo').storage,
+            # build_absolute_uri() una vez: las URL de media son rutas absolutas
+            'prefijo': request.build_absolute_uri('/')[:-1] if request is not None else '',
+            'fecha': serializers.DateTimeField().to_representation,
+        }
+    
+    @staticmethod
+    def desde_valores(fila, contexto):
+        archivo_url = None
+        if fila['archivo']:
+            archivo_url = contexto['almacenamiento'].url(fila['archivo'])
+            if archivo_url.startswith('/'):
+                archivo_url = contexto['prefijo'] + archivo_url
+        fecha = contexto['fecha'](fila['fecha_creacion']) if fila['fecha_creacion'] else None
+        return {
+            'id': fila['id'],
+            'personal': fila['personal_id'],
+            'personal_nombre': (
+                f"{fila['personal__nombres']} {fila['personal__apellido_paterno']} {fila['personal__apellido_materno']}"
+            ),
+            'seccion': fila['seccion_id'],
+            'seccion_id': fila['seccion_id'],
+            'seccion_nombre': fila['seccion__nombre'],
+            'seccion_orden': fila['seccion__orden'],
+            'seccion_color': fila['seccion__color'],
+            'tipo_documento': fila['tipo_documento_id'],
+            'tipo_documento_id': fila['tipo_documento_id'],
+            'tipo_documento_nombre': fila['tipo_documento__nombre'],
+            'descripcion': fila['descripcion'],
+            'archivo': archivo_url,
+            'archivo_url': archivo_url,
+            'thumbnail_url': url_miniatura(contexto.get('request'), 'legajo-miniatura', fila['id'], fila['miniatura']),
+            'nombre_original': fila['nombre_original'],
+            'contenido_hash': fila['contenido_hash'],
+            'paginas': fila['paginas'],
+            'registrado_por': fila['registrado_por_id'],
+            'registrado_por_nombre': f"{fila['registrado_por__nombres']} {fila['registrado_por__apellidos']}",
+            'fecha_creacion': fecha,
+            'fecha_registro': fecha,
+        }
+
 
 
+class LegajoBusquedaSerializer(LegajoSerializer):
+    """Resultado de /api/legajos/buscar/: relevancia y fragmento del texto con la coincidencia"""
+    rango = serializers.FloatField(read_only=True)
+    fragmento = serializers.CharField(read_only=True)
+    
+    class Meta(LegajoSerializer.Meta):
+        fields = LegajoSerializer.Meta.fields + ['rango', 'fragmento']
+
 class LegajoCreateSerializer(serializers.ModelSerializer):
     """
     Serializer para crear documentos del legajo.
     Campos obligatorios: personal, seccion, tipo_documento, archivo
     """
+    seccion = CatalogoRelatedField(queryset=SeccionLegajo.objects.all())
+    tipo_documento = CatalogoRelatedField(queryset=TipoDocumento.objects.all())
+    
     class Meta:
         model = Legajo
         fields = [
@@ -228,7 +379,7 @@ class LegajoCreateSerializer(serializers.ModelSerializer):
         if ext != '.pdf':
             raise serializers.ValidationError("Solo se permiten archivos PDF")
         
-        if value.size > 10 * 1024 * 1024:
+        if value.size > TAMANO_MAXIMO:
             raise serializers.ValidationError("El archivo no puede superar los 10MB")
         
         return value
@@ -240,7 +391,7 @@ class LegajoCreateSerializer(serializers.ModelSerializer):
         return value
     
     def validate(self, data):
-        """Validaciones adicionales"""
+        """Validaciones adicionales (sección y tipo vienen del catálogo en memoria)"""
         # Validar que la sección esté activa
         if data.get('seccion') and not data['seccion'].activo:
             raise serializers.ValidationError({
@@ -253,4 +404,148 @@ class LegajoCreateSerializer(serializers.ModelSerializer):
                 'tipo_documento': 'El tipo de documento seleccionado no está activo'
             })
         
-        return data
\ No newline at end of file
+        return data
+
+class LegajoCargaMasivaSerializer(serializers.Serializer):
+    """
+    Varios documentos del legajo de un personal en una sola petición multipart:
+
+        personal        ID del personal
+        archivos        uno o más PDF (campo repetido)
+        seccion, tipo_documento, descripcion
+                        valores para todos los archivos
+        documentos      opcional: JSON con una entrada por archivo, en el mismo
+                        orden, para usar otra sección/tipo/descripción, ej.
+                        [{"seccion": 2, "tipo_documento": 5}, {"descripcion": "..."}]
+
+    Las secciones y tipos se toman del catálogo en memoria (organizacion.cache).
+    validated_data['documentos'] queda como lista de dicts listos para Legajo.
+    """
+    MAXIMO_ARCHIVOS = 50
+    
+    personal = serializers.PrimaryKeyRelatedField(queryset=Personal.objects.all())
+    archivos = serializers.ListField(
+        child=serializers.FileField(),
+        allow_empty=False,
+        max_length=MAXIMO_ARCHIVOS
+    )
+    seccion = serializers.IntegerField(required=False)
+    tipo_documento = serializers.IntegerField(required=False)
+    descripcion = serializers.CharField(required=False, allow_blank=True, max_length=500)
+    documentos = serializers.JSONField(required=False)
+    
+    def validate_archivos(self, value):
+        errores = {}
+        for indice, archivo in enumerate(value):
+            if os.path.splitext(archivo.name)[1].lower() != '.pdf':
+                errores[indice] = f"{archivo.name}: solo se permiten archivos PDF"
+            elif archivo.size > TAMANO_MAXIMO:
+                errores[indice] = f"{archivo.name}: el archivo no puede superar los 10MB"
+        if errores:
+            raise serializers.ValidationError(errores)
+        return value
+    
+    def validate(self, data):
+        archivos = data['archivos']
+        por_archivo = data.get('documentos') or [{}] * len(archivos)
+        if not isinstance(por_archivo, list) or len(por_archivo) != len(archivos):
+            raise serializers.ValidationError({
+                'documentos': 'Debe tener una entrada por cada archivo'
+            })
+        
+        documentos = []
+        for indice, (archivo, extra) in enumerate(zip(archivos, por_archivo)):
+            if not isinstance(extra, dict):
+                raise serializers.ValidationError({'documentos': {indice: 'Debe ser un objeto'}})
+            documento = {
+                'seccion': extra.get('seccion', data.get('seccion')),
+                'tipo_documento': extra.get('tipo_documento', data.get('tipo_documento')),
+                'descripcion': extra.get('descripcion', data.get('descripcion')) or '',
+                'archivo': archivo,
+            }
+            for campo in ('seccion', 'tipo_documento'):
+                try:
+                    documento[campo] = int(documento[campo])
+                except (TypeError, ValueError):
+                    raise serializers.ValidationError({campo: f'Falta o no es válido para el archivo {archivo.name}'})
+            if len(documento['descripcion']) > 500:
+                raise serializers.ValidationError({'descripcion': 'La descripción no puede superar los 500 caracteres'})
+            documentos.append(documento)
+        
+        # Secciones y tipos desde el catálogo en memoria (sin consultas)
+        for documento in documentos:
+            seccion = (
+                catalogos['secciones'].obtener(documento['seccion'])
+                or SeccionLegajo.objects.filter(pk=documento['seccion']).first()
+            )
+            tipo = (
+                catalogos['tipos_documento'].obtener(documento['tipo_documento'])
+                or TipoDocumento.objects.filter(pk=documento['tipo_documento']).first()
+            )
+            if seccion is None or not seccion.activo:
+                raise serializers.ValidationError({
+                    'seccion': f'La sección {documento["seccion"]} no existe o no está activa'
+                })
+            if tipo is None or not tipo.activo:
+                raise serializers.ValidationError({
+                    'tipo_documento': f'El tipo de documento {documento["tipo_documento"]} no existe o no está activo'
+                })
+            documento['seccion'] = seccion
+            documento['tipo_documento'] = tipo
+        
+        data['documentos'] = documentos
+        return data
+
+
+class SesionCargaSerializer(serializers.ModelSerializer):
+    """
+    Sesión de carga por bloques. Se crea con los mismos datos que un Legajo
+    más el nombre y tamaño del archivo; responde cuántos bloques enviar.
+    """
+    seccion = CatalogoRelatedField(queryset=SeccionLegajo.objects.all())
+    tipo_documento = CatalogoRelatedField(queryset=TipoDocumento.objects.all())
+    total_bloques = serializers.IntegerField(read_only=True)
+    bloques_recibidos = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = SesionCarga
+        fields = [
+            'id',
+            'personal',
+            'seccion',
+            'tipo_documento',
+            'descripcion',
+            'nombre_original',
+            'tamano',
+            'tamano_bloque',
+            'total_bloques',
+            'bloques_recibidos',
+            'fecha_creacion',
+            'fecha_expiracion',
+        ]
+        read_only_fields = ['id', 'tamano_bloque', 'fecha_creacion', 'fecha_expiracion']
+    
+    def get_bloques_recibidos(self, obj):
+        from .cargas import bloques_recibidos
+        return bloques_recibidos(obj)
+    
+    def validate_nombre_original(self, value):
+        if os.path.splitext(value)[1].lower() != '.pdf':
+            raise serializers.ValidationError("Solo se permiten archivos PDF")
+        return value
+    
+    def validate_tamano(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("El archivo está vacío")
+        if value > settings.CARGAS_TAMANO_MAXIMO:
+            raise serializers.ValidationError(
+                f"El archivo no puede superar los {settings.CARGAS_TAMANO_MAXIMO // (1024 * 1024)}MB"
+            )
+        return value
+    
+    def validate(self, data):
+        if data.get('seccion') and not data['seccion'].activo:
+            raise serializers.ValidationError({'seccion': 'La sección seleccionada no está activa'})
+        if data.get('tipo_documento') and not data['tipo_documento'].activo:
+            raise serializers.ValidationError({'tipo_documento': 'El tipo de documento seleccionado no está activo'})
+        return data
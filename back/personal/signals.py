@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete
+from django.dispatch import Signal, receiver
+
+from .cambios import registrar_eliminado
+from .models import Escalafon, Legajo, Personal
+from .storage import liberar_al_confirmar
+
+# Se envía después de crear un lote de Legajo con bulk_create (carga masiva;
+# bulk_create no dispara post_save). Argumentos: legajos
+legajos_creados = Signal()
+
+
+@receiver(post_delete, sender=Personal)
+def marcar_personal_eliminado(sender, instance, **kwargs):
+    """Marca de borrado para la sincronización incremental (/api/personal/changes/)"""
+    registrar_eliminado(instance.pk)
+
+
+@receiver(post_delete, sender=Personal)
+@receiver(post_delete, sender=Escalafon)
+@receiver(post_delete, sender=Legajo)
+def liberar_archivo(sender, instance, **kwargs):
+    """
+    Quitar la referencia al blob del registro borrado, también cuando el borrado
+    llega en cascada desde Personal (que no llama a FieldFile.delete)
+    """
+    campo = {Personal: 'documento', Escalafon: 'documento_resolucion', Legajo: 'archivo'}[sender]
+    archivo = getattr(instance, campo)
+    if archivo:
+        liberar_al_confirmar(archivo.storage, archivo.name)
@@ -0,0 +1,86 @@
+"""
+Datos sintéticos para pruebas de carga (ver los comandos
+generar_datos_sinteticos, benchmark_busqueda y benchmark_api).
+
+Todo el Personal sintético usa DNIs 9XXXXXXX para poder contarlo,
+reanudarlo y borrarlo sin tocar los datos reales.
+"""
+import random
+
+from .busqueda import normalizar_texto
+from .models import Personal
+
+NOMBRES = [
+    'José', 'María', 'Luis', 'Ana', 'Jesús', 'Rosa', 'Juan', 'Lucía', 'Ángel', 'Sofía',
+    'Martín', 'Inés', 'Raúl', 'Carmen', 'Andrés', 'Verónica', 'Héctor', 'Mónica',
+]
+APELLIDOS = [
+    'Núñez', 'Pérez', 'Quispe', 'Mamani', 'Huamán', 'García', 'Rodríguez', 'Flores',
+    'Sánchez', 'Chávez', 'Ramírez', 'Gutiérrez', 'Vásquez', 'Castillo', 'Ríos', 'Peña',
+]
+PREFIJO_DNI = '9'
+
+
+def personal_sintetico():
+    return Personal.objects.filter(dni__startswith=PREFIJO_DNI)
+
+
+def crear_personal(desde, hasta, catalogos=None, lote=5000, documento='documentos_personal/sintetico.pdf'):
+    """
+    Crear Personal sintético con DNIs 9{desde:07d} .. 9{hasta-1:07d}.
+
+    catalogos: dict opcional con listas de ids para 'area', 'regimen',
+    'condicion' y 'cargo' que se asignan al azar.
+    """
+    catalogos = catalogos or {}
+    rng = random.Random(desde)
+    elegir = lambda clave: rng.choice(catalogos[clave]) if catalogos.get(clave) else None
+    filas = []
+    for i in range(desde, hasta):
+        nombres = rng.choice(NOMBRES)
+        paterno, materno = rng.choice(APELLIDOS), rng.choice(APELLIDOS)
+        cargo_id = elegir('cargo')
+        filas.append(Personal(
+            dni=f'{PREFIJO_DNI}{i:07d}',
+            nombres=nombres,
+            apellido_paterno=paterno,
+            apellido_materno=materno,
+            nombre_normalizado=normalizar_texto(f'{nombres} {paterno} {materno}'),
+            area_actual_id=elegir('area'),
+            regimen_actual_id=elegir('regimen'),
+            condicion_actual_id=elegir('condicion'),
+            cargo_id=cargo_id,
+            cargo_actual=str(cargo_id) if cargo_id else None,
+            activo=rng.random() > 0.1,
+            documento=documento,
+        ))
+        if len(filas) >= lote:
+            Personal.objects.bulk_create(filas)
+            filas = []
+    if filas:
+        Personal.objects.bulk_create(filas)
+
+
+def pdf_minimo(texto='Documento sintético'):
+    """PDF válido de una página con una línea de texto (unos 600 bytes)"""
+    texto = texto.encode('latin-1', 'replace').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    contenido = b'BT /F1 18 Tf 72 720 Td (' + texto + b') Tj ET'
+    objetos = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>',
+        b'<< /Length ' + str(len(contenido)).encode() + b' >>\nstream\n' + contenido + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    salida = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for numero, objeto in enumerate(objetos, start=1):
+        offsets.append(len(salida))
+        salida += b'%d 0 obj\n' % numero + objeto + b'\nendobj\n'
+    inicio_xref = len(salida)
+    salida += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+    for offset in offsets:
+        salida += b'%010d 00000 n \n' % offset
+    salida += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objetos) + 1, inicio_xref)
+    return bytes(salida)
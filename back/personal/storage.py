@@ -0,0 +1,154 @@
+"""
+Almacenamiento de archivos por contenido (deduplicado).
+
+Cada archivo subido se guarda una sola vez en blobs/ab/cd/<sha256>.<ext>
+aunque se suba muchas veces (copias de DNI, resoluciones que abarcan a
+varios trabajadores...). ArchivoBlob lleva la cuenta de cuántos campos
+apuntan a cada blob y el archivo físico se borra solo cuando se quita
+la última referencia.
+
+Los archivos anteriores (legajos/%Y/%m/, resoluciones/, ...) siguen
+funcionando igual hasta que se migran con `manage.py deduplicar_media`.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+CARPETA_BLOBS = 'blobs'
+SUFIJO_MINIATURA = '.miniatura'  # <nombre>.miniatura.webp junto al original
+
+
+def ruta_blob(sha, extension):
+    """blobs/ab/cd/abcd...ef.pdf"""
+    return f'{CARPETA_BLOBS}/{sha[:2]}/{sha[2:4]}/{sha}{extension}'
+
+
+def hash_de_ruta(nombre):
+    """SHA-256 contenido en el nombre si es un blob, o None para archivos anteriores"""
+    if not nombre or not nombre.startswith(f'{CARPETA_BLOBS}/'):
+        return None
+    return os.path.splitext(os.path.basename(nombre))[0]
+
+
+def _modelo_blob():
+    # Import diferido: personal.models importa este módulo para definir los campos
+    return apps.get_model('personal', 'ArchivoBlob')
+
+
+def sumar_referencia(nombre):
+    """
+    Registrar que otro campo apunta al mismo archivo sin volver a subirlo
+    (por ejemplo, el primer Legajo que reutiliza Personal.documento).
+    """
+    if hash_de_ruta(nombre):
+        _modelo_blob().objects.filter(ruta=nombre).update(referencias=F('referencias') + 1)
+
+
+def liberar_al_confirmar(almacenamiento, nombre):
+    """
+    Quitar la referencia de un blob cuando se confirme la transacción en curso
+    (al reemplazar o borrar el campo que apuntaba a él). Los archivos anteriores
+    a blobs/ pueden estar compartidos sin cuenta y quedan para deduplicar_media.
+    """
+    if hash_de_ruta(nombre):
+        transaction.on_commit(lambda: almacenamiento.delete(nombre))
+
+
+@deconstructible(path='personal.storage.AlmacenamientoDeduplicado')
+class AlmacenamientoDeduplicado(FileSystemStorage):
+    """FileSystemStorage que guarda por SHA-256 y cuenta referencias"""
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre final lo decide _save a partir del contenido
+        return name
+
+    def _save(self, name, content):
+        # Si la carga ya trae el hash (ManejadorCargaPDF) y el contenido existe, no se copia nada
+        sha = getattr(content, 'sha256', None)
+        if sha:
+            ruta = self._reutilizar(sha)
+            if ruta:
+                return ruta
+
+        temporal, sha, tamano = self._copiar_a_temporal(content)
+        try:
+            return self._registrar(sha, tamano, os.path.splitext(name)[1].lower(), temporal)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    def _copiar_a_temporal(self, content):
+        """Copiar el archivo por bloques calculando el hash en la misma pasada"""
+        carpeta = self.path(f'{CARPETA_BLOBS}/tmp')
+        os.makedirs(carpeta, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=carpeta)
+        sha = hashlib.sha256()
+        tamano = 0
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        with os.fdopen(descriptor, 'wb') as destino:
+            for bloque in content.chunks():
+                sha.update(bloque)
+                destino.write(bloque)
+                tamano += len(bloque)
+        return temporal, sha.hexdigest(), tamano
+
+    def _reutilizar(self, sha):
+        ArchivoBlob = _modelo_blob()
+        with transaction.atomic():
+            blob = ArchivoBlob.objects.select_for_update().filter(hash=sha).first()
+            if blob is None or not self.exists(blob.ruta):
+                return None
+            ArchivoBlob.objects.filter(pk=blob.pk).update(referencias=F('referencias') + 1)
+        return blob.ruta
+
+    def _registrar(self, sha, tamano, extension, temporal):
+        ArchivoBlob = _modelo_blob()
+        with transaction.atomic():
+            # El bloqueo evita que un borrado simultáneo elimine el archivo recién reutilizado
+            blob, _ = ArchivoBlob.objects.select_for_update().get_or_create(
+                hash=sha,
+                defaults={'ruta': ruta_blob(sha, extension), 'tamano': tamano}
+            )
+            destino = self.path(blob.ruta)
+            if not os.path.exists(destino):
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(temporal, destino)
+                if self.file_permissions_mode is not None:
+                    os.chmod(destino, self.file_permissions_mode)
+            ArchivoBlob.objects.filter(pk=blob.pk).update(referencias=F('referencias') + 1)
+        return blob.ruta
+
+    def delete(self, name):
+        """Quitar una referencia; el archivo se borra con la última"""
+        if not hash_de_ruta(name):
+            super().delete(name)
+            self._borrar_derivados(name)
+            return
+
+        ArchivoBlob = _modelo_blob()
+        with transaction.atomic():
+            blob = ArchivoBlob.objects.select_for_update().filter(ruta=name).first()
+            if blob is None:
+                return
+            if blob.referencias > 1:
+                ArchivoBlob.objects.filter(pk=blob.pk).update(referencias=F('referencias') - 1)
+                return
+            blob.delete()
+            super().delete(name)
+            self._borrar_derivados(name)
+    
+    def _borrar_derivados(self, name):
+        """Miniaturas generadas a partir de `name` (<nombre>.miniatura.webp / .png)"""
+        carpeta, archivo = os.path.split(self.path(name))
+        prefijo = os.path.splitext(archivo)[0] + SUFIJO_MINIATURA + '.'
+        if os.path.isdir(carpeta):
+            for derivado in os.listdir(carpeta):
+                if derivado.startswith(prefijo):
+                    os.remove(os.path.join(carpeta, derivado))
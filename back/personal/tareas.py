@@ -0,0 +1,80 @@
+"""
+Tareas de fondo de los documentos del legajo (ver tareas.utils).
+Las vistas solo las encolan y responden; las ejecuta `manage.py procesar_tareas`.
+"""
+from tareas.utils import encolar, tarea
+
+from .miniaturas import generar
+from .models import Legajo, Personal
+from .pdf import obtener_legajo_pdf
+from .texto import extraer_y_guardar, indexar_descripcion as indexar_descripcion_legajo
+
+# Espera antes de regenerar el PDF unido, para agrupar varias cargas seguidas
+RETRASO_LEGAJO_PDF = 60
+
+
+@tarea('personal.extraer_texto')
+def extraer_texto(ids):
+    for legajo_id in ids:
+        extraer_y_guardar(legajo_id)
+
+
+@tarea('personal.indexar_descripcion')
+def indexar_descripcion(legajo_id):
+    indexar_descripcion_legajo(legajo_id)
+
+
+@tarea('personal.preparar_legajo_pdf')
+def preparar_legajo_pdf(personal_id):
+    """Dejar en caché el PDF unido del legajo para que la primera descarga sea inmediata"""
+    personal = Personal.objects.filter(pk=personal_id).first()
+    if personal is None:
+        return
+    obtener_legajo_pdf(personal)
+
+
+@tarea('personal.generar_miniaturas')
+def generar_miniaturas(legajos=(), personal=()):
+    """Miniatura y páginas de los Legajo y Personal.documento indicados"""
+    for legajo_id, archivo in Legajo.objects.filter(pk__in=legajos).exclude(archivo='').values_list('id', 'archivo'):
+        miniatura, paginas = generar(archivo)
+        campos = {'miniatura': miniatura or ''}
+        if paginas:
+            campos['paginas'] = paginas
+        # Solo si el archivo no se reemplazó mientras tanto
+        Legajo.objects.filter(pk=legajo_id, archivo=archivo).update(**campos)
+    
+    for personal_id, documento in Personal.objects.filter(pk__in=personal).exclude(documento='').values_list('id', 'documento'):
+        miniatura, paginas = generar(documento)
+        Personal.objects.filter(pk=personal_id, documento=documento).update(
+            documento_miniatura=miniatura or '',
+            documento_paginas=paginas
+        )
+
+
+def programar_procesamiento(legajos):
+    """Encolar el trabajo pesado de documentos nuevos o con archivo reemplazado"""
+    legajos = list(legajos)
+    if not legajos:
+        return
+    ids = [legajo.id for legajo in legajos]
+    encolar('personal.extraer_texto', {'ids': ids})
+    encolar('personal.generar_miniaturas', {'legajos': ids})
+    for personal_id in {legajo.personal_id for legajo in legajos}:
+        encolar(
+            'personal.preparar_legajo_pdf',
+            {'personal_id': personal_id},
+            clave=f'legajo_pdf:{personal_id}',
+            retraso=RETRASO_LEGAJO_PDF,
+        )
+
+
+def programar_descripcion(legajo):
+    """Reindexar la búsqueda de contenido cuando cambia solo la descripción"""
+    encolar('personal.indexar_descripcion', {'legajo_id': legajo.id}, clave=f'descripcion:{legajo.id}')
+
+
+def programar_documento_personal(personal):
+    """Miniatura y páginas del documento adjunto al registrar o editar un personal"""
+    if personal.documento:
+        encolar('personal.generar_miniaturas', {'personal': [personal.id]})
@@ -1,3 +1,365 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import tempfile
+import warnings
+import zipfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
+from django.test import AsyncClient, AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from dashboard.utils import CLAVE_CACHE
+from legajos.campos import ListaRapidaMixin
+from organizacion.cache import catalogos
+from organizacion.models import Area, Cargo, CondicionLaboral, Regimen, SeccionLegajo, TipoDocumento
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from usuarios.models import Usuario
+
+from .descargas import servir_archivo
+from .models import ArchivoBlob, Escalafon, Legajo, Personal
+from .sinteticos import pdf_minimo
+
+
+def crear_personal(numero, **extra):
+    return Personal.objects.create(
+        dni=f'{numero:08d}', nombres=f'Nombre {numero}', apellido_paterno='Paterno', apellido_materno='Materno', **extra
+    )
+
+
+def sin_lista_rapida():
+    """list() de DRF (serializer campo por campo) en lugar del de ListaRapidaMixin"""
+    return mock.patch.object(
+        ListaRapidaMixin, 'list', lambda self, request, *args, **kwargs: super(ListaRapidaMixin, self).list(request, *args, **kwargs)
+    )
+
+
+class PersonalListadoConsultasTests(TestCase):
+    """El listado de /api/personal/ no hace una consulta por fila (cargo, área...)"""
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.usuario)
+
+    def listar(self, filas):
+        respuesta = self.cliente.get('/api/personal/')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()['count'], filas)
+
+    def test_consultas_constantes(self):
+        crear_personal(1)
+        with CaptureQueriesContext(connection) as consultas:
+            self.listar(1)
+
+        for numero in range(2, 21):
+            # Cargo del catálogo, cargo en texto libre o sin cargo; con y sin área
+            cargo = Cargo.objects.create(nombre=f'Cargo {numero}') if numero % 3 == 0 else None
+            area = Area.objects.create(nombre=f'Área {numero}', codigo=f'A{numero}') if numero % 2 == 0 else None
+            crear_personal(
+                numero, cargo=cargo, area_actual=area,
+                cargo_actual=str(cargo.pk) if cargo else f'Cargo libre {numero}' if numero % 3 == 1 else None,
+            )
+        # Las mismas consultas con 1 fila que con 20
+        with self.assertNumQueries(len(consultas)):
+            self.listar(20)
+
+
+class LegajoPorSeccionConsultasTests(TestCase):
+    """por_seccion arma todas las secciones con una sola consulta de documentos"""
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.usuario)
+
+        # Las secciones vienen del catálogo en memoria, que se invalida al confirmar
+        with self.captureOnCommitCallbacks(execute=True):
+            self.secciones = [SeccionLegajo.objects.create(nombre=f'Sección {i}', orden=i) for i in range(1, 6)]
+            SeccionLegajo.objects.create(nombre='Inactiva', orden=9, activo=False)
+        tipos = [TipoDocumento.objects.create(nombre=f'Tipo {i}') for i in range(3)]
+        self.personal = crear_personal(1)
+        Legajo.objects.bulk_create(
+            Legajo(
+                personal=self.personal, seccion=self.secciones[i % 4], tipo_documento=tipos[i % 3],
+                archivo=f'blobs/00/00/{i:064d}.pdf', registrado_por=self.usuario,
+            )
+            for i in range(40)
+        )
+        catalogos['secciones'].objetos()  # copia en memoria ya cargada
+
+    def test_una_consulta(self):
+        with self.assertNumQueries(1):
+            respuesta = self.cliente.get(f'/api/legajos/por_seccion/?personal={self.personal.pk}')
+
+        self.assertEqual(respuesta.status_code, 200)
+        cantidades = [(seccion['seccion']['orden'], seccion['cantidad']) for seccion in respuesta.json()]
+        self.assertEqual(cantidades, [(1, 10), (2, 10), (3, 10), (4, 10), (5, 0)])
+
+
+class ListaRapidaTests(TestCase):
+    """desde_valores() da la misma respuesta que el serializer"""
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.usuario)
+
+        area = Area.objects.create(nombre='Área', codigo='A1')
+        regimen = Regimen.objects.create(nombre='Régimen')
+        condicion = CondicionLaboral.objects.create(nombre='Nombrado')
+        cargo = Cargo.objects.create(nombre='Cargo')
+        secciones = [SeccionLegajo.objects.create(nombre=f'Sección {i}', orden=i) for i in range(2)]
+        tipo = TipoDocumento.objects.create(nombre='Tipo')
+        for numero in range(1, 7):
+            # Relaciones presentes o nulas, cargo del catálogo, libre o ninguno
+            personal = crear_personal(
+                numero,
+                area_actual=area if numero % 2 else None,
+                regimen_actual=regimen if numero % 3 else None,
+                condicion_actual=condicion if numero % 4 else None,
+                cargo=cargo if numero == 1 else None,
+                cargo_actual=str(cargo.pk) if numero == 1 else 'Libre' if numero == 2 else '' if numero == 3 else None,
+                activo=numero != 3,
+            )
+            Legajo.objects.create(
+                personal=personal, seccion=secciones[numero % 2], tipo_documento=tipo,
+                descripcion='Línea\u2028nueva' if numero == 1 else None,
+                archivo=f'blobs/00/00/{numero:064d}.pdf' if numero != 2 else '',
+                miniatura='blobs/00/00/m.jpg' if numero == 4 else '',
+                nombre_original='dni.pdf', paginas=numero if numero % 2 else None, registrado_por=self.usuario,
+            )
+
+    def comparar(self, url):
+        respuesta = self.cliente.get(url)
+        with sin_lista_rapida():
+            esperada = self.cliente.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(esperada.status_code, 200)
+        self.assertEqual(respuesta.json(), esperada.json(), url)
+        self.assertEqual(respuesta.content, esperada.content, url)
+
+    def test_personal(self):
+        for url in ('/api/personal/', '/api/personal/?page=1',
+                    '/api/personal/?fields=id,cargo_nombre,area_nombre', '/api/personal/?exclude=nombre_completo'):
+            self.comparar(url)
+
+    def test_legajos(self):
+        for url in ('/api/legajos/', '/api/legajos/?paginacion=cursor&page_size=4',
+                    '/api/legajos/?fields=id,archivo_url,thumbnail_url,personal_nombre',
+                    '/api/legajos/?exclude=registrado_por_nombre,fecha_registro'):
+            self.comparar(url)
+
+
+class RangoDescargaTests(SimpleTestCase):
+    """Header Range en servir_archivo"""
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.ruta = Path(carpeta.name) / 'doc.pdf'
+        self.ruta.write_bytes(b'0123456789')
+
+    def pedir(self, rango):
+        request = RequestFactory().get('/', HTTP_RANGE=rango)
+        respuesta = servir_archivo(request, self.ruta, 'doc.pdf')
+        contenido = b''.join(respuesta.streaming_content) if respuesta.streaming else respuesta.content
+        respuesta.close()
+        return respuesta.status_code, contenido
+
+    def test_rangos(self):
+        self.assertEqual(self.pedir('bytes=2-4'), (206, b'234'))
+        self.assertEqual(self.pedir('bytes=-3'), (206, b'789'))
+        self.assertEqual(self.pedir('bytes=8-'), (206, b'89'))
+        self.assertEqual(self.pedir('bytes=5-99'), (206, b'56789'))
+        # Mal formado: se ignora y va el archivo completo
+        self.assertEqual(self.pedir('bytes=5-3'), (200, b'0123456789'))
+        # Bien formado pero fuera del archivo
+        self.assertEqual(self.pedir('bytes=10-12')[0], 416)
+        self.assertEqual(self.pedir('bytes=-0')[0], 416)
+
+    async def test_asgi_por_bloques(self):
+        # Bajo ASGI ni el archivo completo ni el rango pasan por list() (aviso de Django)
+        for rango, esperado in (('', (200, b'0123456789')), ('bytes=2-4', (206, b'234'))):
+            request = AsyncRequestFactory().get('/', headers={'Range': rango} if rango else None)
+            respuesta = servir_archivo(request, self.ruta, 'doc.pdf')
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                contenido = b''.join([bloque async for bloque in respuesta])
+            self.assertEqual((respuesta.status_code, contenido), esperado)
+            self.assertEqual(respuesta['Content-Length'], str(len(contenido)))
+
+
+class LegajoZipAsyncTests(TestCase):
+    """Bajo ASGI el ZIP sale por bloques, sin armarlo entero en memoria"""
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        ajuste = override_settings(MEDIA_ROOT=carpeta.name)
+        ajuste.enable()
+        self.addCleanup(ajuste.disable)
+
+        usuario = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        self.cabeceras = {'Authorization': f'Bearer {AccessToken.for_user(usuario)}'}
+        self.personal = crear_personal(1)
+        seccion = SeccionLegajo.objects.create(nombre='Sección', orden=1)
+        tipo = TipoDocumento.objects.create(nombre='Tipo')
+        self.contenidos = []
+        for numero in range(3):
+            contenido = b'%PDF-1.4\n' + os.urandom(200 * 1024)
+            legajo = Legajo(personal=self.personal, seccion=seccion, tipo_documento=tipo, registrado_por=usuario)
+            legajo.archivo.save(f'doc{numero}.pdf', ContentFile(contenido), save=False)
+            legajo.save()
+            self.contenidos.append(contenido)
+
+    async def test_zip_por_bloques(self):
+        respuesta = await AsyncClient().get(f'/api/personal/{self.personal.pk}/legajo/zip/', headers=self.cabeceras)
+        self.assertEqual(respuesta.status_code, 200)
+
+        bloques = []
+        with warnings.catch_warnings():
+            # Django avisa cuando consume un iterador síncrono con list()
+            warnings.simplefilter('error')
+            async for bloque in respuesta:
+                bloques.append(bloque)
+
+        self.assertGreater(len(bloques), 3)
+        with zipfile.ZipFile(io.BytesIO(b''.join(bloques))) as archivo_zip:
+            self.assertEqual(sorted(archivo_zip.read(nombre) for nombre in archivo_zip.namelist()), sorted(self.contenidos))
+
+
+class ReferenciasBlobTests(TestCase):
+    """Reemplazar o borrar un archivo (también en cascada) quita su referencia al blob"""
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        ajuste = override_settings(MEDIA_ROOT=carpeta.name)
+        ajuste.enable()
+        self.addCleanup(ajuste.disable)
+
+        self.usuario = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.usuario)
+        self.seccion = SeccionLegajo.objects.create(nombre='Sección', orden=1)
+        self.tipo = TipoDocumento.objects.create(nombre='Tipo')
+        self.compartido = pdf_minimo('Compartido')
+        self.nuevo = pdf_minimo('Nuevo')
+
+    def referencias(self, contenido):
+        blob = ArchivoBlob.objects.filter(hash=hashlib.sha256(contenido).hexdigest()).first()
+        return blob.referencias if blob else 0
+
+    def crear_legajo(self, personal, contenido):
+        legajo = Legajo(personal=personal, seccion=self.seccion, tipo_documento=self.tipo, registrado_por=self.usuario)
+        legajo.archivo.save('doc.pdf', ContentFile(contenido), save=False)
+        legajo.save()
+        return legajo
+
+    def test_reemplazar_y_borrar(self):
+        personal = crear_personal(1)
+        personal.documento.save('dni.pdf', ContentFile(self.compartido))
+        escalafon = Escalafon(
+            personal=personal, area=Area.objects.create(nombre='Área', codigo='A1'),
+            regimen=Regimen.objects.create(nombre='Régimen'),
+            condicion_laboral=CondicionLaboral.objects.create(nombre='Condición'),
+            cargo='Cargo', fecha_inicio='2024-01-01'
+        )
+        escalafon.documento_resolucion.save('resolucion.pdf', ContentFile(self.compartido))
+        legajo = self.crear_legajo(personal, self.compartido)
+        self.crear_legajo(personal, self.nuevo)
+        self.assertEqual((self.referencias(self.compartido), self.referencias(self.nuevo)), (3, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.cliente.patch(
+                f'/api/personal/{personal.pk}/',
+                {'documento': SimpleUploadedFile('nuevo.pdf', self.nuevo, 'application/pdf')}, format='multipart'
+            )
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual((self.referencias(self.compartido), self.referencias(self.nuevo)), (2, 2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.cliente.patch(
+                f'/api/escalafones/{escalafon.pk}/',
+                {'documento_resolucion': SimpleUploadedFile('nuevo.pdf', self.nuevo, 'application/pdf')}, format='multipart'
+            )
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual((self.referencias(self.compartido), self.referencias(self.nuevo)), (1, 3))
+
+        # Con la última referencia se borra también el archivo
+        ruta = legajo.archivo.path
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.cliente.delete(f'/api/legajos/{legajo.pk}/')
+        self.assertEqual(respuesta.status_code, 204)
+        self.assertEqual(self.referencias(self.compartido), 0)
+        self.assertFalse(os.path.exists(ruta))
+
+        # El borrado en cascada (escalafón y legajo) no pasa por FieldFile.delete
+        personal.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            personal.delete()
+        self.assertEqual(self.referencias(self.nuevo), 0)
+        self.assertFalse(ArchivoBlob.objects.exists())
+
+
+class CargaMasivaTests(TestCase):
+    """bulk_create no pasa por post_save: invalidación del dashboard y limpieza si falla"""
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        ajuste = override_settings(MEDIA_ROOT=carpeta.name)
+        ajuste.enable()
+        self.addCleanup(ajuste.disable)
+        self.carpeta = Path(carpeta.name)
+
+        usuario = Usuario.objects.create_user(
+            'admin', 'admin@test.com', 'clave', nombres='Ana', apellidos='Admin', rol='ADMIN'
+        )
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(usuario)
+        self.personal = crear_personal(1)
+        self.seccion = SeccionLegajo.objects.create(nombre='Sección', orden=1)
+        self.tipo = TipoDocumento.objects.create(nombre='Tipo')
+
+    def cargar(self):
+        return self.cliente.post('/api/legajos/carga-masiva/', {
+            'personal': self.personal.pk, 'seccion': self.seccion.pk, 'tipo_documento': self.tipo.pk,
+            'archivos': [
+                SimpleUploadedFile(f'doc{numero}.pdf', pdf_minimo(f'Documento {numero}'), 'application/pdf')
+                for numero in range(3)
+            ],
+        }, format='multipart')
+
+    def test_invalida_dashboard(self):
+        caches['compartido'].set(CLAVE_CACHE, {'total': 0})
+        # Sin el evento de auditoría, que también invalidaría el dashboard
+        with mock.patch('personal.views.registrar'), self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.cargar()
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(Legajo.objects.count(), 3)
+        self.assertIsNone(caches['compartido'].get(CLAVE_CACHE))
+
+    def test_insert_fallido_libera_archivos(self):
+        with mock.patch.object(Legajo.objects, 'bulk_create', side_effect=IntegrityError), \
+                self.assertRaises(IntegrityError):
+            self.cargar()
+        self.assertFalse(Legajo.objects.exists())
+        self.assertFalse(ArchivoBlob.objects.exists())
+        self.assertEqual([ruta for ruta in self.carpeta.rglob('*.pdf')], [])
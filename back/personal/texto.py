@@ -0,0 +1,117 @@
+"""
+Texto de los PDF del legajo para la búsqueda de contenido.
+
+El texto se extrae con pypdf (Python puro, sin servicios externos) y se
+guarda en Legajo.contenido_texto junto con un tsvector indexado con GIN
+(Legajo.contenido_busqueda) que pondera la descripción por encima del
+contenido. Como en la búsqueda de personal, el vector y la consulta se
+arman sobre texto normalizado (sin tildes, en minúsculas).
+
+Los PDF escaneados sin capa de texto quedan con texto vacío (requieren OCR).
+
+- Documentos nuevos: tarea 'personal.extraer_texto' (personal.tareas).
+- Descripción editada: tarea 'personal.indexar_descripcion' (rehace el vector
+  con el texto ya extraído).
+- Documentos existentes: python manage.py indexar_textos
+"""
+import logging
+import unicodedata
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchVector
+from django.db.models import F, Func, Value
+from django.utils import timezone
+from pypdf import PdfReader
+
+from .busqueda import normalizar_texto
+from .models import Legajo
+
+logger = logging.getLogger(__name__)
+
+CONFIGURACION = 'spanish'
+CAMPOS_TEXTO = ('contenido_texto', 'contenido_busqueda')
+
+# Letras con tilde y su base, para translate() en SQL (misma regla que normalizar_texto)
+_CON_TILDE = 'ÁÀÂÄÃÉÈÊËÍÌÎÏÓÒÔÖÕÚÙÛÜÑÇáàâäãéèêëíìîïóòôöõúùûüñç'
+_SIN_TILDE = ''.join(unicodedata.normalize('NFKD', letra)[0] for letra in _CON_TILDE)
+
+
+def extraer_texto(ruta, maximo=None):
+    """
+    Texto de las páginas del PDF en `ruta`, hasta `maximo` caracteres.
+    No usa la base de datos (se ejecuta también en procesos separados).
+    """
+    maximo = maximo or getattr(settings, 'TEXTO_MAXIMO_CARACTERES', 200000)
+    partes = []
+    total = 0
+    try:
+        for pagina in PdfReader(ruta).pages:
+            texto = pagina.extract_text() or ''
+            partes.append(texto)
+            total += len(texto)
+            if total >= maximo:
+                break
+    except Exception:
+        logger.warning('No se pudo extraer el texto de %s', ruta, exc_info=True)
+    # PostgreSQL no admite el carácter NUL en columnas de texto
+    return '\n'.join(partes)[:maximo].replace('\x00', '')
+
+
+def guardar_texto(ids, texto):
+    """Guardar el texto extraído (y su vector) en los Legajo de `ids`"""
+    descripciones = Legajo.objects.filter(pk__in=ids).values_list('id', 'descripcion')
+    ahora = timezone.now()
+    for legajo_id, descripcion in descripciones:
+        Legajo.objects.filter(pk=legajo_id).update(
+            contenido_texto=texto,
+            contenido_busqueda=(
+                SearchVector(Value(normalizar_texto(descripcion)), weight='A', config=CONFIGURACION)
+                + SearchVector(Value(normalizar_texto(texto)), weight='B', config=CONFIGURACION)
+            ),
+            fecha_extraccion_texto=ahora,
+        )
+
+
+def consulta_texto(termino):
+    """SearchQuery para el término tal como lo escribe el usuario ("frase", -excluir, o)"""
+    return SearchQuery(normalizar_texto(termino), search_type='websearch', config=CONFIGURACION)
+
+
+def fragmento_texto(consulta, **opciones):
+    """
+    SearchHeadline del contenido sin tildes: la consulta y el vector están
+    normalizados, y sobre el texto original 'resolución' no coincidiría con
+    'resolucion'. Las mayúsculas se conservan (ts_headline no las distingue).
+    """
+    sin_tildes = Func(F('contenido_texto'), Value(_CON_TILDE), Value(_SIN_TILDE), function='translate')
+    return SearchHeadline(sin_tildes, consulta, config=CONFIGURACION, **opciones)
+
+
+def indexar_descripcion(legajo_id):
+    """Rehacer el vector tras editar la descripción, con el texto ya extraído"""
+    texto = (
+        Legajo.objects
+        .filter(pk=legajo_id, fecha_extraccion_texto__isnull=False)
+        .values_list('contenido_texto', flat=True)
+        .first()
+    )
+    # Sin extraer todavía: la extracción pendiente ya toma la descripción nueva
+    if texto is not None:
+        guardar_texto([legajo_id], texto)
+
+
+def extraer_y_guardar(legajo_id):
+    archivo = Legajo.objects.filter(pk=legajo_id).values_list('archivo', flat=True).first()
+    if not archivo:
+        return
+    # Mismo archivo (deduplicado) ya procesado en otro documento: se reutiliza el texto
+    texto = (
+        Legajo.objects
+        .filter(archivo=archivo, fecha_extraccion_texto__isnull=False)
+        .exclude(pk=legajo_id)
+        .values_list('contenido_texto', flat=True)
+        .first()
+    )
+    if texto is None:
+        texto = extraer_texto(Legajo._meta.get_field('archivo').storage.path(archivo))
+    guardar_texto([legajo_id], texto)
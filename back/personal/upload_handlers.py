@@ -0,0 +1,138 @@
+"""
+Carga de PDFs validada mientras llegan los bloques.
+
+ManejadorCargaPDF reemplaza a los upload handlers de Django en los
+endpoints que reciben PDFs (ver CargaPDFMixin). Por cada bloque:
+
+- verifica la firma %PDF- al inicio y el límite de 10MB, cortando la
+  carga apenas se incumple (sin leer ni guardar el resto),
+- calcula el SHA-256 en la misma pasada,
+- escribe el bloque en un archivo temporal (nunca se arma en memoria).
+
+Las páginas se cuentan al final sobre el archivo ya en disco, con el
+/Count del árbol de páginas (ver contar_paginas). El archivo resultante
+trae `sha256` y `paginas`, que se guardan en Legajo.contenido_hash y
+Legajo.paginas.
+"""
+import hashlib
+import logging
+
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+from pypdf import PdfReader
+from rest_framework.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+TAMANO_MAXIMO = 10 * 1024 * 1024
+FIRMA_PDF = b'%PDF-'
+
+
+def contar_paginas(ruta):
+    """
+    Páginas del PDF según el /Count de la raíz del árbol de páginas.
+    Solo se leen el xref y esos objetos; en un PDF con actualizaciones
+    incrementales (firmado, anotado, con páginas rotadas) el trailer
+    apunta a la versión vigente del árbol, no a las reemplazadas.
+    """
+    try:
+        lector = PdfReader(ruta)
+        try:
+            return int(lector.trailer['/Root']['/Pages']['/Count'])
+        except (KeyError, TypeError, ValueError):
+            return len(lector.pages)
+    except Exception:
+        logger.warning('No se pudo contar las páginas de %s', ruta)
+        return None
+
+
+class InspectorPDF:
+    """Firma, tamaño y SHA-256 calculados de forma incremental"""
+
+    def __init__(self, tamano_maximo=TAMANO_MAXIMO):
+        self.tamano_maximo = tamano_maximo
+        self.sha = hashlib.sha256()
+        self.tamano = 0
+        self._inicio = b''
+
+    def agregar(self, bloque):
+        """Procesar un bloque; retorna un mensaje de error o None"""
+        self.tamano += len(bloque)
+        if self.tamano > self.tamano_maximo:
+            return f'El archivo no puede superar los {self.tamano_maximo // (1024 * 1024)}MB'
+
+        if len(self._inicio) < len(FIRMA_PDF):
+            self._inicio += bloque[:len(FIRMA_PDF) - len(self._inicio)]
+            if not FIRMA_PDF.startswith(self._inicio):
+                return 'El archivo no es un PDF válido'
+
+        self.sha.update(bloque)
+        return None
+
+    def terminar(self):
+        """Cerrar la inspección; retorna un mensaje de error o None"""
+        if not self._inicio.startswith(FIRMA_PDF):
+            return 'El archivo no es un PDF válido'
+        return None
+
+    @property
+    def hash(self):
+        return self.sha.hexdigest()
+
+
+class ManejadorCargaPDF(TemporaryFileUploadHandler):
+    """
+    Upload handler que valida y escribe a disco cada bloque.
+    Los errores quedan en request.errores_carga = {campo: mensaje}.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.inspector = InspectorPDF()
+
+    def receive_data_chunk(self, raw_data, start):
+        error = self.inspector.agregar(raw_data)
+        if error:
+            self._registrar_error(error)
+            # connection_reset: no se sigue leyendo el cuerpo de la petición
+            raise StopUpload(connection_reset=True)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        error = self.inspector.terminar()
+        if error:
+            self._registrar_error(error)
+            return None
+        archivo = super().file_complete(file_size)
+        archivo.sha256 = self.inspector.hash
+        archivo.paginas = contar_paginas(archivo.temporary_file_path())
+        return archivo
+
+    def _registrar_error(self, error):
+        errores = getattr(self.request, 'errores_carga', None)
+        if errores is None:
+            errores = self.request.errores_carga = {}
+        errores[self.field_name] = error
+        self.upload_interrupted()
+
+
+class CargaPDFMixin:
+    """
+    Para ViewSets: usa ManejadorCargaPDF en las acciones de carga_pdf_acciones
+    y responde 400 con el error de la carga, después de autenticar y
+    verificar permisos (antes no se lee el cuerpo).
+    """
+    carga_pdf_acciones = ('create', 'update', 'partial_update')
+
+    def initialize_request(self, request, *args, **kwargs):
+        drf_request = super().initialize_request(request, *args, **kwargs)
+        if self.action in self.carga_pdf_acciones:
+            request.upload_handlers = [ManejadorCargaPDF(request)]
+        return drf_request
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.carga_pdf_acciones and request.content_type.startswith('multipart/'):
+            request.data  # Procesar la carga aquí, con el usuario ya autorizado
+            errores = getattr(request._request, 'errores_carga', None)
+            if errores:
+                raise ValidationError({campo: [mensaje] for campo, mensaje in errores.items()})
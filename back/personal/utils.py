@@ -0,0 +1,51 @@
+from organizacion.cache import catalogos
+from organizacion.models import Cargo
+
+
+class MapaCargos:
+    """
+    Catálogo de cargos en memoria para resolver valores legados.
+
+    Personal.cargo_actual y Escalafon.cargo guardan a veces el ID del
+    Cargo como string y a veces un texto libre. Este mapa permite
+    resolver muchos valores sin consultar la base por cada uno.
+    """
+
+    def __init__(self, cargos):
+        self.por_id = {}
+        self.por_nombre = {}
+        for cargo in cargos:
+            self.por_id[cargo.id] = cargo
+            self.por_nombre[cargo.nombre.strip().lower()] = cargo
+
+    @classmethod
+    def cargar(cls):
+        return cls(Cargo.objects.all())
+
+    def resolver(self, valor):
+        """Retorna el Cargo que corresponde al valor legado, o None"""
+        if not valor:
+            return None
+        valor = str(valor).strip()
+        if valor.isdigit():
+            return self.por_id.get(int(valor))
+        return self.por_nombre.get(valor.lower())
+
+
+def resolver_cargo(valor):
+    """
+    Resolver un único valor legado de cargo (ID como string o nombre).
+
+    Ejemplos:
+        resolver_cargo('12')                 # Cargo con id=12
+        resolver_cargo('Asistente Social')   # Cargo por nombre (sin distinguir mayúsculas)
+        resolver_cargo('texto libre')        # None
+    """
+    if not valor:
+        return None
+    # Mapa armado una vez por versión del catálogo de cargos
+    cargo = catalogos['cargos'].derivado('mapa', MapaCargos).resolver(valor)
+    if cargo is None and str(valor).strip().isdigit():
+        # Cargo recién creado en otro worker
+        return Cargo.objects.filter(id=int(str(valor).strip())).first()
+    return cargo
@@ -1,21 +1,44 @@
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
-from django.http import FileResponse, Http404
+from django.conf import settings
+from django.core.files import File
+from django.contrib.postgres.search import SearchRank
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
 from eventos.utils import registrar
-from .models import Personal, Escalafon, Legajo
+from .busqueda import buscar_personal
+from .cambios import TokenVencido, cambios_desde
+from .cargas import eliminar_sesion, guardar_bloque, nueva_expiracion, unir_bloques
+from .descargas import por_bloques, servir_archivo
+from .exportacion import entradas_legajo, zip_streaming
+from .storage import hash_de_ruta, liberar_al_confirmar, sumar_referencia
+from .upload_handlers import CargaPDFMixin, contar_paginas
+from .pdf import obtener_legajo_pdf
+from .miniaturas import responder_miniatura
+from .tareas import programar_descripcion, programar_documento_personal, programar_procesamiento
+from .texto import CAMPOS_TEXTO, consulta_texto, fragmento_texto
+from .models import Personal, Escalafon, Legajo, SesionCarga
+from .signals import legajos_creados
+from organizacion.cache import catalogos
 from organizacion.models import TipoDocumento, SeccionLegajo
 from .serializers import (
     PersonalSerializer, PersonalListSerializer, PersonalCreateSerializer,
     EscalafonSerializer, EscalafonCreateSerializer,
-    LegajoSerializer, LegajoCreateSerializer
+    LegajoSerializer, LegajoCreateSerializer, LegajoCargaMasivaSerializer, LegajoBusquedaSerializer,
+    SesionCargaSerializer
 )
+from usuarios.authentication import JWTQueryParamAuthentication
 from usuarios.permissions import CanManagePersonal
+from legajos.campos import CamposDinamicosMixin, ListaRapidaMixin
+from legajos.instrumentacion import SerializacionMedidaMixin
+from legajos.pagination import PaginacionHibrida
 
 
-class PersonalViewSet(viewsets.ModelViewSet):
+class PersonalViewSet(SerializacionMedidaMixin, ListaRapidaMixin, CamposDinamicosMixin, CargaPDFMixin, viewsets.ModelViewSet):
     """
     ✅ Lectura: Todos los usuarios autenticados
     ✅ Escritura: Solo ADMIN/COORDINADOR/ENCARGADO
@@ -39,7 +62,7 @@ class PersonalViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = Personal.objects.select_related(
-            'area_actual', 'regimen_actual', 'condicion_actual'
+            'area_actual', 'regimen_actual', 'condicion_actual', 'cargo'
         )
         
         dni = self.request.query_params.get('dni', None)
@@ -61,14 +84,13 @@ class PersonalViewSet(viewsets.ModelViewSet):
         if condicion:
             queryset = queryset.filter(condicion_actual_id=condicion)
         if cargo:
-            queryset = queryset.filter(cargo_actual=cargo)
+            if cargo.isdigit():
+                queryset = queryset.filter(cargo_id=cargo)
+            else:
+                queryset = queryset.filter(cargo_actual=cargo)
         if search:
-            queryset = queryset.filter(
-                Q(dni__icontains=search) |
-                Q(nombres__icontains=search) |
-                Q(apellido_paterno__icontains=search) |
-                Q(apellido_materno__icontains=search)
-            )
+            # Ordenado por relevancia (similitud o prefijo de DNI)
+            return buscar_personal(queryset, search)
         
         return queryset.order_by('apellido_paterno', 'apellido_materno', 'nombres')
     
@@ -78,11 +100,13 @@ class PersonalViewSet(viewsets.ModelViewSet):
         print("🔵 CREANDO PERSONAL")
         print("="*80)
         
+        documento_subido = serializer.validated_data.get('documento')
         personal = serializer.save()
         print(f"✅ Personal creado: {personal.nombre_completo} (ID: {personal.id})")
         print(f"📄 ¿Tiene documento?: {bool(personal.documento)}")
         
         if personal.documento:
+            programar_documento_personal(personal)
             print("📁 Documento detectado, guardando en Legajo...")
             try:
                 seccion_otros = SeccionLegajo.objects.filter(orden=9, activo=True).first()
@@ -109,8 +133,14 @@ class PersonalViewSet(viewsets.ModelViewSet):
                     tipo_documento=tipo_documento,
                     descripcion=f'Documento adjunto al momento de crear el registro del personal',
                     archivo=personal.documento,
+                    nombre_original=getattr(documento_subido, 'name', ''),
+                    contenido_hash=getattr(documento_subido, 'sha256', ''),
+                    paginas=getattr(documento_subido, 'paginas', None),
                     registrado_por=self.request.user
                 )
+                # El Legajo comparte el archivo del personal: una referencia más al mismo blob
+                sumar_referencia(legajo.archivo.name)
+                programar_procesamiento([legajo])
                 print(f"✅ Documento guardado en Legajo! (ID: {legajo.id})")
                 print(f"   - Fecha de creación: {legajo.fecha_creacion}")
                 
@@ -139,6 +169,14 @@ class PersonalViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
     
+    def perform_update(self, serializer):
+        anterior = serializer.instance.documento.name
+        personal = serializer.save()
+        if 'documento' in serializer.validated_data:
+            if personal.documento.name != anterior:
+                liberar_al_confirmar(personal.documento.storage, anterior)
+            programar_documento_personal(personal)
+    
     def update(self, request, *args, **kwargs):
         """Actualizar personal y registrar evento"""
         partial = kwargs.pop('partial', False)
@@ -155,12 +193,44 @@ class PersonalViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], url_path='changes')
+    def cambios(self, request):
+        """
+        Altas, ediciones (incluida la desactivación) y bajas desde un token
+        GET /api/personal/changes/?since=<token>&limite=500
+        Sin since devuelve todo; seguir pidiendo con el token mientras hay_mas.
+        Si completo=true la réplica local se reemplaza. 410: token vencido.
+        """
+        try:
+            limite = min(max(1, int(request.query_params.get('limite', settings.PERSONAL_CAMBIOS_LIMITE))), 2000)
+        except ValueError:
+            limite = settings.PERSONAL_CAMBIOS_LIMITE
+        
+        queryset = Personal.objects.select_related('area_actual', 'regimen_actual', 'condicion_actual', 'cargo')
+        try:
+            filas, eliminados, token, hay_mas, completo = cambios_desde(
+                queryset, request.query_params.get('since'), limite
+            )
+        except TokenVencido:
+            return Response(
+                {'error': 'El token es demasiado antiguo, sincronice de nuevo sin since'},
+                status=status.HTTP_410_GONE
+            )
+        
+        return Response({
+            'cambios': PersonalListSerializer(filas, many=True).data,
+            'eliminados': eliminados,
+            'token': token,
+            'hay_mas': hay_mas,
+            'completo': completo,
+        })
+    
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
     def escalafon(self, request, pk=None):
         """Obtener historial de escalafón del personal"""
         personal = self.get_object()
         escalafones = Escalafon.objects.filter(personal=personal).select_related(
-            'area', 'regimen', 'condicion_laboral'
+            'area', 'regimen', 'condicion_laboral', 'cargo_catalogo'
         )
         serializer = EscalafonSerializer(escalafones, many=True)
         return Response(serializer.data)
@@ -169,12 +239,63 @@ class PersonalViewSet(viewsets.ModelViewSet):
     def legajo(self, request, pk=None):
         """Obtener legajo del personal"""
         personal = self.get_object()
-        legajos = Legajo.objects.filter(personal=personal).select_related(
+        legajos = Legajo.objects.filter(personal=personal).defer(*CAMPOS_TEXTO).select_related(
             'seccion', 'tipo_documento', 'registrado_por'
         )
         serializer = LegajoSerializer(legajos, many=True, context={'request': request})
         return Response(serializer.data)
     
+    @action(
+        detail=True, methods=['get'], url_path='documento/miniatura',
+        permission_classes=[IsAuthenticated], authentication_classes=[JWTQueryParamAuthentication]
+    )
+    def documento_miniatura(self, request, pk=None):
+        """
+        Primera página del documento del personal (inmutable: la URL lleva ?v=)
+        GET /api/personal/{id}/documento/miniatura/?v=...
+        Acepta ?token= para usarla directamente en <img>
+        """
+        return responder_miniatura(request, self.get_object().documento_miniatura)
+    
+    @action(
+        detail=True, methods=['get'], url_path='legajo/pdf',
+        permission_classes=[IsAuthenticated], authentication_classes=[JWTQueryParamAuthentication]
+    )
+    def legajo_pdf(self, request, pk=None):
+        """
+        Legajo completo en un solo PDF, ordenado por sección y fecha
+        GET /api/personal/<id>/legajo/pdf/
+        Acepta ?token= para que el visor del navegador lo abra por URL y pida
+        las páginas con Range en lugar de descargarlo entero.
+        """
+        personal = self.get_object()
+        ruta, clave = obtener_legajo_pdf(personal)
+        if ruta is None:
+            return Response(
+                {'error': 'No hay documentos en el legajo para visualizar'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return servir_archivo(request, ruta, f'legajo_{personal.dni}.pdf', etag=clave)
+    
+    @action(detail=True, methods=['get'], url_path='legajo/zip', permission_classes=[IsAuthenticated])
+    def legajo_zip(self, request, pk=None):
+        """
+        Legajo completo (documentos, documento del personal y resoluciones
+        de escalafón) en un ZIP que se genera mientras se descarga
+        GET /api/personal/<id>/legajo/zip/
+        """
+        personal = self.get_object()
+        # Las consultas acá; el ZIP después solo lee archivos (ver por_bloques)
+        entradas = list(entradas_legajo(personal))
+        response = StreamingHttpResponse(
+            por_bloques(request, zip_streaming(entradas)),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = content_disposition_header(True, f'legajo_{personal.dni}.zip')
+        response['Cache-Control'] = 'private, no-store'
+        return response
+    
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, CanManagePersonal])
     def toggle_active(self, request, pk=None):
         """Habilitar/Deshabilitar personal"""
@@ -192,7 +313,7 @@ class PersonalViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class EscalafonViewSet(viewsets.ModelViewSet):
+class EscalafonViewSet(SerializacionMedidaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """
     ✅ Lectura: Todos los usuarios autenticados
     ✅ Escritura: Solo ADMIN/COORDINADOR/ENCARGADO
@@ -214,7 +335,7 @@ class EscalafonViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = Escalafon.objects.select_related(
-            'personal', 'area', 'regimen', 'condicion_laboral'
+            'personal', 'area', 'regimen', 'condicion_laboral', 'cargo_catalogo'
         )
         
         personal_id = self.request.query_params.get('personal', None)
@@ -232,8 +353,15 @@ class EscalafonViewSet(viewsets.ModelViewSet):
             personal.regimen_actual = escalafon.regimen
             personal.condicion_actual = escalafon.condicion_laboral
             personal.cargo_actual = escalafon.cargo
+            personal.cargo = escalafon.cargo_catalogo
             personal.save()
     
+    def perform_update(self, serializer):
+        anterior = serializer.instance.documento_resolucion.name
+        escalafon = serializer.save()
+        if escalafon.documento_resolucion.name != anterior:
+            liberar_al_confirmar(escalafon.documento_resolucion.storage, anterior)
+    
     def create(self, request, *args, **kwargs):
         """Crear escalafón y registrar evento"""
         serializer = self.get_serializer(data=request.data)
@@ -270,13 +398,16 @@ class EscalafonViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class LegajoViewSet(viewsets.ModelViewSet):
+class LegajoViewSet(SerializacionMedidaMixin, ListaRapidaMixin, CamposDinamicosMixin, CargaPDFMixin, viewsets.ModelViewSet):
     """
     ✅ Lectura: Todos los usuarios autenticados
     ✅ Escritura: Solo ADMIN/COORDINADOR/ENCARGADO
     """
     queryset = Legajo.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = PaginacionHibrida
+    cursor_ordering = ('-fecha_creacion', '-id')  # Índice legajos(-fecha_creacion)
+    carga_pdf_acciones = ('create', 'update', 'partial_update', 'carga_masiva')
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -285,13 +416,13 @@ class LegajoViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         # ✅ Solo CanManagePersonal para crear/editar/eliminar
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'carga_masiva']:
             return [IsAuthenticated(), CanManagePersonal()]
         # ✅ Todos pueden leer
         return [IsAuthenticated()]
     
     def get_queryset(self):
-        queryset = Legajo.objects.select_related(
+        queryset = Legajo.objects.defer(*CAMPOS_TEXTO).select_related(
             'personal',
             'seccion',
             'tipo_documento', 
@@ -313,7 +444,34 @@ class LegajoViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Crear documento y asignar usuario que lo registra"""
-        serializer.save(registrado_por=self.request.user)
+        archivo = serializer.validated_data.get('archivo')
+        serializer.save(
+            registrado_por=self.request.user,
+            nombre_original=getattr(archivo, 'name', ''),
+            contenido_hash=getattr(archivo, 'sha256', ''),
+            paginas=getattr(archivo, 'paginas', None)
+        )
+        programar_procesamiento([serializer.instance])
+    
+    def perform_update(self, serializer):
+        """Al reemplazar el archivo, actualizar también sus datos"""
+        archivo = serializer.validated_data.get('archivo')
+        if archivo is None:
+            descripcion = serializer.instance.descripcion
+            serializer.save()
+            if serializer.instance.descripcion != descripcion:
+                programar_descripcion(serializer.instance)
+            return
+        anterior = serializer.instance.archivo.name
+        serializer.save(
+            nombre_original=getattr(archivo, 'name', ''),
+            contenido_hash=getattr(archivo, 'sha256', ''),
+            paginas=getattr(archivo, 'paginas', None)
+        )
+        # El archivo nuevo ya sumó su referencia: se quita la del anterior (con la
+        # última se borran el blob y su miniatura)
+        liberar_al_confirmar(serializer.instance.archivo.storage, anterior)
+        programar_procesamiento([serializer.instance])
     
     def create(self, request, *args, **kwargs):
         """Crear documento del legajo y registrar evento"""
@@ -360,14 +518,14 @@ class LegajoViewSet(viewsets.ModelViewSet):
         """Eliminar documento del legajo"""
         instance = self.get_object()
         personal = instance.personal
+        archivo = instance.archivo
         
-        if instance.archivo:
-            try:
-                instance.archivo.delete(save=False)
-            except Exception as e:
-                print(f"Error al eliminar archivo físico: {e}")
-        
+        # La referencia al blob la quita personal.signals.liberar_archivo al confirmar
         self.perform_destroy(instance)
+        if archivo and not hash_de_ruta(archivo.name):
+            # Archivo anterior a blobs/: se borra directamente, también al confirmar
+            almacenamiento, nombre = archivo.storage, archivo.name
+            transaction.on_commit(lambda: almacenamiento.delete(nombre))
         
         registrar(
             usuario_ejecutor=request.user,
@@ -380,6 +538,104 @@ class LegajoViewSet(viewsets.ModelViewSet):
             status=status.HTTP_204_NO_CONTENT
         )
     
+    @action(detail=False, methods=['post'], url_path='carga-masiva')
+    def carga_masiva(self, request):
+        """
+        Varios documentos de un personal en una sola petición
+        POST /api/legajos/carga-masiva/ (multipart, ver LegajoCargaMasivaSerializer)
+        """
+        serializer = LegajoCargaMasivaSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        personal = serializer.validated_data['personal']
+        documentos = serializer.validated_data['documentos']
+        
+        # Los archivos se guardan primero; si falla el INSERT se quitan sus referencias
+        campo = Legajo._meta.get_field('archivo')
+        guardados = []
+        try:
+            legajos = []
+            for documento in documentos:
+                archivo = documento['archivo']
+                legajo = Legajo(
+                    personal=personal,
+                    seccion=documento['seccion'],
+                    tipo_documento=documento['tipo_documento'],
+                    descripcion=documento['descripcion'],
+                    nombre_original=archivo.name,
+                    contenido_hash=getattr(archivo, 'sha256', ''),
+                    paginas=getattr(archivo, 'paginas', None),
+                    registrado_por=request.user
+                )
+                nombre = campo.storage.save(
+                    campo.generate_filename(legajo, archivo.name), archivo, max_length=campo.max_length
+                )
+                guardados.append(nombre)
+                legajo.archivo = nombre
+                legajos.append(legajo)
+            
+            with transaction.atomic():
+                # bulk_create no llama a Legajo.save() (la extensión .pdf ya la valida
+                # el serializer) ni envía pre_save/post_save: el dashboard se invalida
+                # con legajos_creados y no hay otros receptores de post_save de Legajo
+                legajos = Legajo.objects.bulk_create(legajos)
+                legajos_creados.send(sender=Legajo, legajos=legajos)
+                programar_procesamiento(legajos)
+        except Exception:
+            for nombre in guardados:
+                campo.storage.delete(nombre)
+            raise
+        
+        # Un solo evento para toda la carga
+        registrar(
+            usuario_ejecutor=request.user,
+            id_evento=4,
+            personal_afectado=personal
+        )
+        
+        return Response(
+            {
+                'creados': len(legajos),
+                'documentos': [
+                    {'id': legajo.id, 'nombre_original': legajo.nombre_original}
+                    for legajo in legajos
+                ],
+            },
+            status=status.HTTP_201_CREATED
+        )
+    
+    @action(detail=False, methods=['get'])
+    def buscar(self, request):
+        """
+        Buscar en el contenido y la descripción de todos los documentos
+        GET /api/legajos/buscar/?q=<texto>  (admite "frase exacta" y -excluir)
+        Se puede combinar con ?personal=, ?seccion= y ?tipo=
+        """
+        termino = request.query_params.get('q', '').strip()
+        if len(termino) < 2:
+            return Response(
+                {'error': 'El parámetro q debe tener al menos 2 caracteres'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        consulta = consulta_texto(termino)
+        queryset = (
+            self.get_queryset()
+            .filter(contenido_busqueda=consulta)
+            .annotate(
+                rango=SearchRank('contenido_busqueda', consulta),
+                fragmento=fragmento_texto(
+                    consulta, start_sel='<b>', stop_sel='</b>', max_words=30, min_words=10
+                )
+            )
+            .order_by('-rango', '-fecha_creacion', '-id')
+        )
+        
+        page = self.paginate_queryset(queryset)
+        serializer = LegajoBusquedaSerializer(page if page is not None else queryset, many=True, context={'request': request})
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+    
     @action(detail=False, methods=['get'])
     def por_seccion(self, request):
         """
@@ -393,15 +649,25 @@ class LegajoViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        secciones = SeccionLegajo.objects.filter(activo=True).order_by('orden')
+        # Secciones del catálogo en memoria (organizacion.cache), ya ordenadas
+        secciones = [seccion for seccion in catalogos['secciones'].objetos() if seccion.activo]
+        
+        # Una sola consulta para todos los documentos, agrupados luego en Python
+        documentos = Legajo.objects.filter(
+            personal_id=personal_id,
+            seccion__activo=True
+        ).defer(*CAMPOS_TEXTO).select_related(
+            'personal', 'seccion', 'tipo_documento', 'registrado_por'
+        ).order_by('-fecha_creacion')
+        
+        datos = LegajoSerializer(documentos, many=True, context={'request': request}).data
+        por_seccion = {seccion.id: [] for seccion in secciones}
+        for documento in datos:
+            por_seccion.setdefault(documento['seccion_id'], []).append(documento)
         
         resultado = []
         for seccion in secciones:
-            documentos = Legajo.objects.filter(
-                personal_id=personal_id,
-                seccion=seccion
-            ).select_related('tipo_documento', 'registrado_por')
-            
+            documentos_seccion = por_seccion[seccion.id]
             resultado.append({
                 'seccion': {
                     'id': seccion.id,
@@ -409,19 +675,27 @@ class LegajoViewSet(viewsets.ModelViewSet):
                     'orden': seccion.orden,
                     'color': seccion.color
                 },
-                'documentos': LegajoSerializer(
-                    documentos,
-                    many=True,
-                    context={'request': request}
-                ).data,
-                'cantidad': documentos.count()
+                'documentos': documentos_seccion,
+                'cantidad': len(documentos_seccion)
             })
         
         return Response(resultado)
     
+    @action(detail=True, methods=['get'], authentication_classes=[JWTQueryParamAuthentication])
+    def miniatura(self, request, pk=None):
+        """
+        Primera página del documento (inmutable: la URL lleva ?v=)
+        GET /api/legajos/{id}/miniatura/?v=...
+        Acepta ?token= para usarla directamente en <img>
+        """
+        return responder_miniatura(request, self.get_object().miniatura)
+    
     @action(detail=True, methods=['get'])
     def descargar(self, request, pk=None):
-        """Endpoint para descargar un documento"""
+        """
+        Endpoint para descargar un documento
+        Soporta Range (206), ETag/Last-Modified (304) y offload al proxy (DESCARGAS_OFFLOAD)
+        """
         documento = self.get_object()
         if not documento.archivo:
             return Response(
@@ -430,11 +704,96 @@ class LegajoViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            return FileResponse(
-                documento.archivo.open('rb'),
-                content_type='application/pdf',
+            return servir_archivo(
+                request,
+                documento.archivo.path,
+                documento.nombre_original or documento.archivo.name.split('/')[-1],
                 as_attachment=True,
-                filename=documento.archivo.name.split('/')[-1]
+                etag=hash_de_ruta(documento.archivo.name)
             )
         except FileNotFoundError:
-            raise Http404("Archivo no encontrado")
\ No newline at end of file
+            raise Http404("Archivo no encontrado")
+
+
+class SesionCargaViewSet(SerializacionMedidaMixin,
+                         mixins.CreateModelMixin,
+                         mixins.RetrieveModelMixin,
+                         mixins.DestroyModelMixin,
+                         viewsets.GenericViewSet):
+    """
+    Carga reanudable de documentos grandes por bloques (ver personal.cargas).
+    ✅ Solo ADMIN/COORDINADOR/ENCARGADO, y cada usuario ve sus propias sesiones
+    """
+    serializer_class = SesionCargaSerializer
+    permission_classes = [IsAuthenticated, CanManagePersonal]
+    
+    def get_queryset(self):
+        return SesionCarga.objects.filter(
+            usuario=self.request.user,
+            fecha_expiracion__gt=timezone.now()
+        )
+    
+    def perform_create(self, serializer):
+        serializer.save(
+            usuario=self.request.user,
+            tamano_bloque=settings.CARGAS_TAMANO_BLOQUE,
+            fecha_expiracion=nueva_expiracion()
+        )
+    
+    def perform_destroy(self, instance):
+        eliminar_sesion(instance)
+    
+    @action(detail=True, methods=['put'], url_path=r'bloques/(?P<numero>\d+)')
+    def bloque(self, request, pk=None, numero=None):
+        """
+        PUT /api/cargas/{id}/bloques/{n}/
+        Cuerpo: bytes del bloque (Content-Type: application/octet-stream)
+        """
+        sesion = self.get_object()
+        # El cuerpo se lee por partes desde la petición, sin pasar por los parsers
+        guardar_bloque(sesion, int(numero), request._request)
+        SesionCarga.objects.filter(pk=sesion.pk).update(fecha_expiracion=nueva_expiracion())
+        return Response({'numero': int(numero), 'total_bloques': sesion.total_bloques})
+    
+    @action(detail=True, methods=['post'])
+    def completar(self, request, pk=None):
+        """
+        POST /api/cargas/{id}/completar/
+        Une los bloques, crea el Legajo y elimina la sesión
+        """
+        sesion = self.get_object()
+        with transaction.atomic():
+            # Dos completar simultáneos: el segundo espera el lock y, al
+            # confirmarse el primero, ya no encuentra la sesión
+            sesion = self.get_queryset().select_for_update().filter(pk=sesion.pk).first()
+            if sesion is None:
+                raise Http404('La carga ya se completó o expiró')
+            ruta, inspector = unir_bloques(sesion)
+            
+            with open(ruta, 'rb') as contenido:
+                archivo = File(contenido, name=sesion.nombre_original)
+                archivo.sha256 = inspector.hash
+                legajo = Legajo.objects.create(
+                    personal=sesion.personal,
+                    seccion=sesion.seccion,
+                    tipo_documento=sesion.tipo_documento,
+                    descripcion=sesion.descripcion,
+                    archivo=archivo,
+                    nombre_original=sesion.nombre_original,
+                    contenido_hash=inspector.hash,
+                    paginas=contar_paginas(ruta),
+                    registrado_por=request.user
+                )
+            programar_procesamiento([legajo])
+            eliminar_sesion(sesion)
+        
+        registrar(
+            usuario_ejecutor=request.user,
+            id_evento=4,
+            personal_afectado=legajo.personal
+        )
+        
+        return Response(
+            LegajoSerializer(legajo, context={'request': request}).data,
+            status=status.HTTP_201_CREATED
+        )
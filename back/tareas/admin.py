@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Tarea
+
+
+@admin.register(Tarea)
+class TareaAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'estado', 'intentos', 'ejecutar_despues', 'fecha_inicio', 'fecha_fin']
+    list_filter = ['estado', 'tipo']
+    search_fields = ['tipo', 'clave', 'error']
+    date_hierarchy = 'fecha_creacion'
+    readonly_fields = ['fecha_creacion', 'fecha_inicio', 'fecha_fin', 'trabajador', 'error']
+    list_per_page = 100
@@ -0,0 +1,103 @@
+# tareas/management/commands/procesar_tareas.py
+
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection
+from tareas.utils import (
+    ejecutar, limpiar_terminadas, nombre_trabajador, recuperar_abandonadas, registrar_latido, tomar_tarea,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Worker de la cola de tareas: toma tareas pendientes con SELECT ... FOR UPDATE SKIP LOCKED '
+        'y las ejecuta en N hilos (--concurrencia). Se pueden lanzar varios workers a la vez. '
+        'Mientras ejecuta, renueva cada TAREAS_LATIDO segundos el latido de sus tareas. '
+        'Se detiene limpiamente con SIGINT/SIGTERM (termina las tareas en curso).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrencia', type=int, default=getattr(settings, 'TAREAS_CONCURRENCIA', 2),
+            help='Tareas ejecutadas a la vez por este worker'
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=getattr(settings, 'TAREAS_INTERVALO', 2.0),
+            help='Segundos de espera cuando no hay tareas'
+        )
+        parser.add_argument('--una-vez', action='store_true', help='Procesar lo pendiente y salir')
+
+    def handle(self, *args, **options):
+        self.detener = threading.Event()
+        self.una_vez = options['una_vez']
+        self.intervalo = options['intervalo']
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.detener.set())
+            signal.signal(signal.SIGINT, lambda *_: self.detener.set())
+
+        trabajador = nombre_trabajador()
+        self.stdout.write(f'Worker {trabajador} con {options["concurrencia"]} hilos')
+        self._mantenimiento()
+
+        hilos = [
+            threading.Thread(target=self._bucle, args=(f'{trabajador}/{i}',), name=f'tareas-{i}')
+            for i in range(options['concurrencia'])
+        ]
+        for hilo in hilos:
+            hilo.start()
+        terminado = threading.Event()
+        latidos = threading.Thread(target=self._latidos, args=(trabajador, terminado), name='tareas-latido', daemon=True)
+        latidos.start()
+
+        # Mantenimiento cada minuto hasta recibir la señal de detenerse
+        while not self.una_vez and not self.detener.wait(60):
+            self._mantenimiento()
+        for hilo in hilos:
+            hilo.join()
+        terminado.set()
+        latidos.join()
+        self.stdout.write(self.style.SUCCESS('✓ Worker detenido'))
+
+    def _latidos(self, trabajador, terminado):
+        """Las tareas en curso de este worker no cuentan como abandonadas (recuperar_abandonadas)"""
+        intervalo = getattr(settings, 'TAREAS_LATIDO', 30)
+        try:
+            while not terminado.wait(intervalo):
+                close_old_connections()
+                try:
+                    registrar_latido(trabajador)
+                except DatabaseError as error:
+                    self.stderr.write(f'  No se pudo registrar el latido: {error}')
+        finally:
+            connection.close()
+
+    def _mantenimiento(self):
+        recuperadas, fallidas = recuperar_abandonadas()
+        borradas = limpiar_terminadas()
+        if recuperadas or fallidas or borradas:
+            self.stdout.write(
+                f'  {recuperadas} tareas abandonadas reencoladas, {fallidas} marcadas como fallidas, '
+                f'{borradas} completadas antiguas borradas'
+            )
+
+    def _bucle(self, trabajador):
+        try:
+            while not self.detener.is_set():
+                close_old_connections()
+                tarea_lista = tomar_tarea(trabajador)
+                if tarea_lista is None:
+                    if self.una_vez:
+                        return
+                    self.detener.wait(self.intervalo)
+                    continue
+                inicio = time.monotonic()
+                exito = ejecutar(tarea_lista)
+                self.stdout.write(
+                    f'  {"✓" if exito else "✗"} {tarea_lista} en {time.monotonic() - inicio:.2f}s'
+                )
+        finally:
+            connection.close()
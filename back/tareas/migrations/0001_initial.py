@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(help_text='Nombre registrado con @tarea', max_length=100)),
+                ('parametros', models.JSONField(blank=True, default=dict)),
+                ('clave', models.CharField(blank=True, default='', max_length=200)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_PROCESO', 'En proceso'), ('COMPLETADA', 'Completada'), ('FALLIDA', 'Fallida')], default='PENDIENTE', max_length=20)),
+                ('intentos', models.PositiveIntegerField(default=0)),
+                ('max_intentos', models.PositiveIntegerField(default=3)),
+                ('error', models.TextField(blank=True, default='')),
+                ('trabajador', models.CharField(blank=True, default='', max_length=100)),
+                ('ejecutar_despues', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tarea',
+                'verbose_name_plural': 'Tareas',
+                'db_table': 'tareas',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(condition=models.Q(('estado', 'PENDIENTE')), fields=['ejecutar_despues', 'id'], name='tareas_pendientes_idx'), models.Index(fields=['estado', 'fecha_fin'], name='tareas_estado_c7ed8b_idx'), models.Index(condition=models.Q(('clave', ''), _negated=True), fields=['clave'], name='tareas_clave_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+def quitar_claves_repetidas(apps, schema_editor):
+    """Las tareas activas con clave repetida (de antes de la restricción) se quedan sin clave"""
+    Tarea = apps.get_model('tareas', 'Tarea')
+    vistas = set()
+    activas = Tarea.objects.filter(estado__in=['PENDIENTE', 'EN_PROCESO']).exclude(clave='').order_by('id')
+    for tarea_id, clave in activas.values_list('id', 'clave'):
+        if clave in vistas:
+            Tarea.objects.filter(pk=tarea_id).update(clave='')
+        vistas.add(clave)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarea',
+            name='repetir',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='latido',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RemoveIndex(
+            model_name='tarea',
+            name='tareas_clave_idx',
+        ),
+        migrations.RunPython(quitar_claves_repetidas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tarea',
+            constraint=models.UniqueConstraint(condition=models.Q(('estado__in', ['PENDIENTE', 'EN_PROCESO']), models.Q(('clave', ''), _negated=True)), fields=('clave',), name='tareas_clave_activa_uniq'),
+        ),
+    ]
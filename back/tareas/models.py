@@ -0,0 +1,66 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tarea(models.Model):
+    """
+    Trabajo pendiente para el proceso `manage.py procesar_tareas`.
+    La cola es esta tabla: los workers toman filas con
+    SELECT ... FOR UPDATE SKIP LOCKED (ver tareas.utils).
+    """
+    PENDIENTE = 'PENDIENTE'
+    EN_PROCESO = 'EN_PROCESO'
+    COMPLETADA = 'COMPLETADA'
+    FALLIDA = 'FALLIDA'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_PROCESO, 'En proceso'),
+        (COMPLETADA, 'Completada'),
+        (FALLIDA, 'Fallida'),
+    ]
+    
+    tipo = models.CharField(max_length=100, help_text='Nombre registrado con @tarea')
+    parametros = models.JSONField(default=dict, blank=True)
+    # Evita encolar dos veces el mismo trabajo mientras sigue pendiente o
+    # en proceso (restricción única parcial, ver Meta)
+    clave = models.CharField(max_length=200, blank=True, default='')
+    # Se volvió a encolar mientras estaba en proceso: ejecutarla otra vez al terminar
+    repetir = models.BooleanField(default=False)
+    
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    intentos = models.PositiveIntegerField(default=0)
+    max_intentos = models.PositiveIntegerField(default=3)
+    error = models.TextField(blank=True, default='')
+    trabajador = models.CharField(max_length=100, blank=True, default='')
+    
+    ejecutar_despues = models.DateTimeField(default=timezone.now)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+    # Lo renueva el worker mientras la ejecuta (ver recuperar_abandonadas)
+    latido = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'tareas'
+        verbose_name = 'Tarea'
+        verbose_name_plural = 'Tareas'
+        ordering = ['-fecha_creacion']
+        indexes = [
+            # Índice parcial: la consulta del worker solo recorre las pendientes
+            models.Index(
+                fields=['ejecutar_despues', 'id'],
+                name='tareas_pendientes_idx',
+                condition=models.Q(estado='PENDIENTE'),
+            ),
+            models.Index(fields=['estado', 'fecha_fin']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['clave'],
+                name='tareas_clave_activa_uniq',
+                condition=models.Q(estado__in=['PENDIENTE', 'EN_PROCESO']) & ~models.Q(clave=''),
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.tipo} #{self.id} ({self.estado})"
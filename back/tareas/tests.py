@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Tarea
+from .utils import ejecutar, encolar, recuperar_abandonadas, registrar_latido, tarea, tomar_tarea
+
+ejecutadas = []
+
+
+@tarea('pruebas.anotar')
+def anotar(valor):
+    ejecutadas.append(valor)
+
+
+class EncolarClaveTests(TestCase):
+    """Una sola tarea activa por clave"""
+
+    def setUp(self):
+        ejecutadas.clear()
+
+    def test_pendiente_no_se_duplica(self):
+        primera = encolar('pruebas.anotar', {'valor': 1}, clave='anotar:1')
+        segunda = encolar('pruebas.anotar', {'valor': 1}, clave='anotar:1')
+        self.assertEqual(primera.pk, segunda.pk)
+        self.assertEqual(Tarea.objects.count(), 1)
+
+    def test_restriccion_en_la_base(self):
+        encolar('pruebas.anotar', {'valor': 1}, clave='anotar:1')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Tarea.objects.create(tipo='pruebas.anotar', clave='anotar:1', estado=Tarea.EN_PROCESO)
+        # Terminadas o sin clave no cuentan
+        Tarea.objects.create(tipo='pruebas.anotar', clave='anotar:1', estado=Tarea.COMPLETADA)
+        Tarea.objects.create(tipo='pruebas.anotar')
+        Tarea.objects.create(tipo='pruebas.anotar')
+
+    def test_en_proceso_se_repite_al_terminar(self):
+        encolar('pruebas.anotar', {'valor': 1}, clave='anotar:1')
+        tomada = tomar_tarea('prueba/0')
+
+        repetida = encolar('pruebas.anotar', {'valor': 2}, clave='anotar:1')
+        self.assertEqual(repetida.pk, tomada.pk)
+        self.assertTrue(ejecutar(tomada))
+
+        tomada.refresh_from_db()
+        self.assertEqual((tomada.estado, tomada.intentos, tomada.repetir), (Tarea.PENDIENTE, 0, False))
+        self.assertTrue(ejecutar(tomar_tarea('prueba/0')))
+        self.assertEqual(ejecutadas, [1, 2])
+        self.assertEqual(Tarea.objects.get().estado, Tarea.COMPLETADA)
+
+    def test_eliminada_mientras_corre(self):
+        encolar('pruebas.anotar', {'valor': 1})
+        tomada = tomar_tarea('prueba/0')
+        Tarea.objects.all().delete()
+        with self.assertLogs('tareas.utils', 'WARNING'):
+            self.assertTrue(ejecutar(tomada))
+        self.assertFalse(Tarea.objects.exists())
+
+
+class RecuperarAbandonadasTests(TestCase):
+    """Solo se reencolan las tareas cuyo worker dejó de dar latidos"""
+
+    def test_latido(self):
+        encolar('pruebas.anotar', {'valor': 1})
+        encolar('pruebas.anotar', {'valor': 2})
+        viva, caida = tomar_tarea('vivo/0'), tomar_tarea('caido/0')
+        hace_una_hora = timezone.now() - timedelta(hours=1)
+        Tarea.objects.update(fecha_inicio=hace_una_hora, latido=hace_una_hora)
+
+        self.assertEqual(registrar_latido('vivo'), 1)
+        self.assertEqual(recuperar_abandonadas(), (1, 0))
+        self.assertEqual(Tarea.objects.get(pk=viva.pk).estado, Tarea.EN_PROCESO)
+        self.assertEqual(Tarea.objects.get(pk=caida.pk).estado, Tarea.PENDIENTE)
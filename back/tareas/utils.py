@@ -0,0 +1,209 @@
+"""
+Cola de tareas en PostgreSQL (sin broker adicional).
+
+Registrar una tarea en el módulo tareas.py de cualquier app:
+
+    from tareas.utils import tarea
+
+    @tarea('personal.extraer_texto')
+    def extraer_texto(ids):
+        ...
+
+Encolarla desde una vista:
+
+    from tareas.utils import encolar
+    encolar('personal.extraer_texto', {'ids': [legajo.id]})
+
+La fila se inserta en la conexión actual: dentro de transaction.atomic()
+el worker solo la ve si el bloque se confirma; fuera (en autocommit, como
+la mayoría de las vistas, sin ATOMIC_REQUESTS) se confirma enseguida, así
+que encolar después de guardar lo que la tarea va a leer.
+
+Y procesarla con: python manage.py procesar_tareas
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Tarea
+
+logger = logging.getLogger(__name__)
+
+_registro = {}
+
+# Vueltas de _guardar_resultado si encolar() cambia `repetir` entre sus dos UPDATE
+INTENTOS_GUARDAR = 5
+
+
+def tarea(nombre):
+    """Decorador: registra la función como manejadora de las tareas `nombre`"""
+    def decorador(funcion):
+        _registro[nombre] = funcion
+        return funcion
+    return decorador
+
+
+def encolar(tipo, parametros=None, clave='', retraso=0, max_intentos=None):
+    """
+    Crear una tarea pendiente.
+
+    clave: si ya hay una tarea pendiente con la misma clave no se crea otra
+    (por ejemplo, regenerar el PDF de un personal una sola vez aunque se
+    suban diez documentos seguidos). Si la que tiene la clave está en
+    proceso, se marca para ejecutarse otra vez al terminar, con estos
+    parámetros. La base garantiza una sola tarea activa por clave
+    (tareas_clave_activa_uniq), aunque dos peticiones encolen a la vez.
+    retraso: segundos a esperar antes de ejecutarla.
+    """
+    if tipo not in _registro:
+        raise ValueError(f'Tarea no registrada: {tipo}')
+    parametros = parametros or {}
+    while True:
+        if clave:
+            existente = Tarea.objects.filter(clave=clave, estado__in=[Tarea.PENDIENTE, Tarea.EN_PROCESO]).first()
+            if existente is not None and existente.estado == Tarea.PENDIENTE:
+                return existente
+            if existente is not None:
+                marcadas = Tarea.objects.filter(pk=existente.pk, estado=Tarea.EN_PROCESO).update(
+                    repetir=True, parametros=parametros
+                )
+                if marcadas:
+                    return existente
+                continue  # terminó entre la consulta y el UPDATE
+        try:
+            # Savepoint: el IntegrityError no invalida la transacción de quien encola
+            with transaction.atomic():
+                return Tarea.objects.create(
+                    tipo=tipo,
+                    parametros=parametros,
+                    clave=clave,
+                    ejecutar_despues=timezone.now() + timedelta(seconds=retraso),
+                    max_intentos=max_intentos or getattr(settings, 'TAREAS_MAX_INTENTOS', 3),
+                )
+        except IntegrityError:
+            if not clave:
+                raise
+            # Otra petición la encoló a la vez: usar esa
+
+
+def nombre_trabajador():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def tomar_tarea(trabajador):
+    """
+    Marcar como EN_PROCESO la siguiente tarea lista y devolverla (o None).
+    SKIP LOCKED hace que varios workers tomen filas distintas sin esperar.
+    """
+    with transaction.atomic():
+        tarea_lista = (
+            Tarea.objects
+            .select_for_update(skip_locked=True)
+            .filter(estado=Tarea.PENDIENTE, ejecutar_despues__lte=timezone.now())
+            .order_by('ejecutar_despues', 'id')
+            .first()
+        )
+        if tarea_lista is None:
+            return None
+        tarea_lista.estado = Tarea.EN_PROCESO
+        tarea_lista.intentos += 1
+        tarea_lista.fecha_inicio = tarea_lista.latido = timezone.now()
+        tarea_lista.trabajador = trabajador
+        tarea_lista.save(update_fields=['estado', 'intentos', 'fecha_inicio', 'latido', 'trabajador'])
+    return tarea_lista
+
+
+def registrar_latido(trabajador):
+    """Renovar el latido de las tareas que ejecutan los hilos del worker `trabajador`"""
+    return Tarea.objects.filter(estado=Tarea.EN_PROCESO, trabajador__startswith=f'{trabajador}/').update(
+        latido=timezone.now()
+    )
+
+
+def _guardar_resultado(tarea_lista, campos):
+    """
+    Guardar el resultado de la ejecución. Si se volvió a encolar mientras
+    corría (repetir), queda PENDIENTE otra vez como una tarea nueva.
+    """
+    valores = {campo: getattr(tarea_lista, campo) for campo in campos}
+    fila = Tarea.objects.filter(pk=tarea_lista.pk)
+    if tarea_lista.estado == Tarea.PENDIENTE:
+        # Reintento: ya vuelve a la cola (con los parámetros que dejó encolar())
+        fila.update(repetir=False, **valores)
+        return
+    # UPDATE condicionales en lugar de leer y escribir: encolar() solo marca
+    # repetir mientras la fila sigue EN_PROCESO, así que uno de los dos aplica
+    for _ in range(INTENTOS_GUARDAR):
+        if fila.filter(repetir=True).update(
+            estado=Tarea.PENDIENTE, intentos=0, repetir=False, ejecutar_despues=timezone.now(), fecha_fin=None
+        ):
+            tarea_lista.estado = Tarea.PENDIENTE
+            return
+        if fila.filter(repetir=False).update(**valores):
+            return
+        if not fila.exists():
+            logger.warning('Tarea %s eliminada mientras se ejecutaba, no se guarda el resultado', tarea_lista)
+            return
+    logger.error('Tarea %s: no se pudo guardar el resultado tras %s intentos', tarea_lista, INTENTOS_GUARDAR)
+
+
+def ejecutar(tarea_lista):
+    """Ejecutar una tarea ya tomada y guardar el resultado (con reintentos)"""
+    funcion = _registro.get(tarea_lista.tipo)
+    try:
+        if funcion is None:
+            raise LookupError(f'Tarea no registrada: {tarea_lista.tipo}')
+        funcion(**tarea_lista.parametros)
+    except Exception:
+        error = traceback.format_exc()
+        if tarea_lista.intentos < tarea_lista.max_intentos:
+            # Espera exponencial: base, 2×base, 4×base...
+            espera = getattr(settings, 'TAREAS_REINTENTO_BASE', 30) * 2 ** (tarea_lista.intentos - 1)
+            tarea_lista.estado = Tarea.PENDIENTE
+            tarea_lista.ejecutar_despues = timezone.now() + timedelta(seconds=espera)
+            logger.warning('Tarea %s falló (intento %s), se reintenta en %ss', tarea_lista, tarea_lista.intentos, espera)
+        else:
+            tarea_lista.estado = Tarea.FALLIDA
+            tarea_lista.fecha_fin = timezone.now()
+            logger.error('Tarea %s falló definitivamente:\n%s', tarea_lista, error)
+        tarea_lista.error = error
+        _guardar_resultado(tarea_lista, ['estado', 'ejecutar_despues', 'fecha_fin', 'error'])
+        return False
+
+    tarea_lista.estado = Tarea.COMPLETADA
+    tarea_lista.fecha_fin = timezone.now()
+    tarea_lista.error = ''
+    _guardar_resultado(tarea_lista, ['estado', 'fecha_fin', 'error'])
+    return True
+
+
+def recuperar_abandonadas():
+    """
+    Volver a PENDIENTE las tareas EN_PROCESO cuyo worker no renovó el
+    latido en TAREAS_TIEMPO_MAXIMO segundos (se detuvo o se cayó). Una
+    tarea larga con el worker vivo no se toca. Cuentan como un intento.
+    """
+    limite = timezone.now() - timedelta(seconds=getattr(settings, 'TAREAS_TIEMPO_MAXIMO', 120))
+    abandonadas = Tarea.objects.filter(
+        Q(latido__lt=limite) | Q(latido__isnull=True, fecha_inicio__lt=limite),
+        estado=Tarea.EN_PROCESO,
+    )
+    fallidas = abandonadas.filter(intentos__gte=F('max_intentos')).update(
+        estado=Tarea.FALLIDA, fecha_fin=timezone.now(), error='El worker dejó de responder'
+    )
+    recuperadas = abandonadas.update(estado=Tarea.PENDIENTE, ejecutar_despues=timezone.now())
+    return recuperadas, fallidas
+
+
+def limpiar_terminadas():
+    """Borrar las tareas completadas hace más de TAREAS_CONSERVAR_DIAS (las fallidas se conservan)"""
+    limite = timezone.now() - timedelta(days=getattr(settings, 'TAREAS_CONSERVAR_DIAS', 7))
+    borradas, _ = Tarea.objects.filter(estado=Tarea.COMPLETADA, fecha_fin__lt=limite).delete()
+    return borradas
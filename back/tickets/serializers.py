@@ -7,6 +7,11 @@ class TicketSerializer(serializers.ModelSerializer):
     area_nombre = serializers.CharField(source='area.nombre', read_only=True)
     creado_por_nombre = serializers.CharField(source='creado_por.nombre_completo', read_only=True)
     
+    # Columnas que leen los campos calculados (?fields=, legajos.campos)
+    campos_dependencias = {
+        'creado_por_nombre': ('creado_por__nombres', 'creado_por__apellidos'),
+    }
+    
     class Meta:
         model = Ticket
         fields = [
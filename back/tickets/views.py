@@ -5,10 +5,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from legajos.campos import CamposDinamicosMixin
+from legajos.instrumentacion import SerializacionMedidaMixin
 from .models import Ticket
 from .serializers import TicketSerializer
 
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(SerializacionMedidaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     permission_classes = [IsAuthenticated]
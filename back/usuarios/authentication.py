@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import Token
+
+
+class JWTQueryParamAuthentication(JWTAuthentication):
+    """
+    JWT por cabecera Authorization o, si no viene, por ?token=<access>.
+
+    Para clientes que no pueden enviar cabeceras, como etiquetas <img>
+    (el stream de eventos usa TicketStream).
+    """
+
+    def authenticate(self, request):
+        resultado = super().authenticate(request)
+        if resultado is not None:
+            return resultado
+
+        parametros = getattr(request, 'query_params', request.GET)
+        token = parametros.get('token')
+        if not token:
+            return None
+
+        validated_token = self.get_validated_token(token.encode())
+        return self.get_user(validated_token), validated_token
+
+
+class TicketStream(Token):
+    """
+    Ticket para abrir el stream SSE de eventos (EventSource no envía cabeceras).
+
+    Va en la URL, así que queda en los logs de acceso del servidor y del
+    proxy: por eso no es el token de acceso, sino uno de pocos segundos
+    que solo sirve para abrir el stream (token_type 'stream' no pasa
+    como token de acceso en el resto de la API).
+    """
+    token_type = 'stream'
+    lifetime = timedelta(seconds=getattr(settings, 'EVENTOS_STREAM_TICKET_SEGUNDOS', 30))
+
+
+def usuario_de_ticket(ticket):
+    """Usuario activo del ticket de stream, o AuthenticationFailed"""
+    try:
+        validado = TicketStream(ticket)
+    except TokenError as e:
+        raise AuthenticationFailed(str(e))
+    return JWTAuthentication().get_user(validado)
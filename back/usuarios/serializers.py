@@ -5,6 +5,12 @@ class UsuarioSerializer(serializers.ModelSerializer):
     nombre_completo = serializers.ReadOnlyField()
     rol_display = serializers.CharField(source='get_rol_display', read_only=True)
     
+    # Columnas que leen los campos calculados (?fields=, legajos.campos)
+    campos_dependencias = {
+        'nombre_completo': ('nombres', 'apellidos'),
+        'rol_display': ('rol',),
+    }
+    
     class Meta:
         model = Usuario
         fields = [
@@ -56,6 +62,8 @@ class ChangePasswordSerializer(serializers.Serializer):
 class UsuarioListSerializer(serializers.ModelSerializer):
     rol_display = serializers.CharField(source='get_rol_display', read_only=True)
     
+    campos_dependencias = UsuarioSerializer.campos_dependencias
+    
     class Meta:
         model = Usuario
         fields = ['id', 'username', 'nombre_completo', 'email', 'rol', 'rol_display', 'is_active']
\ No newline at end of file
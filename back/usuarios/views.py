@@ -4,6 +4,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.db.models import Q
 from eventos.utils import registrar
+from legajos.campos import CamposDinamicosMixin
+from legajos.instrumentacion import SerializacionMedidaMixin
 from .models import Usuario
 from .serializers import (
     UsuarioSerializer, UsuarioCreateSerializer, UsuarioUpdateSerializer,
@@ -12,7 +14,7 @@ from .serializers import (
 from .permissions import IsAdmin
 
 
-class UsuarioViewSet(viewsets.ModelViewSet):
+class UsuarioViewSet(SerializacionMedidaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """
     Vista para la gestión de usuarios del sistema.
     ✅ Lectura: Todos los usuarios autenticados
@@ -110,37 +110,14 @@ const AnadirPersonal = () => {
   const cargarDatos = async () => {
     setLoadingAreas(true);
     try {
-      const obtenerTodos = async (endpoint) => {
-        let allData = [];
-        let url = endpoint;
-        
-        while (url) {
-          const response = await api.get(url);
-          const data = response.data;
-          
-          if (data.results) {
-            allData = [...allData, ...data.results];
-            url = data.next;
-          } else {
-            allData = data;
-            url = null;
-          }
-        }
-        
-        return allData;
-      };
-
-      const [areasData, regimenesData, condicionesData, cargosData] = await Promise.all([
-        obtenerTodos('/areas/'),
-        obtenerTodos('/regimenes/'),
-        obtenerTodos('/condiciones-laborales/'),
-        obtenerTodos('/cargos/'),
-      ]);
+      // Todos los catálogos en una petición (304 si no cambiaron).
+      // Incluye inactivos: el personal existente puede tenerlos asignados.
+      const { data } = await api.get('/catalogos/?inactivos=true');
       
-      setAreas(areasData);
-      setRegimenes(regimenesData);
-      setCondiciones(condicionesData);
-      setCargos(cargosData);
+      setAreas(data.areas);
+      setRegimenes(data.regimenes);
+      setCondiciones(data.condiciones_laborales);
+      setCargos(data.cargos);
     } catch (err) {
       console.error('Error al cargar datos:', err);
       setError('Error al cargar los datos iniciales');
@@ -23,6 +23,22 @@ import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import api from '../services/api';
 
+const formatearEvento = (evento) => ({
+  id: evento.id,
+  usuario: evento.usuario_ejecutor_username || 'Sistema',
+  usuarioAfectado: evento.usuario_afectado_nombre || '-',
+  personalAfectado: evento.personal_afectado_nombre || '-',
+  fechaHora: new Date(evento.fecha_hora).toLocaleString('es-PE', {
+    day: '2-digit',
+    month: '2-digit',
+    year: 'numeric',
+    hour: '2-digit',
+    minute: '2-digit',
+    hour12: true
+  }),
+  evento: evento.evento_nombre,
+});
+
 const Dashboard = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
@@ -41,51 +57,60 @@ const Dashboard = () => {
       loadDashboardData();
     }, 30000);
 
-    return () => clearInterval(interval);
+    // Eventos nuevos en vivo por SSE. El stream se abre con un ticket de pocos
+    // segundos (no con el token de acceso, que quedaría en los logs por ir en la URL).
+    // El navegador reconecta solo con Last-Event-ID; si el ticket ya venció la
+    // reconexión falla y se abre de nuevo con otro ticket desde el último id recibido.
+    let stream = null;
+    let reintento = null;
+    let ultimoId = null;
+    let cerrado = false;
+
+    const abrirStream = async () => {
+      try {
+        const { data } = await api.post('/registro-eventos/stream/ticket/');
+        if (cerrado) return;
+        const desde = ultimoId !== null ? `&desde=${ultimoId}` : '';
+        stream = new EventSource(
+          `${api.defaults.baseURL}/registro-eventos/stream/?ticket=${encodeURIComponent(data.ticket)}${desde}`
+        );
+        stream.addEventListener('registro', (e) => {
+          const datos = JSON.parse(e.data);
+          ultimoId = Math.max(ultimoId ?? 0, datos.id);
+          const evento = formatearEvento(datos);
+          setEventos((anteriores) => [evento, ...anteriores.filter((ev) => ev.id !== evento.id)].slice(0, 5));
+        });
+        stream.onerror = () => {
+          if (stream.readyState === EventSource.CLOSED && !cerrado) {
+            reintento = setTimeout(abrirStream, 5000);
+          }
+        };
+      } catch (error) {
+        console.error('Error al abrir el stream de eventos:', error);
+        if (!cerrado) reintento = setTimeout(abrirStream, 30000);
+      }
+    };
+    abrirStream();
+
+    return () => {
+      cerrado = true;
+      clearInterval(interval);
+      clearTimeout(reintento);
+      if (stream) stream.close();
+    };
   }, []);
 
   const loadDashboardData = async () => {
     try {
-      const [usuariosRes, personalRes, legajosRes, eventosRes] = await Promise.all([
-        api.get('/usuarios/'),
-        api.get('/personal/'),
-        api.get('/legajos/'),
-        api.get('/registro-eventos/?ordering=-fecha_hora&page_size=5'),
-      ]);
-
-      const usuariosData = usuariosRes.data.results || usuariosRes.data;
-      const usuariosActivos = usuariosData.filter(u => u.is_active).length;
-
-      const personalData = personalRes.data.results || personalRes.data;
-      const personalTotal = personalData.length;
-
-      const legajosData = legajosRes.data.results || legajosRes.data;
-      const documentosTotal = legajosData.length;
+      const { data } = await api.get('/dashboard/?eventos=5');
 
       setStats({
-        usuariosActivos: usuariosActivos,
-        personalRegistrados: personalTotal,
-        documentosTotal: documentosTotal,
+        usuariosActivos: data.usuarios.activos,
+        personalRegistrados: data.personal.total,
+        documentosTotal: data.documentos.total,
       });
 
-      const eventosData = eventosRes.data.results || eventosRes.data;
-      const eventosLimitados = eventosData.slice(0, 5);
-      
-      const eventosFormateados = eventosLimitados.map((evento) => ({
-        id: evento.id,
-        usuario: evento.usuario_ejecutor_username || 'Sistema',
-        usuarioAfectado: evento.usuario_afectado_nombre || '-',
-        personalAfectado: evento.personal_afectado_nombre || '-',
-        fechaHora: new Date(evento.fecha_hora).toLocaleString('es-PE', {
-          day: '2-digit',
-          month: '2-digit',
-          year: 'numeric',
-          hour: '2-digit',
-          minute: '2-digit',
-          hour12: true
-        }),
-        evento: evento.evento_nombre,
-      }));
+      const eventosFormateados = data.eventos_recientes.map(formatearEvento);
 
       setEventos(eventosFormateados);
     } catch (error) {
@@ -62,49 +62,19 @@ const EditarHistorialEscalafon = () => {
   const cargarDatos = async () => {
     setLoading(true);
     try {
-      // Función para obtener todos los registros paginados
-      const obtenerTodos = async (endpoint) => {
-        let allData = [];
-        let url = endpoint;
-        
-        while (url) {
-          const response = await api.get(url);
-          const data = response.data;
-          
-          if (data.results) {
-            allData = [...allData, ...data.results];
-            url = data.next;
-          } else {
-            allData = data;
-            url = null;
-          }
-        }
-        
-        return allData;
-      };
-
-      const [
-        personalData,
-        historialData,
-        areasData,
-        regimenesData,
-        condicionesData,
-        cargosData
-      ] = await Promise.all([
+      // Catálogos en una sola petición; con inactivos porque el historial puede usarlos
+      const [personalData, historialData, catalogosData] = await Promise.all([
         api.get(`/personal/${personalId}/`),
         api.get(`/escalafones/?personal=${personalId}`),
-        obtenerTodos('/areas/'),
-        obtenerTodos('/regimenes/'),
-        obtenerTodos('/condiciones-laborales/'),
-        obtenerTodos('/cargos/'),
+        api.get('/catalogos/?inactivos=true'),
       ]);
 
       setPersonal(personalData.data);
       setHistorial(historialData.data.results || historialData.data);
-      setAreas(areasData);
-      setRegimenes(regimenesData);
-      setCondiciones(condicionesData);
-      setCargos(cargosData);
+      setAreas(catalogosData.data.areas);
+      setRegimenes(catalogosData.data.regimenes);
+      setCondiciones(catalogosData.data.condiciones_laborales);
+      setCargos(catalogosData.data.cargos);
       
       console.log('✅ Datos cargados correctamente');
     } catch (err) {
@@ -321,7 +291,7 @@ const EditarHistorialEscalafon = () => {
                     {personal.nombre_completo}
                   </TableCell>
                   <TableCell>{item.area_nombre || 'Sin área'}</TableCell>
-                  <TableCell>{item.cargo || '-'}</TableCell>
+                  <TableCell>{item.cargo_nombre || item.cargo || '-'}</TableCell>
                   <TableCell>{item.regimen_nombre || 'No especificado'}</TableCell>
                   <TableCell>{item.condicion_nombre || 'No especificado'}</TableCell>
                   <TableCell>
@@ -57,57 +57,22 @@ const EditarLegajo = () => {
     seccion: '',
     tipo_documento: '',
     descripcion: '',
-    archivo: null,
+    archivos: [],
   });
 
   useEffect(() => {
     cargarDatos();
   }, [id]);
 
-  // Cargar TODOS los tipos de documento activos recursivamente
-  const cargarTodosTipos = async () => {
-    let todosLosTipos = [];
-    let page = 1;
-    let hasMore = true;
-
-    try {
-      while (hasMore) {
-        console.log(`📝 Cargando página ${page} de tipos de documento...`);
-        const response = await api.get(`/tipos-documento/activos/?page=${page}&page_size=100`);
-        
-        const resultados = response.data.results || response.data;
-        const tiposArray = Array.isArray(resultados) ? resultados : [];
-        
-        todosLosTipos = [...todosLosTipos, ...tiposArray];
-        
-        if (response.data.next) {
-          page++;
-        } else {
-          hasMore = false;
-        }
-      }
-      
-      console.log(`✅ Total de tipos activos cargados: ${todosLosTipos.length}`);
-      return todosLosTipos;
-    } catch (err) {
-      console.error('❌ Error cargando tipos:', err);
-      return [];
-    }
-  };
-
   const cargarDatos = async () => {
     try {
       console.log('🔄 Cargando datos del personal ID:', id);
       
-      // Cargar tipos de documento PRIMERO
-      const todosLosTipos = await cargarTodosTipos();
-      setTiposDocumento(todosLosTipos);
-      
-      // Cargar solo secciones activas
-      const [personalRes, documentosRes, seccionesRes] = await Promise.all([
+      // Secciones y tipos de documento activos en una sola petición (catálogos)
+      const [personalRes, documentosRes, catalogosRes] = await Promise.all([
         api.get(`/personal/${id}/`),
         api.get(`/legajos/?personal=${id}`),
-        api.get('/secciones-legajo/activas/'),
+        api.get('/catalogos/'),
       ]);
       
       setPersonal(personalRes.data);
@@ -118,9 +83,9 @@ const EditarLegajo = () => {
       setDocumentos(documentosArray);
       console.log('📄 Documentos cargados:', documentosArray.length);
       
-      const secs = seccionesRes.data.results || seccionesRes.data;
-      const seccionesArray = Array.isArray(secs) ? secs : [];
+      const seccionesArray = catalogosRes.data.secciones;
       setSecciones(seccionesArray);
+      setTiposDocumento(catalogosRes.data.tipos_documento);
       console.log('📋 Secciones activas cargadas:', seccionesArray.length);
       
     } catch (err) {
@@ -140,7 +105,7 @@ const EditarLegajo = () => {
         seccion: seccion.id,
         tipo_documento: '',
         descripcion: '',
-        archivo: null,
+        archivos: [],
       });
       setTiposFiltrados(tiposDocumento);
       console.log(`📝 Total de tipos disponibles:`, tiposDocumento.length);
@@ -150,7 +115,7 @@ const EditarLegajo = () => {
         seccion: '',
         tipo_documento: '',
         descripcion: '',
-        archivo: null,
+        archivos: [],
       });
       setTiposFiltrados([]);
     }
@@ -165,7 +130,7 @@ const EditarLegajo = () => {
       seccion: '',
       tipo_documento: '',
       descripcion: '',
-      archivo: null,
+      archivos: [],
     });
   };
 
@@ -182,20 +147,19 @@ const EditarLegajo = () => {
   };
 
   const handleFileChange = (event) => {
-    const file = event.target.files[0];
-    if (file) {
-      if (file.type !== 'application/pdf') {
-        alert('Solo se permiten archivos PDF');
-        event.target.value = null;
-        return;
-      }
-      if (file.size > 10 * 1024 * 1024) {
-        alert('El archivo no puede superar los 10MB');
-        event.target.value = null;
-        return;
-      }
-      setNuevoDocumento({ ...nuevoDocumento, archivo: file });
+    const files = Array.from(event.target.files);
+    if (files.length === 0) return;
+    if (files.some((file) => file.type !== 'application/pdf')) {
+      alert('Solo se permiten archivos PDF');
+      event.target.value = null;
+      return;
     }
+    if (files.some((file) => file.size > 10 * 1024 * 1024)) {
+      alert('Ningún archivo puede superar los 10MB');
+      event.target.value = null;
+      return;
+    }
+    setNuevoDocumento({ ...nuevoDocumento, archivos: files });
   };
 
   const handleAgregarDocumento = async () => {
@@ -209,8 +173,8 @@ const EditarLegajo = () => {
       return;
     }
 
-    if (!nuevoDocumento.archivo) {
-      alert('Debe seleccionar un archivo PDF');
+    if (nuevoDocumento.archivos.length === 0) {
+      alert('Debe seleccionar al menos un archivo PDF');
       return;
     }
 
@@ -220,16 +184,17 @@ const EditarLegajo = () => {
       formData.append('seccion', nuevoDocumento.seccion);
       formData.append('tipo_documento', nuevoDocumento.tipo_documento);
       formData.append('descripcion', nuevoDocumento.descripcion || '');
-      formData.append('archivo', nuevoDocumento.archivo);
+      // Todos los archivos van en una sola petición (una transacción en el servidor)
+      nuevoDocumento.archivos.forEach((archivo) => formData.append('archivos', archivo));
 
       console.log('📤 Enviando documento:');
       console.log('  - Personal ID:', id);
       console.log('  - Sección ID:', nuevoDocumento.seccion);
       console.log('  - Tipo Documento ID:', nuevoDocumento.tipo_documento);
       console.log('  - Descripción:', nuevoDocumento.descripcion);
-      console.log('  - Archivo:', nuevoDocumento.archivo.name);
+      console.log('  - Archivos:', nuevoDocumento.archivos.map((archivo) => archivo.name));
 
-      await api.post('/legajos/', formData, {
+      await api.post('/legajos/carga-masiva/', formData, {
         headers: { 'Content-Type': 'multipart/form-data' }
       });
 
@@ -441,6 +406,7 @@ const EditarLegajo = () => {
                     <TableHead>
                       <TableRow sx={{ bgcolor: '#f5f5f5' }}>
                         <TableCell sx={{ fontWeight: 'bold', width: '50px' }}>N°</TableCell>
+                        <TableCell sx={{ fontWeight: 'bold', width: '60px' }}></TableCell>
                         <TableCell sx={{ fontWeight: 'bold' }}>TIPO</TableCell>
                         <TableCell sx={{ fontWeight: 'bold' }}>FECHA</TableCell>
                         <TableCell sx={{ fontWeight: 'bold' }}>DESCRIPCIÓN</TableCell>
@@ -451,6 +417,17 @@ const EditarLegajo = () => {
                       {docs.map((doc, index) => (
                         <TableRow key={doc.id} hover>
                           <TableCell>{index + 1}</TableCell>
+                          <TableCell>
+                            {doc.thumbnail_url && (
+                              <img
+                                src={`${doc.thumbnail_url}&token=${localStorage.getItem('accessToken')}`}
+                                alt=""
+                                loading="lazy"
+                                style={{ width: 40, border: '1px solid #ddd', cursor: 'pointer', display: 'block' }}
+                                onClick={() => handleVisualizarDocumento(doc)}
+                              />
+                            )}
+                          </TableCell>
                           <TableCell>
                             <Typography variant="body2" sx={{ fontWeight: 'bold', color: '#1976d2' }}>
                               {doc.tipo_documento_nombre || doc.nombre}
@@ -579,18 +556,20 @@ const EditarLegajo = () => {
                   py: 2,
                   borderStyle: 'dashed',
                   borderWidth: 2,
-                  color: nuevoDocumento.archivo ? '#4CAF50' : 'inherit'
+                  color: nuevoDocumento.archivos.length > 0 ? '#4CAF50' : 'inherit'
                 }}
               >
-                {nuevoDocumento.archivo ? (
-                  <>✓ {nuevoDocumento.archivo.name}</>
+                {nuevoDocumento.archivos.length === 1 ? (
+                  <>✓ {nuevoDocumento.archivos[0].name}</>
+                ) : nuevoDocumento.archivos.length > 1 ? (
+                  <>✓ {nuevoDocumento.archivos.length} archivos seleccionados</>
                 ) : (
-                  'SELECCIONAR ARCHIVO PDF'
+                  'SELECCIONAR ARCHIVOS PDF'
                 )}
-                <input type="file" hidden onChange={handleFileChange} accept=".pdf" />
+                <input type="file" hidden multiple onChange={handleFileChange} accept=".pdf" />
               </Button>
               <Typography variant="caption" color="textSecondary" sx={{ mt: 1, display: 'block', textAlign: 'center' }}>
-                Solo archivos PDF. Tamaño máximo: 10MB
+                Solo archivos PDF. Tamaño máximo: 10MB por archivo
               </Typography>
             </Box>
           </Box>
@@ -599,7 +578,7 @@ const EditarLegajo = () => {
           <Button onClick={handleCloseAddDialog} color="inherit">Cancelar</Button>
           <Button 
             onClick={handleAgregarDocumento} 
-            disabled={!nuevoDocumento.seccion || !nuevoDocumento.tipo_documento || !nuevoDocumento.archivo}
+            disabled={!nuevoDocumento.seccion || !nuevoDocumento.tipo_documento || nuevoDocumento.archivos.length === 0}
             variant="contained"
             sx={{ bgcolor: '#003366' }}
           >
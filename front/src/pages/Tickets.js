@@ -71,11 +71,11 @@ const Tickets = () => {
       setLoading(true);
       const [ticketsRes, areasRes] = await Promise.all([
         api.get('/tickets/'),
-        api.get('/areas/'),
+        api.get('/catalogos/'),
       ]);
       
       setTickets(ticketsRes.data.results || ticketsRes.data);
-      setAreas(areasRes.data.results || areasRes.data);
+      setAreas(areasRes.data.areas);
     } catch (error) {
       console.error('Error al cargar datos:', error);
     } finally {
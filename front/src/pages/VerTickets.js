@@ -50,11 +50,11 @@ const VerTickets = () => {
       setLoading(true);
       const [ticketsRes, areasRes] = await Promise.all([
         api.get('/tickets/'),
-        api.get('/areas/'),
+        api.get('/catalogos/?inactivos=true'),
       ]);
       
       setTickets(ticketsRes.data.results || ticketsRes.data);
-      setAreas(areasRes.data.results || areasRes.data);
+      setAreas(areasRes.data.areas);
     } catch (error) {
       console.error('Error al cargar datos:', error);
     } finally {
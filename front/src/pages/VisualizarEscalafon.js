@@ -139,7 +139,7 @@ const VisualizarEscalafon = () => {
           item.fecha_inicio ? new Date(item.fecha_inicio).toLocaleDateString('es-PE') : '-',
           item.fecha_fin ? new Date(item.fecha_fin).toLocaleDateString('es-PE') : 'Actual',
           item.area_nombre || '-',
-          item.cargo || item.cargo_nombre || '-',
+          item.cargo_nombre || item.cargo || '-',
           item.regimen_nombre || '-',
           item.condicion_nombre || '-',
           item.documento_resolucion ? 'Sí' : 'No',
@@ -11,7 +11,6 @@ import {
 import {
   ArrowBack as ArrowBackIcon,
 } from '@mui/icons-material';
-import { PDFDocument } from 'pdf-lib';
 import api from '../services/api';
 
 const VisualizarLegajo = () => {
@@ -26,91 +25,27 @@ const VisualizarLegajo = () => {
     cargarDatosYGenerarPDF();
   }, [id]);
 
-  useEffect(() => {
-    return () => {
-      if (pdfUrl) {
-        URL.revokeObjectURL(pdfUrl);
-      }
-    };
-  }, [pdfUrl]);
-
   const cargarDatosYGenerarPDF = async () => {
     setLoading(true);
     setGenerandoPDF(true);
     
     try {
-      // 1. Cargar secciones ACTIVAS con su orden
-      const seccionesResponse = await api.get('/secciones-legajo/');
-      const seccionesData = seccionesResponse.data.results || seccionesResponse.data;
-      const seccionesActivas = seccionesData.filter(s => s.activo === true);
-      seccionesActivas.sort((a, b) => (a.orden || 0) - (b.orden || 0));
-
-      // 2. Cargar documentos del legajo
-      const documentosResponse = await api.get(`/personal/${id}/legajo/`);
-      const docs = documentosResponse.data || [];
-
-      if (docs.length === 0) {
-        setError('No hay documentos en el legajo para visualizar');
-        setLoading(false);
-        setGenerandoPDF(false);
-        return;
-      }
-
-      // 3. Ordenar documentos por sección y fecha
-      docs.sort((a, b) => {
-        const seccionA = seccionesActivas.find(s => s.id === a.seccion_id);
-        const seccionB = seccionesActivas.find(s => s.id === b.seccion_id);
-        
-        const ordenA = seccionA?.orden || 999;
-        const ordenB = seccionB?.orden || 999;
-        
-        if (ordenA !== ordenB) {
-          return ordenA - ordenB;
-        }
-        
-        const fechaA = new Date(a.fecha_creacion || 0);
-        const fechaB = new Date(b.fecha_creacion || 0);
-        return fechaA - fechaB;
-      });
-
-      // 4. Combinar PDFs automáticamente
-      const pdfDoc = await PDFDocument.create();
-      let documentosAgregados = 0;
-
-      for (const doc of docs) {
-        if (!doc.archivo) continue;
-
-        try {
-          const response = await fetch(doc.archivo);
-          const arrayBuffer = await response.arrayBuffer();
-          const pdf = await PDFDocument.load(arrayBuffer);
-          const pages = await pdfDoc.copyPages(pdf, pdf.getPageIndices());
-          pages.forEach((page) => pdfDoc.addPage(page));
-          
-          documentosAgregados++;
-          console.log(`✅ Agregado: ${doc.seccion_nombre} - ${doc.tipo_documento_nombre}`);
-        } catch (err) {
-          console.error(`❌ Error al cargar PDF: ${doc.tipo_documento_nombre}`, err);
-        }
-      }
-
-      if (documentosAgregados === 0) {
-        setError('No se pudo cargar ningún documento');
-        setLoading(false);
-        setGenerandoPDF(false);
-        return;
-      }
-
-      // 5. Generar URL del PDF combinado
-      const pdfBytes = await pdfDoc.save();
-      const blob = new Blob([pdfBytes], { type: 'application/pdf' });
-      const url = URL.createObjectURL(blob);
-
-      setPdfUrl(url);
+      // El servidor une los documentos en orden de sección y guarda el resultado en caché.
+      // HEAD genera el PDF (o da 404) y renueva el token si venció, sin descargarlo
+      const ruta = `/personal/${id}/legajo/pdf/`;
+      await api.head(ruta);
+
+      // El visor abre la URL y pide las páginas con Range a medida que se muestran
+      const token = localStorage.getItem('accessToken');
+      setPdfUrl(`${api.defaults.baseURL}${ruta}?token=${encodeURIComponent(token)}`);
       setError('');
     } catch (err) {
       console.error('Error al generar PDF:', err);
-      setError('Error al generar el PDF del legajo');
+      if (err.response?.status === 404) {
+        setError('No hay documentos en el legajo para visualizar');
+      } else {
+        setError('Error al generar el PDF del legajo');
+      }
     } finally {
       setLoading(false);
       setGenerandoPDF(false);